@@ -0,0 +1,78 @@
+"""
+bench_embedding_backends.py
+---------------------------
+Embedding throughput of the torch / onnx / onnx-int8 backends, plus a
+cosine-agreement check of every ONNX backend against torch.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_embedding_backends --texts 512
+    PYTHONPATH=src python -m benchmarks.bench_embedding_backends --model path/to/st_model
+
+Exits non-zero when an ONNX backend falls below its minimum cosine.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_document
+from veridian_atlas.data_pipeline.processors.embedder import DEFAULT_MODEL, EmbeddingService
+
+MIN_COSINE = {"onnx": 0.9999, "onnx-int8": 0.99}
+
+
+def sample_texts(n: int):
+    texts, seed = [], 0
+    while len(texts) < n:
+        texts.extend(line for line in generate_document(seed).splitlines() if len(line) > 40)
+        seed += 1
+    return texts[:n]
+
+
+def cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark embedding backends.")
+    p.add_argument("--model", default=DEFAULT_MODEL)
+    p.add_argument("--texts", type=int, default=512)
+    p.add_argument("--batch-size", type=int, default=32)
+    p.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    args = p.parse_args()
+
+    texts = sample_texts(args.texts)
+    reference, ok = None, True
+
+    print(f"{'backend':>10} {'load s':>7} {'texts/s':>9} {'min cos':>9} {'mean cos':>9}")
+    for backend in args.backends:
+        # No store: every text reaches the model
+        service = EmbeddingService(args.model, batch_size=args.batch_size, backend=backend)
+
+        start = time.perf_counter()
+        service.embed(texts[:2])
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectors = np.asarray(service.embed(texts))
+        rate = len(texts) / (time.perf_counter() - start)
+
+        if backend == "torch":
+            reference = vectors
+        if reference is None or backend == "torch":
+            print(f"{backend:>10} {load:>7.2f} {rate:>9.1f} {'-':>9} {'-':>9}")
+            continue
+
+        cos = cosines(vectors, reference)
+        print(f"{backend:>10} {load:>7.2f} {rate:>9.1f} {cos.min():>9.5f} {cos.mean():>9.5f}")
+        if cos.min() < MIN_COSINE.get(backend, 0.0):
+            ok = False
+            print(f"[FAIL] {backend}: min cosine {cos.min():.5f} < {MIN_COSINE[backend]}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
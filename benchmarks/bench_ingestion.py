@@ -0,0 +1,54 @@
+"""
+bench_ingestion.py
+------------------
+Ingestion throughput vs. worker count on a synthetic corpus.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_ingestion --deals 8 --docs 500 --workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_corpus
+from veridian_atlas.data_pipeline import router
+
+
+def bench(root: Path, workers: int) -> float:
+    start = time.perf_counter()
+    router.ingest_all_deals(force=True, workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark parallel ingestion.")
+    p.add_argument("--deals", type=int, default=4)
+    p.add_argument("--docs", type=int, default=250, help="Documents per deal.")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = p.parse_args()
+
+    # Per-file INFO logs would dominate the measurement
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_corpus(root, deals=args.deals, docs_per_deal=args.docs)
+        router.BASE_DEALS_PATH = root
+        total_docs = args.deals * args.docs
+
+        baseline = None
+        print(f"{'workers':>8} {'seconds':>9} {'docs/s':>9} {'speedup':>8}")
+        for workers in args.workers:
+            elapsed = bench(root, workers)
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {elapsed:>9.2f} {total_docs / elapsed:>9.1f} "
+                f"{baseline / elapsed:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+bench_llm_batching.py
+---------------------
+Aggregate generation throughput (tokens/s) vs. concurrent askers,
+with LLM micro-batching on and off. Loads the real Qwen model.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_llm_batching --concurrency 1 4 16 --max-tokens 64
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from veridian_atlas.rag_engine.services import local_llm
+
+PROMPT = """You are a credit agreement assistant. Reply with JSON only:
+{{"answer": "...", "citations": []}}
+
+Question {n}: What is the {topic} under the facility agreement?
+"""
+TOPICS = ["upfront fee", "commitment fee", "maturity date", "leverage covenant", "margin"]
+
+
+def bench(concurrency: int, requests: int, max_tokens: int) -> dict:
+    prompts = [PROMPT.format(n=i, topic=TOPICS[i % len(TOPICS)]) for i in range(requests)]
+    tokens_before = local_llm.generation_stats["generated_tokens"]
+    calls_before = local_llm.generation_stats["generate_calls"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda p: local_llm.generate_response(p, max_tokens), prompts))
+    elapsed = time.perf_counter() - start
+
+    tokens = local_llm.generation_stats["generated_tokens"] - tokens_before
+    calls = local_llm.generation_stats["generate_calls"] - calls_before
+    return {"seconds": elapsed, "tokens": tokens, "calls": calls}
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark LLM micro-batching.")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--requests", type=int, default=32, help="Prompts per run.")
+    p.add_argument("--max-tokens", type=int, default=64)
+    p.add_argument("--max-batch", type=int, default=16)
+    p.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = p.parse_args()
+
+    local_llm.get_qwen()
+    local_llm.generate_response("warm up", 4)
+
+    print(f"{'mode':>9} {'askers':>7} {'seconds':>9} {'tokens':>7} {'calls':>6} {'tok/s':>8}")
+    for mode, max_batch in (("solo", 1), ("batched", args.max_batch)):
+        local_llm.llm_batcher.max_batch_size = max_batch
+        local_llm.llm_batcher.max_wait = args.max_wait_ms / 1000.0
+        for concurrency in args.concurrency:
+            r = bench(concurrency, args.requests, args.max_tokens)
+            print(
+                f"{mode:>9} {concurrency:>7} {r['seconds']:>9.2f} {r['tokens']:>7} "
+                f"{r['calls']:>6} {r['tokens'] / r['seconds']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+bench_llm_cpu.py
+----------------
+CPU generation modes of the local Qwen model: fp32 vs bf16 vs int8 (dynamic).
+
+Each precision runs in its own subprocess (VA_LLM_PRECISION=...), so load
+time and peak RSS are measured from a cold interpreter. Reports:
+ - load seconds
+ - peak RSS (MB)
+ - generated tokens/s over RAG prompts
+ - JSON parse rate (answers with an "answer" field)
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_llm_cpu --runs 5 --threads 4
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+CONTEXTS = [
+    {
+        "chunk_id": f"VA_Bench_Agreement_SECTION_00{i}",
+        "content": f"Clause {i}: the Borrower shall pay a fee of {i}% on the commitment.",
+    }
+    for i in range(1, 4)
+]
+QUESTIONS = ["What is the upfront fee?", "When does the facility mature?", "Who is the agent?"]
+
+
+def worker(runs: int):
+    """Runs inside the subprocess; prints one JSON line."""
+    start = time.perf_counter()
+    from veridian_atlas.rag_engine.pipeline.rag_engine import build_rag_prompt
+    from veridian_atlas.rag_engine.services import local_llm
+
+    local_llm.get_qwen()
+    load_s = time.perf_counter() - start
+
+    prompts = [build_rag_prompt(q, CONTEXTS, "Bench") for q in QUESTIONS]
+    local_llm._generate_single(prompts[0], 8)  # warm up
+
+    tokens, parsed, gen_s = 0, 0, 0.0
+    for i in range(runs):
+        t0 = time.perf_counter()
+        text, generated = local_llm._generate_single(prompts[i % len(prompts)], 256)
+        gen_s += time.perf_counter() - t0
+        tokens += generated
+        parsed += "answer" in local_llm.parse_response(text)
+
+    print(
+        json.dumps(
+            {
+                "load_s": round(load_s, 2),
+                "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                "tokens_per_s": round(tokens / gen_s, 1) if gen_s else 0.0,
+                "json_ok": f"{parsed}/{runs}",
+            }
+        )
+    )
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark CPU precisions of the local LLM.")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--threads", type=int, default=0, help="VA_LLM_THREADS (0 = all cores)")
+    p.add_argument("--precisions", nargs="+", default=["fp32", "bf16", "int8"])
+    p.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.worker:
+        worker(args.runs)
+        return
+
+    print(f"{'precision':>9} {'load s':>7} {'RSS MB':>8} {'tok/s':>7} {'json':>6}")
+    for precision in args.precisions:
+        env = {
+            **os.environ,
+            "CUDA_VISIBLE_DEVICES": "",
+            "VA_LLM_PRECISION": precision,
+            "VA_LLM_THREADS": str(args.threads),
+            "VA_LLM_SELF_CHECK": "0",
+        }
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_llm_cpu",
+                "--worker",
+                "--runs",
+                str(args.runs),
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{precision:>9} failed:\n{proc.stderr[-2000:]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{precision:>9} {r['load_s']:>7.2f} {r['peak_rss_mb']:>8.1f} "
+            f"{r['tokens_per_s']:>7.1f} {r['json_ok']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
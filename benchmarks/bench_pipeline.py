@@ -0,0 +1,322 @@
+"""
+bench_pipeline.py
+-----------------
+Per-stage micro-benchmarks of the document → answer pipeline on a synthetic
+deal (benchmarks.synthetic), from 10 to 100k+ clauses:
+
+    extract_sections      documents/s   text_loader.extract_sections
+    extract_clauses       clauses/s     text_loader.extract_clauses
+    build_chunks          chunks/s      chunker.build_chunks_from_json
+    build_index           chunks/s      index_builder.build_chroma_index
+    retrieve_context      queries/s     rag_engine.retrieve_context
+    answer_query          queries/s     rag_engine.answer_query (answer cache off)
+
+Each stage reports the median wall seconds of --repeat runs (fewer once a
+stage has used --max-seconds), throughput, and peak traced memory from one
+extra tracemalloc run (Python and NumPy allocations, not Chroma's native
+HNSW). File reading / parsing happens outside the timed region.
+
+Embedding and LLM default to the offline stubs in benchmarks.stubs, so the
+suite runs on CPU without model downloads; --embedder real / --llm real use
+the configured models instead.
+
+Baselines: --save-baseline writes the results as JSON; --baseline compares
+against one (ratio per stage, REGRESSION above --tolerance; stages under
+MIN_COMPARABLE_S are too noisy to judge) and, with --fail-on-regression,
+exits 1 for CI.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_pipeline --clauses 10 1000 10000
+    PYTHONPATH=src python -m benchmarks.bench_pipeline --save-baseline /tmp/base.json
+    PYTHONPATH=src python -m benchmarks.bench_pipeline --baseline /tmp/base.json
+
+benchmarks/baselines/bench_pipeline_stub.json is a reference run (stubs,
+10 / 1k / 10k clauses, single-core Linux VM); timings only compare
+meaningfully against baselines saved on the same machine.
+"""
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import io
+import itertools
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.stubs import stub_embedder, stub_llm
+from benchmarks.synthetic import generate_deal
+from veridian_atlas.core import config
+from veridian_atlas.core.chroma_registry import chroma_registry
+from veridian_atlas.data_pipeline.loaders.text_loader import (
+    extract_clauses,
+    extract_content,
+    extract_sections,
+    handle_text_loading,
+    normalize_text,
+)
+from veridian_atlas.data_pipeline.processors.chunker import (
+    build_chunks_from_json,
+    save_chunks_as_jsonl,
+)
+from veridian_atlas.data_pipeline.processors.embedder import hf_embedder
+from veridian_atlas.data_pipeline.processors.index_builder import build_chroma_index
+from veridian_atlas.rag_engine.pipeline import rag_engine
+from veridian_atlas.rag_engine.pipeline.reference_lookup import reference_indexes
+
+DEAL = "Synthetic_000"
+MIN_COMPARABLE_S = 0.005
+STAGES = [
+    "extract_sections",
+    "extract_clauses",
+    "build_chunks",
+    "build_index",
+    "retrieve_context",
+    "answer_query",
+]
+QUERIES = [
+    "What is the prepayment fee?",
+    "When is the final maturity date?",
+    "What leverage ratio must each obligor maintain?",
+    "How much default interest accrues on overdue amounts?",
+    "Is there a negative pledge on the borrower's assets?",
+    "What is the commitment fee on undrawn amounts?",
+    "What does clause 2.3 say?",
+    "Summarise Section 4",
+]
+
+
+# ------------------------------------------------------------
+# MEASUREMENT
+# ------------------------------------------------------------
+def measure(
+    stage: str, fn: Callable[[], int], memory: bool, repeat: int, max_seconds: float
+) -> dict:
+    """fn runs the stage once and returns the number of items it processed."""
+    timings = []
+    while len(timings) < repeat and sum(timings) < max_seconds:
+        gc.collect()
+        start = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - start)
+    seconds = statistics.median(timings)
+    row = {
+        "stage": stage,
+        "items": items,
+        "runs": len(timings),
+        "seconds": round(seconds, 5),
+        "per_s": round(items / seconds, 1) if seconds > 0 else None,
+        "peak_mb": None,
+    }
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            row["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024**2, 2)
+        finally:
+            tracemalloc.stop()
+    return row
+
+
+@contextlib.contextmanager
+def quiet():
+    # Per-document INFO logs and index progress prints would dominate small runs
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+# ------------------------------------------------------------
+# STAGES
+# ------------------------------------------------------------
+def bench_size(root: Path, clauses: int, args) -> dict:
+    deals_dir = root / f"deals_{clauses}"
+    shape = generate_deal(deals_dir, clauses, deal_name=DEAL)
+    deal_root = deals_dir / DEAL
+
+    files = sorted((deal_root / "raw").glob("*.txt"))
+    texts = [normalize_text(extract_content(f)) for f in files]
+    raw_sections = [s["raw_section_text"] for t in texts for s in extract_sections(t)]
+    parsed = {
+        f.stem: handle_text_loading(DEAL, f.stem, f, hashlib.sha256(f.read_bytes()).hexdigest())
+        for f in files
+    }
+    chunks_path = deal_root / "processed" / "chunks.jsonl"
+    save_chunks_as_jsonl(build_chunks_from_json(parsed, DEAL, deal_root), chunks_path)
+
+    builds = itertools.count()
+    db = {"path": None}
+
+    def build_index() -> int:
+        # Fresh index every run: measures a full build, not an incremental no-op
+        db["path"] = root / f"db_{clauses}_{next(builds)}"
+        return build_chroma_index(DEAL, chunks_path, db["path"])["added"]
+
+    # Distinct texts, so the query-embedding cache never answers within a run
+    asked = [f"{QUERIES[i % len(QUERIES)]} (run {i})" for i in range(args.queries)]
+
+    def retrieve() -> int:
+        rag_engine.query_embedding_cache.clear()
+        for q in asked:
+            rag_engine.retrieve_context(q, DEAL, args.top_k)
+        return len(asked)
+
+    def answer() -> int:
+        rag_engine.query_embedding_cache.clear()
+        for q in asked:
+            rag_engine.answer_query(q, DEAL, args.top_k)
+        return len(asked)
+
+    stages: Dict[str, Callable[[], int]] = {
+        "extract_sections": lambda: len([extract_sections(t) for t in texts]),
+        "extract_clauses": lambda: sum(len(extract_clauses(s)) for s in raw_sections),
+        "build_chunks": lambda: sum(1 for _ in build_chunks_from_json(parsed, DEAL, deal_root)),
+        "build_index": build_index,
+        "retrieve_context": retrieve,
+        "answer_query": answer,
+    }
+
+    original = (
+        rag_engine.get_chroma_collection,
+        rag_engine._answer_cache_key,
+        rag_engine.DEFAULT_DB_PATH,
+    )
+    rag_engine.get_chroma_collection = lambda deal: chroma_registry.get_collection(deal, db["path"])
+    rag_engine._answer_cache_key = lambda *a: None  # every query reaches generation
+    rows = []
+    try:
+        for stage in STAGES:
+            if stage == "retrieve_context":
+                # Query the index the API would serve: reference index file + opened collection
+                rag_engine.DEFAULT_DB_PATH = db["path"]
+                reference_indexes.invalidate(DEAL)
+                rag_engine.retrieve_context("warm up", DEAL, args.top_k)
+            rows.append(
+                measure(stage, stages[stage], not args.no_memory, args.repeat, args.max_seconds)
+            )
+    finally:
+        (
+            rag_engine.get_chroma_collection,
+            rag_engine._answer_cache_key,
+            rag_engine.DEFAULT_DB_PATH,
+        ) = original
+        reference_indexes.invalidate(DEAL)
+    return {"shape": shape, "stages": {row.pop("stage"): row for row in rows}}
+
+
+# ------------------------------------------------------------
+# BASELINES
+# ------------------------------------------------------------
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Prints ratios vs the baseline; returns the regressed "clauses/stage" names."""
+    regressions = []
+    print(f"\n{'clauses':>8} {'stage':>17} {'time x':>8} {'peak x':>8}")
+    for size, run in results["runs"].items():
+        base_run = baseline.get("runs", {}).get(size)
+        if base_run is None:
+            continue
+        for stage, row in run["stages"].items():
+            base = base_run["stages"].get(stage)
+            if not base or base["seconds"] < MIN_COMPARABLE_S:
+                continue
+            time_x = row["seconds"] / base["seconds"]
+            peak_x = (
+                row["peak_mb"] / base["peak_mb"] if row["peak_mb"] and base.get("peak_mb") else None
+            )
+            regressed = time_x > 1 + tolerance or (peak_x or 0) > 1 + tolerance
+            if regressed:
+                regressions.append(f"{size}/{stage}")
+            print(
+                f"{size:>8} {stage:>17} {time_x:>7.2f}x "
+                f"{(f'{peak_x:.2f}x' if peak_x else '-'):>8}"
+                f"{'  REGRESSION' if regressed else ''}"
+            )
+    return regressions
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark pipeline stages on a synthetic deal.")
+    p.add_argument("--clauses", type=int, nargs="+", default=[10, 1000, 10000])
+    p.add_argument("--queries", type=int, default=50)
+    p.add_argument("--top-k", type=int, default=5)
+    p.add_argument("--embedder", choices=["stub", "real"], default="stub")
+    p.add_argument("--llm", choices=["stub", "real"], default="stub")
+    p.add_argument("--vector-backend", choices=["chroma", "numpy"], default=config.VECTOR_BACKEND)
+    p.add_argument("--repeat", type=int, default=5, help="Timed runs per stage (median).")
+    p.add_argument("--max-seconds", type=float, default=10.0, help="Stop repeating after this.")
+    p.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    p.add_argument("--save-baseline", type=Path)
+    p.add_argument("--baseline", type=Path, help="Compare against this baseline JSON.")
+    p.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown (0.5 = 50%%).")
+    p.add_argument("--fail-on-regression", action="store_true")
+    args = p.parse_args()
+
+    config.VECTOR_BACKEND = args.vector_backend
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "embedder": args.embedder,
+            "llm": args.llm,
+            "vector_backend": args.vector_backend,
+            "queries": args.queries,
+            "top_k": args.top_k,
+            "repeat": args.repeat,
+        },
+        "runs": {},
+    }
+
+    with contextlib.ExitStack() as stack:
+        if args.embedder == "stub":
+            stack.enter_context(stub_embedder(hf_embedder))
+        if args.llm == "stub":
+            stack.enter_context(stub_llm(rag_engine))
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+
+        print(
+            f"{'clauses':>8} {'stage':>17} {'items':>8} {'seconds':>9} "
+            f"{'items/s':>11} {'peak MB':>8}"
+        )
+        for clauses in args.clauses:
+            with quiet():
+                run = bench_size(tmp, clauses, args)
+            results["runs"][str(run["shape"]["clauses"])] = run
+            for stage, row in run["stages"].items():
+                peak = f"{row['peak_mb']:.2f}" if row["peak_mb"] is not None else "-"
+                print(
+                    f"{run['shape']['clauses']:>8} {stage:>17} {row['items']:>8} "
+                    f"{row['seconds']:>9.3f} {row['per_s'] or 0:>11.1f} {peak:>8}"
+                )
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n[BASELINE] saved → {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("meta", {}).get("embedder") != args.embedder:
+            print("[BASELINE] warning: baseline used a different embedder")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n[BASELINE] {len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+bench_vector_backends.py
+------------------------
+Chroma (HNSW + SQLite) vs the memory-mapped NumPy backend on random unit
+vectors (mpnet-sized, 768 dims). No models needed.
+
+Builds and queries run in separate subprocesses, so query-side RSS is the
+index as the API would load it. Reports build seconds, top-k query latency
+(p50 / p90), RSS added by opening + querying the index, on-disk size, and
+recall@k against exact search.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_vector_backends --sizes 1000 10000 50000
+    PYTHONPATH=src python -m benchmarks.bench_vector_backends --numpy-dtype float16
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+DIM = 768
+COLLECTION = "VA_Bench"
+
+
+def unit_vectors(n: int, seed: int) -> np.ndarray:
+    v = np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dir_mb(path: Path) -> float:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) / 1024**2
+
+
+def open_client(backend: str, path: Path, dtype: str):
+    if backend == "numpy":
+        from veridian_atlas.core.numpy_vectors import NumpyClient
+
+        return NumpyClient(path, dtype=dtype)
+    import chromadb
+    from chromadb.config import Settings
+
+    return chromadb.PersistentClient(path=str(path), settings=Settings(anonymized_telemetry=False))
+
+
+def build(backend: str, size: int, path: Path, dtype: str) -> dict:
+    vectors = unit_vectors(size, seed=0)
+    ids = [f"c{i}" for i in range(size)]
+
+    start = time.perf_counter()
+    col = open_client(backend, path, dtype).get_or_create_collection(COLLECTION)
+    for i in range(0, size, 1000):
+        col.upsert(
+            ids=ids[i : i + 1000],
+            embeddings=vectors[i : i + 1000].tolist(),
+            documents=[f"chunk {j}" for j in range(i, min(i + 1000, size))],
+            metadatas=[{"chunk_id": c} for c in ids[i : i + 1000]],
+        )
+    if hasattr(col, "flush"):
+        col.flush()
+    return {"build_s": round(time.perf_counter() - start, 2), "disk_mb": round(dir_mb(path), 1)}
+
+
+def query(backend: str, size: int, path: Path, dtype: str, queries: int, top_k: int) -> dict:
+    """Fresh process over the persisted index, as the API would open it."""
+    probes = unit_vectors(queries, seed=1)
+    exact = np.argsort(-(probes @ unit_vectors(size, seed=0).T), axis=1)[:, :top_k]
+
+    client = open_client(backend, path, dtype)
+    base_rss = rss_mb()
+    col = client.get_collection(COLLECTION)
+    col.query(query_embeddings=[probes[0].tolist()], n_results=top_k)  # warm up / load
+
+    latencies, hits = [], 0
+    for q, truth in zip(probes, exact):
+        t0 = time.perf_counter()
+        res = col.query(query_embeddings=[q.tolist()], n_results=top_k, include=["distances"])
+        latencies.append((time.perf_counter() - t0) * 1000)
+        found = {int(c[1:]) for c in res["ids"][0]}
+        hits += len(found & set(truth.tolist()))
+
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p90_ms": round(latencies[int(0.9 * (len(latencies) - 1))], 3),
+        "query_rss_mb": round(rss_mb() - base_rss, 1),
+        "recall": round(hits / (queries * top_k), 4),
+    }
+
+
+def run_worker(args, stage: str, backend: str, size: int, path: Path) -> dict:
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_vector_backends",
+        "--worker",
+        stage,
+        backend,
+        str(size),
+        str(path),
+        "--queries",
+        str(args.queries),
+        "--top-k",
+        str(args.top_k),
+        "--numpy-dtype",
+        args.numpy_dtype,
+    ]
+    proc = subprocess.run(cmd, env=os.environ, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark Chroma vs NumPy vector backends.")
+    p.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 50000])
+    p.add_argument("--backends", nargs="+", default=["chroma", "numpy"])
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--top-k", type=int, default=5)
+    p.add_argument("--numpy-dtype", default="float32", choices=["float32", "float16", "int8"])
+    p.add_argument(
+        "--worker", nargs=4, metavar=("STAGE", "BACKEND", "SIZE", "PATH"), help=argparse.SUPPRESS
+    )
+    args = p.parse_args()
+
+    if args.worker:
+        stage, backend, size, path = args.worker
+        if stage == "build":
+            result = build(backend, int(size), Path(path), args.numpy_dtype)
+        else:
+            result = query(
+                backend, int(size), Path(path), args.numpy_dtype, args.queries, args.top_k
+            )
+        print(json.dumps(result))
+        return
+
+    print(
+        f"{'backend':>8} {'chunks':>7} {'build s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+        f"{'+RSS MB':>8} {'disk MB':>8} {'recall':>7}"
+    )
+    for size in args.sizes:
+        for backend in args.backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    r = run_worker(args, "build", backend, size, Path(tmp))
+                    r.update(run_worker(args, "query", backend, size, Path(tmp)))
+                except RuntimeError as exc:
+                    print(f"{backend:>8} {size:>7} failed:\n{exc}")
+                    continue
+            print(
+                f"{backend:>8} {size:>7} {r['build_s']:>8.2f} {r['p50_ms']:>8.3f} "
+                f"{r['p90_ms']:>8.3f} {r['query_rss_mb']:>8.1f} {r['disk_mb']:>8.1f} "
+                f"{r['recall']:>7.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
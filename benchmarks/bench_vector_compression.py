@@ -0,0 +1,94 @@
+"""
+bench_vector_compression.py
+---------------------------
+Compressed first-pass storage of the NumPy vector backend against the
+float32 baseline: float16 / int8, with and without exact rescoring.
+
+Reports first-pass memory (what stays resident), savings vs float32,
+recall@k against exact float32 search, and query latency (p50).
+
+Random 768-dim unit vectors by default. Pass --vectors path.npy to use
+real embeddings (e.g. exported from the embedding store) instead.
+
+Usage (from repo root):
+    PYTHONPATH=src python -m benchmarks.bench_vector_compression --size 20000 --top-k 5
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_vector_backends import unit_vectors
+from veridian_atlas.core.numpy_vectors import NumpyClient
+
+MODES = [
+    ("float32", False),
+    ("float16", False),
+    ("float16", True),
+    ("int8", False),
+    ("int8", True),
+]
+
+
+def build(root: Path, vectors: np.ndarray, dtype: str, rescore: bool, factor: int):
+    client = NumpyClient(
+        root / f"{dtype}_{rescore}", dtype=dtype, rescore=rescore, rescore_factor=factor
+    )
+    col = client.get_or_create_collection("VA_Bench")
+    ids = [f"c{i}" for i in range(len(vectors))]
+    for i in range(0, len(vectors), 5000):
+        col.upsert(ids=ids[i : i + 5000], embeddings=vectors[i : i + 5000])
+    col.flush()
+    # Reopen: the query path works on the memory-mapped files
+    return NumpyClient(client.path.parent, dtype=dtype).get_collection("VA_Bench")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark compressed vector storage.")
+    p.add_argument("--size", type=int, default=20000)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--top-k", type=int, default=5)
+    p.add_argument("--rescore-factor", type=int, default=8)
+    p.add_argument("--vectors", type=Path, help=".npy matrix of real embeddings")
+    args = p.parse_args()
+
+    if args.vectors:
+        data = np.load(args.vectors).astype(np.float32)
+        rng = np.random.default_rng(1)
+        pick = rng.choice(len(data), size=min(args.queries, len(data)), replace=False)
+        vectors, probes = data, data[pick] + rng.normal(scale=0.01, size=(len(pick), data.shape[1]))
+    else:
+        vectors, probes = unit_vectors(args.size, seed=0), unit_vectors(args.queries, seed=1)
+    probes = probes.astype(np.float32)
+
+    sq = (vectors**2).sum(axis=1)
+    truth = np.argsort(sq[None, :] - 2 * probes @ vectors.T, axis=1)[:, : args.top_k]
+
+    print(
+        f"{'dtype':>8} {'rescore':>8} {'first-pass MB':>14} {'savings':>8} "
+        f"{'recall@' + str(args.top_k):>9} {'p50 ms':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype, rescore in MODES:
+            col = build(Path(tmp), vectors, dtype, rescore, args.rescore_factor)
+            latencies, hits = [], 0
+            for q, want in zip(probes, truth):
+                t0 = time.perf_counter()
+                res = col.query(query_embeddings=[q], n_results=args.top_k, include=["distances"])
+                latencies.append((time.perf_counter() - t0) * 1000)
+                hits += len({int(c[1:]) for c in res["ids"][0]} & set(want.tolist()))
+
+            stats = col.storage_stats()
+            print(
+                f"{dtype:>8} {'yes' if stats['rescore'] else 'no':>8} "
+                f"{stats['first_pass_mb']:>14.1f} {stats['savings_x']:>7.2f}x "
+                f"{hits / (len(probes) * args.top_k):>9.4f} {statistics.median(latencies):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+stubs.py
+--------
+Small local stand-ins for the embedding model and the LLM, so pipeline
+benchmarks run offline on CPU without model downloads.
+
+ - HashingEncoder: SentenceTransformer-compatible encode() (hashed bag of
+   words → fixed-size vectors). Deterministic; similar texts land close
+ - stub_embedder(): swaps it into an EmbeddingService (no embedding store,
+   own model id so caches / build_meta never mix with real vectors)
+ - stub_llm(): replaces generation and token counting in rag_engine; the
+   "answer" cites the first chunk in the prompt, so citation checks still run
+
+Both are context managers and restore the real objects on exit.
+"""
+
+import re
+import zlib
+from contextlib import contextmanager
+from typing import List
+
+import numpy as np
+
+TOKEN = re.compile(r"\w+")
+CHUNK_REF = re.compile(r"^\[([^\]]+)\]", re.MULTILINE)
+
+
+class HashingEncoder:
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+    ) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in TOKEN.findall(text.casefold()):
+                h = zlib.crc32(token.encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+
+@contextmanager
+def stub_embedder(service, dim: int = 384):
+    saved = (service.model_name, service.backend, service.store_dir, service._model, service._store)
+    service.model_name = f"stub/hashing-{dim}"
+    service.backend = "torch"
+    service.store_dir = None
+    service._store = None
+    service._model = HashingEncoder(dim)
+    try:
+        yield service
+    finally:
+        service.model_name, service.backend, service.store_dir, service._model, service._store = (
+            saved
+        )
+
+
+def stub_generate(prompt: str, max_tokens: int = 256) -> dict:
+    cited = CHUNK_REF.findall(prompt)[:1]
+    return {"answer": "Stub answer." if cited else "", "citations": cited}
+
+
+@contextmanager
+def stub_llm(rag_engine):
+    saved = (rag_engine.generate_response, rag_engine.generate_responses, rag_engine.count_tokens)
+    rag_engine.generate_response = stub_generate
+    rag_engine.generate_responses = lambda prompts, max_tokens=256: [
+        stub_generate(p, max_tokens) for p in prompts
+    ]
+    rag_engine.count_tokens = lambda text: len(text.split())
+    try:
+        yield
+    finally:
+        rag_engine.generate_response, rag_engine.generate_responses, rag_engine.count_tokens = saved
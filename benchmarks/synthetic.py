@@ -0,0 +1,149 @@
+"""
+synthetic.py
+------------
+Deterministic generator for synthetic credit-agreement style deals in the
+SECTION / clause text format parsed by text_loader.
+
+Usage:
+    from benchmarks.synthetic import generate_corpus, generate_deal
+    generate_corpus(Path("/tmp/deals"), deals=4, docs_per_deal=250)
+    generate_deal(Path("/tmp/deals"), clauses=100_000)  # one deal, sized by clause count
+"""
+
+import math
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SECTION_TITLES = [
+    "Definitions and Interpretation",
+    "Facility Terms",
+    "Interest and Fees",
+    "Repayment and Prepayment",
+    "Conditions Precedent",
+    "Representations and Warranties",
+    "Financial Covenants",
+    "Events of Default",
+    "Security Package",
+    "Payment Mechanics",
+]
+
+CLAUSE_TITLES = [
+    "Upfront Fee",
+    "Commitment Fee",
+    "Prepayment Premium",
+    "Maturity Date",
+    "Interest Period",
+    "Default Interest",
+    "Leverage Ratio",
+    "Negative Pledge",
+    "Cross Default",
+    "Change of Control",
+]
+
+BOILERPLATE = [
+    "The Borrower shall pay to the Agent, for the account of each Lender, a fee of {pct}% "
+    "of the Total Commitments on the date of this Agreement.",
+    "Any amount not paid when due shall accrue default interest at {pct}% per annum above the "
+    "applicable rate until the date of actual payment.",
+    "The Borrower may prepay the whole or any part of the Loan on {days} Business Days' prior "
+    "notice, subject to a prepayment fee of {pct}%.",
+    "Each Obligor shall ensure that the Leverage Ratio in respect of any Relevant Period does "
+    "not exceed {ratio}:1.",
+    "No Obligor shall create or permit to subsist any Security over any of its assets, other "
+    "than Permitted Security, for a period of {days} days.",
+    "The Final Maturity Date shall be the date falling {months} months after the Closing Date.",
+]
+
+
+def _clause_body(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        rng.choice(BOILERPLATE).format(
+            pct=rng.choice(["0.5", "1", "1.5", "2", "2.5", "3"]),
+            days=rng.choice([5, 10, 15, 30]),
+            ratio=rng.choice(["3.5", "4.0", "4.5"]),
+            months=rng.choice([36, 48, 60, 84]),
+        )
+        for _ in range(sentences)
+    )
+
+
+def generate_document(seed: int, sections: int = 10, clauses_per_section: int = 5) -> str:
+    """One agreement as text. Same seed → byte-identical output."""
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for s in range(1, sections + 1):
+        lines.append(f"SECTION {s} – {SECTION_TITLES[(s - 1) % len(SECTION_TITLES)]}")
+        lines.append(_clause_body(rng, 1))
+        lines.append("")
+        for c in range(1, clauses_per_section + 1):
+            lines.append(f"{s}.{c} {rng.choice(CLAUSE_TITLES)}")
+            lines.append(_clause_body(rng, rng.randint(1, 3)))
+            lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(
+    root: Path,
+    deals: int = 2,
+    docs_per_deal: int = 10,
+    sections: int = 10,
+    clauses_per_section: int = 5,
+    seed: int = 7,
+) -> Dict[str, int]:
+    """
+    Writes root/{deal}/raw/*.txt. Returns {deal_name: document_count}.
+    Total clauses = deals * docs_per_deal * sections * clauses_per_section.
+    """
+    written = {}
+    for d in range(deals):
+        deal_name = f"Synthetic_{d:03d}"
+        raw = Path(root) / deal_name / "raw"
+        raw.mkdir(parents=True, exist_ok=True)
+        for i in range(docs_per_deal):
+            text = generate_document(
+                seed * 1_000_003 + d * 10_007 + i, sections, clauses_per_section
+            )
+            (raw / f"Agreement_{i:05d}.txt").write_text(text, encoding="utf-8")
+        written[deal_name] = docs_per_deal
+    return written
+
+
+def corpus_shape(
+    clauses: int, sections: int = 10, clauses_per_section: int = 5
+) -> Tuple[int, int, int]:
+    """
+    (documents, sections, clauses_per_section) for about `clauses` clauses in
+    one deal. Small targets shrink the document instead of rounding up to a
+    whole default-sized agreement.
+    """
+    clauses = max(1, clauses)
+    clauses_per_section = min(clauses_per_section, clauses)
+    sections = min(sections, math.ceil(clauses / clauses_per_section))
+    docs = math.ceil(clauses / (sections * clauses_per_section))
+    return docs, sections, clauses_per_section
+
+
+def generate_deal(
+    root: Path,
+    clauses: int,
+    deal_name: str = "Synthetic_000",
+    sections: int = 10,
+    clauses_per_section: int = 5,
+    seed: int = 7,
+) -> Dict[str, int]:
+    """
+    Writes root/{deal_name}/raw/*.txt holding ~`clauses` clauses (10 → 100k+).
+    Returns {"documents", "sections", "clauses"} actually written.
+    """
+    docs, sections, clauses_per_section = corpus_shape(clauses, sections, clauses_per_section)
+    raw = Path(root) / deal_name / "raw"
+    raw.mkdir(parents=True, exist_ok=True)
+    for i in range(docs):
+        text = generate_document(seed * 1_000_003 + i, sections, clauses_per_section)
+        (raw / f"Agreement_{i:05d}.txt").write_text(text, encoding="utf-8")
+    return {
+        "documents": docs,
+        "sections": docs * sections,
+        "clauses": docs * sections * clauses_per_section,
+    }
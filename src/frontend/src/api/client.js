@@ -91,6 +91,19 @@ export async function fetchChunkForDeal(deal_id, chunk_id) {
   return res.json();
 }
 
+/**
+ * Bulk chunk fetch (all citations of an answer in one call)
+ * POST /chunks/{deal}
+ */
+export async function fetchChunksForDeal(deal_id, chunk_ids) {
+  const res = await fetch(`${BASE}/chunks/${deal_id}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ chunk_ids }),
+  });
+  return res.json();
+}
+
 // Export all
 export default {
   listDeals,
@@ -100,4 +113,5 @@ export default {
   fetchDealDocuments,
   apiHealth,
   fetchChunkForDeal,
+  fetchChunksForDeal,
 };
@@ -1,6 +1,6 @@
 # veridian_atlas/api/schemas.py
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 
 # ---------------------------------------------------------
@@ -52,6 +52,64 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
 
 
+# ---------------------------------------------------------
+# BATCH (many queries, one deal; results in request order)
+# ---------------------------------------------------------
+class BatchQueryRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1)
+    top_k: int = 3
+
+
+class BatchSearchResponse(BaseModel):
+    deal_id: str
+    count: int
+    results: List[SearchResponse]  # one per query, in request order
+
+
+class BatchQueryResponse(BaseModel):
+    deal_id: str
+    count: int
+    results: List[QueryResponse]  # one per query, in request order
+
+
+# ---------------------------------------------------------
+# FEDERATED SEARCH (POST /search, explicit deal allow-list)
+# ---------------------------------------------------------
+class FederatedSearchRequest(BaseModel):
+    query: str
+    deal_ids: List[str] = Field(..., min_length=1)  # only these deals are searched
+    top_k: int = 5  # global, across all deals
+
+
+class FederatedSearchResult(SearchResult):
+    deal_id: str
+    distance: float
+
+
+class FederatedSearchResponse(BaseModel):
+    query: str
+    deals_searched: List[str]
+    missing_deals: List[str] = []  # requested deals without an index
+    errors: Dict[str, str] = {}  # deal → why its search failed (other deals still answer)
+    count: int
+    results: List[FederatedSearchResult]
+
+
+# ---------------------------------------------------------
+# BULK CHUNK FETCH (POST /chunks/{deal_id}, cited chunks for the UI)
+# ---------------------------------------------------------
+class ChunkFetchRequest(BaseModel):
+    chunk_ids: List[str] = Field(..., min_length=1)
+
+
+class ChunkFetchResponse(BaseModel):
+    deal_id: str
+    ids: List[str]  # found chunks, in request order
+    documents: List[str]
+    metadatas: List[dict]
+    missing: List[str] = []
+
+
 # ---------------------------------------------------------
 # DEAL & DOCUMENT METADATA (for sidebars / dropdowns)
 # ---------------------------------------------------------
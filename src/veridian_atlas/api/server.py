@@ -1,16 +1,42 @@
 # veridian_atlas/api/server.py
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import threading
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from veridian_atlas.api.schemas import QueryRequest, QueryResponse, SearchResponse
+from veridian_atlas.api.schemas import (
+    BatchQueryRequest,
+    BatchQueryResponse,
+    BatchSearchResponse,
+    ChunkFetchRequest,
+    ChunkFetchResponse,
+    FederatedSearchRequest,
+    FederatedSearchResponse,
+    QueryRequest,
+    QueryResponse,
+    SearchResponse,
+)
+from veridian_atlas.core import config
+from veridian_atlas.rag_engine.pipeline.chunk_lookup import chunk_lookup
 from veridian_atlas.rag_engine.pipeline.rag_engine import (
+    retrieve_across_deals,
     retrieve_context,
+    retrieve_context_batch,
     answer_query,
+    answer_query_batch,
     get_chroma_collection,
+    stream_answer,
+)
+from veridian_atlas.rag_engine.services.deal_catalog import deal_catalog
+from veridian_atlas.rag_engine.services.inference_executor import (
+    ServiceOverloaded,
+    inference_executor,
 )
 from veridian_atlas.rag_engine.services.query_service import QueryService
 
@@ -38,6 +64,25 @@ app.add_middleware(
 service = QueryService()
 
 
+# ---------------------------------------------------------
+# MODEL WORK (dedicated executor + admission control)
+#   /ask and /search run on inference_executor, not Starlette's
+#   threadpool, so light routes stay responsive under load.
+#   Over capacity → 503 + Retry-After.
+# ---------------------------------------------------------
+@app.exception_handler(ServiceOverloaded)
+async def overloaded_handler(request: Request, exc: ServiceOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def run_model_work(fn, *args):
+    return await asyncio.wrap_future(inference_executor.submit(fn, *args))
+
+
 # ---------------------------------------------------------
 # HEALTH
 # ---------------------------------------------------------
@@ -51,36 +96,32 @@ def health_check():
 # ---------------------------------------------------------
 # LIST ALL DEALS
 # ---------------------------------------------------------
+#   Served from deal_catalog (in memory, refreshed on mtime changes)
+# ---------------------------------------------------------
 @app.get("/deals")
 def list_deals():
-    base = Path("veridian_atlas/data/deals")
-    if not base.exists():
-        return {"deals": []}
-    deals = [d.name for d in base.iterdir() if d.is_dir()]
-    return {"deals": deals}
+    return {"deals": deal_catalog.deal_ids()}
+
+
+def _catalog_entry(deal_id: str) -> dict:
+    deal = deal_catalog.get(deal_id)
+    if deal is None:
+        raise HTTPException(status_code=404, detail="Deal not found")
+    return deal
 
 
 # ---------------------------------------------------------
-# DEAL METADATA (status of processed files)
+# DEAL METADATA (status of processed files + index)
 # ---------------------------------------------------------
 @app.get("/deals/{deal_id}")
 def deal_metadata(deal_id: str):
-    base = Path(f"veridian_atlas/data/deals/{deal_id}")
-    if not base.exists():
-        raise HTTPException(status_code=404, detail="Deal not found")
-
-    processed = base / "processed" / "chunks.jsonl"
-    embeddings_dir = Path("veridian_atlas/data/indexes/chroma_db")
-
+    deal = _catalog_entry(deal_id)
     return {
         "deal_id": deal_id,
-        "paths": {
-            "raw_dir": str(base / "raw"),
-            "processed_chunks_file": str(processed),
-            "raw_exists": (base / "raw").exists(),
-            "chunks_exists": processed.exists(),
-            "embeddings_exists": embeddings_dir.exists(),
-        },
+        "document_count": deal["document_count"],
+        "chunk_count": deal["chunk_count"],
+        "index": deal["index"],
+        "paths": deal["paths"],
     }
 
 
@@ -89,15 +130,12 @@ def deal_metadata(deal_id: str):
 # ---------------------------------------------------------
 @app.get("/deals/{deal_id}/docs")
 def deal_documents(deal_id: str):
-    base = Path(f"veridian_atlas/data/deals/{deal_id}")
-    if not base.exists():
-        raise HTTPException(status_code=404, detail="Deal not found")
-
+    deal = _catalog_entry(deal_id)
     return {
         "deal_id": deal_id,
         "documents": {
-            "raw": [d.name for d in (base / "raw").glob("*")],
-            "processed": [p.name for p in (base / "processed").glob("*")],
+            "raw": deal["raw_documents"],
+            "processed": deal["processed_documents"],
         },
     }
 
@@ -106,17 +144,23 @@ def deal_documents(deal_id: str):
 # ASK (LLM + RETRIEVAL)
 # ---------------------------------------------------------
 @app.post("/ask/{deal_id}", response_model=QueryResponse)
-def ask_for_deal(deal_id: str, request: QueryRequest):
+async def ask_for_deal(deal_id: str, request: QueryRequest):
     try:
-        result = answer_query(request.query, deal_id, request.top_k)
+        result = await run_model_work(answer_query, request.query, deal_id, request.top_k)
+    except ServiceOverloaded:
+        raise
     except Exception:
         raise HTTPException(
             status_code=404, detail="Deal not found or missing embeddings. Run indexing first."
         )
 
+    return _ask_response(result, deal_id)
+
+
+def _format_sources(sources: list, deal_id: str) -> list:
     # format results for Pydantic
     formatted_sources = []
-    for src in result.get("sources", []):
+    for src in sources:
         formatted_sources.append(
             {
                 "chunk_id": src["chunk_id"],
@@ -128,7 +172,11 @@ def ask_for_deal(deal_id: str, request: QueryRequest):
                 "deal": deal_id,
             }
         )
+    return formatted_sources
+
 
+def _ask_response(result: dict, deal_id: str) -> dict:
+    formatted_sources = _format_sources(result.get("sources", []), deal_id)
     return {
         "deal_id": deal_id,  # REQUIRED FIELD
         "query": result.get("query"),
@@ -139,19 +187,109 @@ def ask_for_deal(deal_id: str, request: QueryRequest):
     }
 
 
+# ---------------------------------------------------------
+# ASK (STREAMING, server-sent events)
+#   event: sources → {deal_id, query, source_count, sources}
+#   event: token   → {text}   (answer text as it is generated)
+#   event: final   → same body as /ask (validated citations)
+#   event: error   → {detail}
+# ---------------------------------------------------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_payload(event: str, payload: dict, deal_id: str) -> dict:
+    if event == "sources":
+        sources = _format_sources(payload["sources"], deal_id)
+        return {
+            "deal_id": deal_id,
+            "query": payload["query"],
+            "source_count": len(sources),
+            "sources": sources,
+        }
+    if event == "final":
+        return _ask_response(payload, deal_id)
+    return payload
+
+
+@app.post("/ask/{deal_id}/stream")
+async def ask_for_deal_stream(deal_id: str, request: QueryRequest):
+    """
+    The whole stream holds one inference worker; events are handed to the
+    event loop through an asyncio queue.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def produce():
+        try:
+            for item in stream_answer(request.query, deal_id, request.top_k, cancel=cancelled):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(events.put_nowait, ("event", item))
+        except Exception as exc:
+            loop.call_soon_threadsafe(events.put_nowait, ("error", exc))
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, ("done", None))
+
+    def expired(future):
+        # produce() never raises; an exception here means it was dropped from the queue
+        if future.exception() is not None:
+            loop.call_soon_threadsafe(events.put_nowait, ("error", future.exception()))
+
+    inference_executor.submit(produce).add_done_callback(expired)
+
+    # Retrieval runs before the response starts, so a missing deal is still a plain 404
+    kind, first = await events.get()
+    if kind != "event":
+        if isinstance(first, ServiceOverloaded):
+            raise first
+        raise HTTPException(
+            status_code=404, detail="Deal not found or missing embeddings. Run indexing first."
+        )
+
+    async def body():
+        kind, item = "event", first
+        try:
+            while kind != "done":
+                if kind == "event":
+                    event, payload = item
+                    yield _sse(event, _sse_payload(event, payload, deal_id))
+                elif kind == "error":
+                    yield _sse("error", {"detail": f"Generation failed: {item}"})
+                kind, item = await events.get()
+        finally:
+            # Client went away → the cancel event stops generate at its next token,
+            # which frees the inference worker
+            cancelled.set()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ---------------------------------------------------------
 # SEARCH (RETRIEVAL ONLY)
 # ---------------------------------------------------------
 @app.post("/search/{deal_id}", response_model=SearchResponse)
-def search_for_deal(deal_id: str, request: QueryRequest):
+async def search_for_deal(deal_id: str, request: QueryRequest):
     try:
-        contexts = retrieve_context(request.query, deal_id, request.top_k)
+        contexts = await run_model_work(retrieve_context, request.query, deal_id, request.top_k)
+    except ServiceOverloaded:
+        raise
     except Exception:
         raise HTTPException(status_code=404, detail="Deal not found or index missing")
 
+    return _search_response(contexts, request.query, deal_id)
+
+
+def _search_response(contexts: list, query: str, deal_id: str) -> dict:
     return {
         "deal_id": deal_id,
-        "query": request.query,
+        "query": query,
         "count": len(contexts),
         "results": [
             {
@@ -166,20 +304,152 @@ def search_for_deal(deal_id: str, request: QueryRequest):
 
 
 # ---------------------------------------------------------
-# CHUNK LOOKUP (UI Side Panel)
+# BATCH (many queries against one deal, results in request order)
+#   One embed call + one multi-vector collection query; /ask/batch hands
+#   all prompts to the LLM batcher together.
 # ---------------------------------------------------------
-@app.get("/chunk/{deal_id}/{chunk_id}")
-def get_chunk(deal_id: str, chunk_id: str):
+def _check_batch_size(request: BatchQueryRequest):
+    if len(request.queries) > config.BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {config.BATCH_MAX_QUERIES} queries per batch",
+        )
+
+
+@app.post("/search/{deal_id}/batch", response_model=BatchSearchResponse)
+async def search_batch_for_deal(deal_id: str, request: BatchQueryRequest):
+    _check_batch_size(request)
+    try:
+        batches = await run_model_work(
+            retrieve_context_batch, request.queries, deal_id, request.top_k
+        )
+    except ServiceOverloaded:
+        raise
+    except Exception:
+        raise HTTPException(status_code=404, detail="Deal not found or index missing")
+
+    return {
+        "deal_id": deal_id,
+        "count": len(batches),
+        "results": [
+            _search_response(contexts, query, deal_id)
+            for query, contexts in zip(request.queries, batches)
+        ],
+    }
+
+
+@app.post("/ask/{deal_id}/batch", response_model=BatchQueryResponse)
+async def ask_batch_for_deal(deal_id: str, request: BatchQueryRequest):
+    _check_batch_size(request)
     try:
-        col = get_chroma_collection(deal_id)
-        result = col.get(where={"chunk_id": chunk_id})
+        results = await run_model_work(answer_query_batch, request.queries, deal_id, request.top_k)
+    except ServiceOverloaded:
+        raise
     except Exception:
-        raise HTTPException(status_code=404, detail="Deal not found or embeddings missing")
+        raise HTTPException(
+            status_code=404, detail="Deal not found or missing embeddings. Run indexing first."
+        )
+
+    return {
+        "deal_id": deal_id,
+        "count": len(results),
+        "results": [_ask_response(result, deal_id) for result in results],
+    }
+
 
-    if not result or not result.get("documents"):
+# ---------------------------------------------------------
+# FEDERATED SEARCH (RETRIEVAL ONLY, many deals)
+#   Only deals listed in deal_ids are searched (no implicit "all deals").
+# ---------------------------------------------------------
+@app.post("/search", response_model=FederatedSearchResponse)
+async def search_across_deals(request: FederatedSearchRequest):
+    deal_ids = list(dict.fromkeys(request.deal_ids))
+    if len(deal_ids) > config.SEARCH_MAX_DEALS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {config.SEARCH_MAX_DEALS} deals per federated search",
+        )
+
+    hits, missing, errors = await run_model_work(
+        retrieve_across_deals, request.query, deal_ids, request.top_k
+    )
+    if len(missing) == len(deal_ids):
+        raise HTTPException(status_code=404, detail="None of the requested deals are indexed")
+    if len(missing) + len(errors) == len(deal_ids):
+        raise HTTPException(
+            status_code=503, detail=f"Search failed for every indexed deal: {errors}"
+        )
+
+    return {
+        "query": request.query,
+        "deals_searched": [d for d in deal_ids if d not in missing and d not in errors],
+        "missing_deals": missing,
+        "errors": errors,
+        "count": len(hits),
+        "results": [
+            {
+                "deal_id": c["deal"],
+                "chunk_id": c["chunk_id"],
+                "section": c.get("section"),
+                "clause": c.get("clause"),
+                "preview": c["content"][:240] + "..." if len(c["content"]) > 240 else c["content"],
+                "distance": c["distance"],
+            }
+            for c in hits
+        ],
+    }
+
+
+# ---------------------------------------------------------
+# CHUNK LOOKUP (UI Side Panel)
+# ---------------------------------------------------------
+#   By primary key: chunks.jsonl byte offsets first, then the collection
+#   (ids=..., never a metadata scan). Same ids/documents/metadatas shape
+#   as a collection.get().
+def _fetch_chunks(deal_id: str, chunk_ids: list) -> dict:
+    chunk_ids = list(dict.fromkeys(chunk_ids))
+    found = chunk_lookup.get(deal_id, chunk_ids) or {}
+
+    missing = [c for c in chunk_ids if c not in found]
+    if missing:
+        try:
+            stored = get_chroma_collection(deal_id).get(
+                ids=missing, include=["documents", "metadatas"]
+            )
+        except Exception:
+            if not found:
+                raise HTTPException(status_code=404, detail="Deal not found or embeddings missing")
+            stored = {"ids": [], "documents": [], "metadatas": []}
+        found.update(
+            (c, (doc, meta))
+            for c, doc, meta in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        )
+
+    ids = [c for c in chunk_ids if c in found]
+    return {
+        "ids": ids,
+        "documents": [found[c][0] for c in ids],
+        "metadatas": [found[c][1] for c in ids],
+        "missing": [c for c in chunk_ids if c not in found],
+    }
+
+
+@app.get("/chunk/{deal_id}/{chunk_id}")
+def get_chunk(deal_id: str, chunk_id: str):
+    result = _fetch_chunks(deal_id, [chunk_id])
+    if not result["documents"]:
         raise HTTPException(status_code=404, detail="Chunk not found")
 
-    return result
+    return {k: result[k] for k in ("ids", "documents", "metadatas")}
+
+
+@app.post("/chunks/{deal_id}", response_model=ChunkFetchResponse)
+def get_chunks(deal_id: str, request: ChunkFetchRequest):
+    if len(request.chunk_ids) > config.CHUNK_FETCH_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"At most {config.CHUNK_FETCH_MAX} chunk ids per request"
+        )
+    return {"deal_id": deal_id, **_fetch_chunks(deal_id, request.chunk_ids)}
 
 
 # ---------------------------------------------------------
@@ -11,8 +11,7 @@ Usage (CLI):
 import argparse
 from pathlib import Path
 from veridian_atlas.data_pipeline.processors.chunker import (
-    chunk_from_file,
-    save_chunks_as_jsonl,
+    chunk_deal,
     chunk_all_deals,
 )
 
@@ -28,14 +27,14 @@ def run(deal: str | None = None) -> dict:
     results = {}
 
     if deal:
-        section_file = BASE / deal / "processed" / "sections.json"
-        output_file = BASE / deal / "processed" / "chunks.jsonl"
+        processed_dir = BASE / deal / "processed"
+        output_file = processed_dir / "chunks.jsonl"
 
-        deal_name, chunks = chunk_from_file(section_file)
-        save_chunks_as_jsonl(chunks, output_file)
+        # Streams from sections.json or sections.jsonl, whichever is newest
+        deal_name, count = chunk_deal(processed_dir)
 
-        results[deal_name] = len(chunks)
-        print(f"✔ {deal_name}: {len(chunks)} chunks written to {output_file}")
+        results[deal_name] = count
+        print(f"✔ {deal_name}: {count} chunks written to {output_file}")
         return results
 
     # MULTI DEAL MODE
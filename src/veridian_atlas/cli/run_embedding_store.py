@@ -0,0 +1,76 @@
+"""
+run_embedding_store.py
+----------------------
+Inspect or compact the content-addressed embedding store.
+
+CLI Usage:
+    python -m veridian_atlas.cli.run_embedding_store
+    python -m veridian_atlas.cli.run_embedding_store --compact
+    python -m veridian_atlas.cli.run_embedding_store --compact --prune
+"""
+
+import argparse
+import json
+
+from veridian_atlas.core.constants import DEALS_DIR
+from veridian_atlas.data_pipeline.processors.embedder import hf_embedder
+from veridian_atlas.data_pipeline.processors.embedding_store import embedding_key
+
+# Package path, not the working directory: pruning against a wrong path
+# would see no live chunks and drop the whole store
+DEALS_BASE = DEALS_DIR
+
+
+def live_keys() -> set:
+    """
+    Keys for every chunk currently referenced by a deal's chunks.jsonl.
+    Raises if no deal has a chunks.jsonl (nothing to prune against).
+    """
+    chunk_files = sorted(DEALS_BASE.glob("*/processed/chunks.jsonl"))
+    if not chunk_files:
+        raise RuntimeError(f"No chunks.jsonl under {DEALS_BASE}; refusing to prune.")
+
+    keys = set()
+    for chunks_file in chunk_files:
+        with chunks_file.open("r", encoding="utf-8") as f:
+            for line in f:
+                content = json.loads(line).get("content", "").strip()
+                if content:
+                    keys.add(embedding_key(hf_embedder.model_id, hf_embedder.normalize, content))
+    return keys
+
+
+def run(compact: bool = False, prune: bool = False) -> dict:
+    """
+    PROGRAMMATIC ENTRYPOINT.
+    Returns store stats (plus compaction results when requested).
+    """
+    store = hf_embedder.store
+    if store is None:
+        raise RuntimeError("Embedding store disabled (VA_EMBEDDING_STORE=0).")
+
+    result = {"stats": store.stats()}
+    if compact:
+        # Live keys are collected before compact() touches the store
+        keep = live_keys() if prune else None
+        result["compaction"] = store.compact(keep=keep)
+        result["stats"] = store.stats()
+    return result
+
+
+def get_args():
+    p = argparse.ArgumentParser(description="Embedding store stats and compaction.")
+    p.add_argument("--compact", action="store_true", help="Rewrite without duplicate rows.")
+    p.add_argument(
+        "--prune", action="store_true", help="With --compact: drop texts no deal still uses."
+    )
+    return p.parse_args()
+
+
+def main():
+    args = get_args()
+    print(json.dumps(run(compact=args.compact, prune=args.prune), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ Build or rebuild ChromaDB vector indexes for one or all deals.
 Note:
     This step already handles embeddings internally as part of
     build_chroma_index(), so no separate embedding step is required.
+    Builds are incremental: only new or changed chunks are re-embedded.
+    Use --reset for a full drop + rebuild.
 
 CLI Usage:
     python -m veridian_atlas.cli.run_index --reset
@@ -28,7 +30,7 @@ DB_PATH = Path("veridian_atlas/data/indexes/chroma_db")
 def run(deal: str | None = None, reset: bool = False) -> dict:
     """
     Build vector index(es) and generate embeddings implicitly.
-    Returns dict of {deal_name: status}.
+    Returns dict of {deal_name: {"added", "updated", "deleted", "unchanged", "stages"}}.
     """
     return _index_single(deal, reset) if deal else _index_all(reset)
 
@@ -55,15 +57,15 @@ def _index_single(deal: str, reset: bool) -> dict:
     print(f"[RESET BEFORE BUILD]:  {'YES' if reset else 'NO'}")
     print("--------------------------------------------------\n")
 
-    build_chroma_index(
+    report = build_chroma_index(
         deal_name=deal,
         chunks_path=chunks_path,
         db_path=DB_PATH,
         reset_existing=reset,
     )
 
-    print(f"✔ Index built for: {deal}")
-    return {deal: "indexed"}
+    print(f"✔ Index built for: {deal} | {report}")
+    return {deal: report}
 
 
 # -----------------------------------------------------
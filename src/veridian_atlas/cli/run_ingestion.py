@@ -5,16 +5,25 @@ CLI + callable ingestion runner.
 """
 
 import argparse
+from veridian_atlas.data_pipeline.sections_io import SECTION_FORMATS
 from veridian_atlas.data_pipeline.router import ingest_all_deals, ingest_deal, supported_extensions
 from veridian_atlas.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def run(deal: str | None = None):
+def run(
+    deal: str | None = None,
+    force: bool = False,
+    workers: int = 1,
+    sections_format: str | None = None,
+):
     """
     PROGRAMMATIC INGESTION ENTRYPOINT.
     Use this when calling from Python (ex: run_project.py)
+    Unchanged files are skipped via the per-deal manifest unless force=True.
+    workers > 1 parses files on a process pool.
+    sections_format: "json" or "jsonl" (default: VA_SECTIONS_FORMAT).
     """
     logger.info("============================================")
     logger.info("     VERIDIAN ATLAS INGESTION EXECUTION     ")
@@ -23,10 +32,10 @@ def run(deal: str | None = None):
 
     if deal:
         logger.info(f"[MODE] Single deal ingest → {deal}")
-        ingest_deal(deal)
+        ingest_deal(deal, force=force, workers=workers, sections_format=sections_format)
     else:
         logger.info("[MODE] Full ingestion → all deals")
-        ingest_all_deals()
+        ingest_all_deals(force=force, workers=workers, sections_format=sections_format)
 
     logger.info("[DONE] Ingestion complete.")
 
@@ -34,6 +43,13 @@ def run(deal: str | None = None):
 def get_args():
     p = argparse.ArgumentParser(description="Run Veridian Atlas ingestion.")
     p.add_argument("--deal", type=str, help="Ingest only a specific deal.")
+    p.add_argument("--force", action="store_true", help="Re-parse files even if unchanged.")
+    p.add_argument("--workers", type=int, default=1, help="Parser processes (default: 1).")
+    p.add_argument(
+        "--sections-format",
+        choices=SECTION_FORMATS,
+        help="Processed sections layout (default: VA_SECTIONS_FORMAT or json).",
+    )
     return p.parse_args()
 
 
@@ -43,7 +59,12 @@ def main():
     Calls run() with CLI args.
     """
     args = get_args()
-    run(args.deal)
+    run(
+        args.deal,
+        force=args.force,
+        workers=args.workers,
+        sections_format=args.sections_format,
+    )
 
 
 if __name__ == "__main__":
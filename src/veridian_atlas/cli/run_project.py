@@ -15,6 +15,8 @@ CLI Usage:
     python -m veridian_atlas.cli.run_project --deal Blackbay_III
     python -m veridian_atlas.cli.run_project --no-validate
     python -m veridian_atlas.cli.run_project --clean
+    python -m veridian_atlas.cli.run_project --reset   # full index rebuild
+    python -m veridian_atlas.cli.run_project --workers 8
 """
 
 import argparse
@@ -23,6 +25,7 @@ from veridian_atlas.cli.run_ingestion import run as run_ingestion
 from veridian_atlas.cli.run_chunker import run as run_chunker
 from veridian_atlas.cli.run_index import run as run_index
 from veridian_atlas.cli.run_query import run as run_query
+from veridian_atlas.core.chroma_registry import chroma_registry
 from veridian_atlas.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -61,6 +64,7 @@ def clean_generated(deal: str | None = None):
                 import shutil
 
                 shutil.rmtree(item)
+        chroma_registry.invalidate(db_path=INDEX_DIR)
         logger.info("[CLEAN] ChromaDB index reset.")
 
     logger.info(">>> CLEAN COMPLETE.\n")
@@ -72,11 +76,16 @@ def clean_generated(deal: str | None = None):
 
 
 def run_all(
-    deal: str | None = None, clean: bool = False, validate: bool = True, reset_index: bool = True
+    deal: str | None = None,
+    clean: bool = False,
+    validate: bool = True,
+    reset_index: bool = False,
+    workers: int = 1,
 ):
     """
     Runs the full pipeline. Batch mode if no deal passed.
     auto-selects first deal for validation if --validate used.
+    Index builds are incremental unless reset_index=True.
     """
 
     logger.info("=============================================")
@@ -89,7 +98,7 @@ def run_all(
 
     # -- STEP 1: INGESTION
     logger.info("[1/4] INGESTION STARTING...")
-    run_ingestion(deal=deal)
+    run_ingestion(deal=deal, workers=workers)
     logger.info("[1/4] INGESTION COMPLETE.\n")
 
     # -- STEP 2: CHUNKING
@@ -140,7 +149,10 @@ def get_args():
     parser.add_argument("--deal", type=str, help="Process a single deal.")
     parser.add_argument("--clean", action="store_true", help="Remove generated files first.")
     parser.add_argument("--no-validate", action="store_true", help="Skip validation query.")
-    parser.add_argument("--no-reset", action="store_true", help="Do not reset index on rebuild.")
+    parser.add_argument("--reset", action="store_true", help="Drop and fully rebuild the index.")
+    parser.add_argument("--workers", type=int, default=1, help="Ingestion parser processes.")
+    # Kept for older scripts: incremental (no reset) is now the default
+    parser.add_argument("--no-reset", action="store_true", help=argparse.SUPPRESS)
     return parser.parse_args()
 
 
@@ -150,7 +162,8 @@ def main():
         deal=args.deal,
         clean=args.clean,
         validate=not args.no_validate,
-        reset_index=not args.no_reset,
+        reset_index=args.reset and not args.no_reset,
+        workers=args.workers,
     )
 
 
@@ -0,0 +1,113 @@
+"""
+chroma_registry.py
+------------------
+Process-wide ChromaDB client + collection registry.
+
+ - One PersistentClient per db_path for the whole process
+ - Per-deal collection handles cached → VA_{deal_name}
+ - Thread-safe (FastAPI runs sync routes on a threadpool)
+ - Stale handles dropped on rebuild / delete via invalidate()
+ - chromadb is imported on first client open, not at import time
+ - VA_VECTOR_BACKEND=numpy swaps in the memory-mapped NumpyClient
+   (same client / collection surface, see numpy_vectors.py)
+"""
+
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Optional, Tuple
+
+from veridian_atlas.core import config
+
+
+def collection_name_for(deal_name: str) -> str:
+    return f"VA_{deal_name}".replace(" ", "_")
+
+
+class ChromaRegistry:
+    def __init__(self):
+        self._lock = RLock()
+        self._clients: Dict[str, object] = {}
+        self._collections: Dict[Tuple[str, str], object] = {}
+
+    @staticmethod
+    def _key(db_path: Path) -> str:
+        return str(Path(db_path).resolve())
+
+    def get_client(self, db_path: Path, create: bool = False):
+        """
+        Returns the shared client for db_path. Opening is done once per process.
+        create=True makes the directory (index build); the query path never creates it.
+        """
+        key = self._key(db_path)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                return client
+
+            if create:
+                Path(db_path).mkdir(parents=True, exist_ok=True)
+            elif not Path(db_path).exists():
+                raise FileNotFoundError(f"[CHROMA] Index directory missing → {db_path}")
+
+            if config.VECTOR_BACKEND == "numpy":
+                from veridian_atlas.core.numpy_vectors import NumpyClient
+
+                client = NumpyClient(
+                    db_path,
+                    dtype=config.NUMPY_VECTOR_DTYPE,
+                    rescore=config.NUMPY_RESCORE,
+                    rescore_factor=config.NUMPY_RESCORE_FACTOR,
+                )
+            else:
+                import chromadb
+                from chromadb.config import Settings
+
+                client = chromadb.PersistentClient(
+                    path=str(db_path), settings=Settings(anonymized_telemetry=False)
+                )
+            self._clients[key] = client
+            return client
+
+    def get_collection(self, deal_name: str, db_path: Path):
+        """
+        Cached per-deal collection handle. Missing collections are not cached,
+        so a deal indexed later is picked up on the next call.
+        """
+        name = collection_name_for(deal_name)
+        key = (self._key(db_path), name)
+        with self._lock:
+            col = self._collections.get(key)
+            if col is not None:
+                return col
+
+            col = self.get_client(db_path).get_collection(name)
+            self._collections[key] = col
+            return col
+
+    def invalidate(self, deal_name: Optional[str] = None, db_path: Optional[Path] = None):
+        """
+        Drops cached collection handles.
+          - deal_name + db_path → that deal only
+          - deal_name only      → that deal in every db
+          - db_path only        → every deal in that db (and its client)
+          - nothing             → everything
+        """
+        name = collection_name_for(deal_name) if deal_name else None
+        path_key = self._key(db_path) if db_path else None
+
+        with self._lock:
+            for key in list(self._collections):
+                if (path_key is None or key[0] == path_key) and (name is None or key[1] == name):
+                    del self._collections[key]
+
+            if name is None:
+                for key in list(self._clients):
+                    if path_key is None or key == path_key:
+                        del self._clients[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clients": len(self._clients), "collections": len(self._collections)}
+
+
+chroma_registry = ChromaRegistry()
@@ -0,0 +1,127 @@
+"""
+config.py
+---------
+Runtime settings for Veridian Atlas.
+Every value can be overridden with a VA_* environment variable.
+"""
+
+import os
+
+from veridian_atlas.core.constants import DATA_DIR, INDEXES_DIR
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+# ---------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------
+# "json" (sections.json) or "jsonl" (sections.jsonl, streamed by the chunker)
+SECTIONS_FORMAT = os.getenv("VA_SECTIONS_FORMAT", "json")
+
+
+# ---------------------------------------------------------
+# Retrieval caches
+# ---------------------------------------------------------
+QUERY_EMBED_CACHE_SIZE = _env_int("VA_QUERY_EMBED_CACHE_SIZE", 1024)
+# "Section 4" / "2.1(a)" resolved from the reference index (exact, no embedding)
+REFERENCE_LOOKUP = _env_bool("VA_REFERENCE_LOOKUP", True)
+# Federated /search: deals per request, and threads querying collections in parallel
+SEARCH_MAX_DEALS = _env_int("VA_SEARCH_MAX_DEALS", 50)
+SEARCH_FANOUT_WORKERS = _env_int("VA_SEARCH_FANOUT_WORKERS", 8)
+# /search/{deal}/batch and /ask/{deal}/batch: queries per request
+BATCH_MAX_QUERIES = _env_int("VA_BATCH_MAX_QUERIES", 256)
+# POST /chunks/{deal}: chunk ids per request
+CHUNK_FETCH_MAX = _env_int("VA_CHUNK_FETCH_MAX", 500)
+# /deals catalog: seconds between filesystem change checks (0 = check every request)
+DEAL_CATALOG_CHECK_SECONDS = _env_float("VA_DEAL_CATALOG_CHECK_SECONDS", 2.0)
+
+# Answer cache: in-memory LRU + TTL (seconds, 0 = never expire)
+ANSWER_CACHE_SIZE = _env_int("VA_ANSWER_CACHE_SIZE", 256)
+ANSWER_CACHE_TTL = _env_float("VA_ANSWER_CACHE_TTL", 24 * 3600)
+# Optional on-disk tier so cached answers survive API restarts (unset = memory only)
+ANSWER_CACHE_DIR = os.getenv("VA_ANSWER_CACHE_DIR") or None
+
+
+# ---------------------------------------------------------
+# LLM generation
+# ---------------------------------------------------------
+# Concurrent /ask prompts are coalesced into one generate call.
+# VA_LLM_MAX_BATCH=1 disables batching (each call generates on its own thread).
+LLM_MAX_BATCH_SIZE = _env_int("VA_LLM_MAX_BATCH", 8)
+LLM_MAX_WAIT_MS = _env_float("VA_LLM_MAX_WAIT_MS", 5.0)
+# auto (fp16 on CUDA, fp32 on CPU) | fp32 | fp16 (CUDA; fp32 without it) | bf16 | int8 (CPU)
+LLM_PRECISION = os.getenv("VA_LLM_PRECISION", "auto")
+LLM_THREADS = _env_int("VA_LLM_THREADS", 0)  # 0 = one per available core
+# int8/bf16: generate once at load and warn if the JSON format breaks
+LLM_SELF_CHECK = _env_bool("VA_LLM_SELF_CHECK", True)
+# Reuse the attention KV cache of the fixed RAG instruction prefix
+LLM_PREFIX_CACHE = _env_bool("VA_LLM_PREFIX_CACHE", True)
+# Streams (/ask/{deal}/stream) fail if no token arrives within this many seconds
+LLM_STREAM_TIMEOUT = _env_float("VA_LLM_STREAM_TIMEOUT", 120.0)
+
+# Context packing: retrieved chunks are deduplicated and trimmed to fit
+# (Qwen tokens; the budget covers the CONTEXT block of the prompt)
+CONTEXT_PACKING = _env_bool("VA_CONTEXT_PACKING", True)
+CONTEXT_TOKEN_BUDGET = _env_int("VA_CONTEXT_TOKEN_BUDGET", 1200)
+CONTEXT_CHUNK_MAX_TOKENS = _env_int("VA_CONTEXT_CHUNK_MAX_TOKENS", 400)
+
+
+# ---------------------------------------------------------
+# API admission control
+# ---------------------------------------------------------
+# Threads running model work (ask/search); match VA_LLM_MAX_BATCH so a full
+# batch can form. Requests beyond workers + queue get 503 + Retry-After.
+INFERENCE_WORKERS = _env_int("VA_INFERENCE_WORKERS", 8)
+INFERENCE_QUEUE_SIZE = _env_int("VA_INFERENCE_QUEUE_SIZE", 16)
+# Seconds a request may wait for a worker before it is dropped (0 = no limit)
+INFERENCE_QUEUE_TIMEOUT = _env_float("VA_INFERENCE_QUEUE_TIMEOUT", 30.0)
+
+
+# ---------------------------------------------------------
+# Embeddings
+# ---------------------------------------------------------
+# Content-addressed vector store shared across deals and rebuilds
+EMBEDDING_STORE_ENABLED = _env_bool("VA_EMBEDDING_STORE", True)
+EMBEDDING_STORE_DIR = os.getenv("VA_EMBEDDING_STORE_DIR") or str(INDEXES_DIR / "embedding_store")
+EMBEDDING_STORE_DTYPE = os.getenv("VA_EMBEDDING_STORE_DTYPE", "float32")  # or float16
+
+# "torch" | "onnx" | "onnx-int8" (ONNX Runtime on CPU, exported on first use)
+EMBEDDING_BACKEND = os.getenv("VA_EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = os.getenv("VA_EMBEDDING_ONNX_DIR") or str(DATA_DIR / "models" / "onnx")
+EMBEDDING_ONNX_THREADS = _env_int("VA_EMBEDDING_ONNX_THREADS", 0)  # 0 = onnxruntime default
+
+
+# ---------------------------------------------------------
+# Vector storage
+# ---------------------------------------------------------
+# "chroma" (HNSW + SQLite) or "numpy" (memory-mapped .npy per deal, exact search)
+VECTOR_BACKEND = os.getenv("VA_VECTOR_BACKEND", "chroma")
+# First-pass storage: float32 | float16 | int8 (per-row scalar quantization)
+NUMPY_VECTOR_DTYPE = os.getenv("VA_NUMPY_VECTOR_DTYPE", "float32")
+# Compressed dtypes: re-rank top_k × factor candidates with exact float32 vectors
+NUMPY_RESCORE = _env_bool("VA_NUMPY_RESCORE", True)
+NUMPY_RESCORE_FACTOR = _env_int("VA_NUMPY_RESCORE_FACTOR", 8)
+
+
+# ---------------------------------------------------------
+# Index build
+# ---------------------------------------------------------
+# Overlap chunks.jsonl reading, embedding and Chroma upserts
+INDEX_PIPELINE = _env_bool("VA_INDEX_PIPELINE", True)
+# Batches allowed to wait between two stages (bounds build memory)
+INDEX_QUEUE_DEPTH = _env_int("VA_INDEX_QUEUE_DEPTH", 4)
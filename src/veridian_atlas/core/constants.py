@@ -0,0 +1,12 @@
+"""
+constants.py
+------------
+Fixed package paths (independent of the working directory).
+"""
+
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PACKAGE_ROOT / "data"
+DEALS_DIR = DATA_DIR / "deals"
+INDEXES_DIR = DATA_DIR / "indexes"
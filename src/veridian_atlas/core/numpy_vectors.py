@@ -0,0 +1,513 @@
+"""
+numpy_vectors.py
+----------------
+In-process vector backend: one memory-mapped .npy matrix per deal, exact search.
+
+ - Chroma-compatible surface (client: get_collection / get_or_create_collection /
+   delete_collection; collection: upsert / update / delete / get / query / count),
+   so index_builder and rag_engine work unchanged (VA_VECTOR_BACKEND=numpy)
+ - Top-k = squared L2 (Chroma's default space) from one matrix product per
+   block + argpartition; no HNSW, no SQLite
+ - First-pass vectors stored float32, float16 or int8 (VA_NUMPY_VECTOR_DTYPE,
+   int8 = per-row symmetric scale), read via mmap
+ - Compressed indexes keep an exact float32 copy on disk (mmap, only the
+   candidate rows are touched): the best k × VA_NUMPY_RESCORE_FACTOR
+   first-pass hits are re-ranked with exact distances
+
+Layout:
+    {db_path}/numpy_vectors/VA_{deal}/
+        gen-{generation}/    → one immutable directory per flush
+            vectors.npy      → (rows, dim) first-pass matrix, row i ↔ ids[i]
+            scales.npy       → (rows,) float32 row scales (int8 only)
+            vectors.f32.npy  → exact float32 matrix (compressed + rescoring only)
+            norms.npy        → (rows,) exact squared L2 norms
+            rows.json        → {"ids", "documents", "metadatas"} sidecar table
+        collection.json      → {"name", "metadata", "dtype", "dim", "rows", "rescore",
+                               "generation"} (written last: publishes the generation)
+
+Writes are buffered in memory (float32) and land on disk at flush() (once per
+index build) in a fresh generation directory; older generations are removed
+after the header switches over. Readers in other processes reload when
+collection.json changes, load every file from the generation it names, check
+that all row counts agree and retry if a rebuild raced the read.
+Indexes written before generations existed (files directly in the collection
+directory) still load.
+"""
+
+import json
+import shutil
+import time
+import uuid
+from pathlib import Path
+from threading import RLock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SEARCH_BLOCK_ROWS = 1024  # float32 block of 3 MB at 768 dims: stays in cache
+DEFAULT_GET_INCLUDE = ("metadatas", "documents")
+DEFAULT_QUERY_INCLUDE = ("metadatas", "documents", "distances")
+VECTOR_DTYPES = ("float32", "float16", "int8")
+LOAD_ATTEMPTS = 5  # a reload racing a rebuild retries with the newer header
+
+
+def _matches(meta: dict, where: Optional[dict]) -> bool:
+    """Equality filters only ({"chunk_id": ...}), all keys must match."""
+    return not where or all(meta.get(k) == v for k, v in where.items())
+
+
+def quantize_int8(vectors: np.ndarray):
+    """Per-row symmetric int8: x ≈ q * scale, scale = max|x| / 127."""
+    scales = np.abs(vectors).max(axis=1, initial=0.0) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.rint(vectors / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return q, scales.astype(np.float32)
+
+
+class NumpyCollection:
+    def __init__(
+        self,
+        path: Path,
+        name: str,
+        metadata: Optional[dict] = None,
+        dtype="float32",
+        rescore: bool = True,
+        rescore_factor: int = 8,
+    ):
+        if np.dtype(dtype).name not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype} (expected one of {VECTOR_DTYPES})")
+        self.path = Path(path)
+        self.name = name
+        self.metadata = metadata or {}
+        self.dtype = np.dtype(dtype)  # written at the next flush
+        self.rescore = rescore
+        self.rescore_factor = max(1, rescore_factor)
+
+        self._lock = RLock()
+        self._ids: List[str] = []
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[dict] = []
+        self._pos: Dict[str, int] = {}
+        # Clean: first-pass mmap (+ scales / exact mmap). Dirty: float32 working array.
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._exact: Optional[np.ndarray] = None
+        self._sq_norms: Optional[np.ndarray] = None
+        self._rows = 0
+        self._dirty = False
+        self._mtime: Optional[int] = None
+
+        self._load()
+
+    # ---------------------------------------------------------
+    # Files
+    # ---------------------------------------------------------
+    @property
+    def _header_file(self) -> Path:
+        return self.path / "collection.json"
+
+    def _header_mtime(self) -> Optional[int]:
+        try:
+            return self._header_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read_generation(self) -> Optional[tuple]:
+        """
+        (header, rows, matrix, scales, exact, sq_norms) from the generation the
+        header names, or None when a concurrent rebuild made the read inconsistent.
+        """
+        try:
+            header = json.loads(self._header_file.read_text(encoding="utf-8"))
+            generation = header.get("generation")
+            data = self.path / f"gen-{generation}" if generation else self.path
+            rows = json.loads((data / "rows.json").read_text(encoding="utf-8"))
+
+            matrix = scales = exact = sq_norms = None
+            if rows["ids"]:
+                matrix = np.load(data / "vectors.npy", mmap_mode="r")
+                sq_norms = np.load(data / "norms.npy")
+                if matrix.dtype == np.int8:
+                    scales = np.load(data / "scales.npy")
+                if header.get("rescore"):
+                    exact = np.load(data / "vectors.f32.npy", mmap_mode="r")
+        except (FileNotFoundError, json.JSONDecodeError, ValueError):
+            return None  # generation removed mid-read, or header replaced under us
+
+        counts = {len(rows["ids"]), len(rows["documents"]), len(rows["metadatas"])}
+        counts |= {len(a) for a in (matrix, scales, exact, sq_norms) if a is not None}
+        counts.add(header.get("rows", len(rows["ids"])))
+        if len(counts) != 1:
+            return None
+        return header, rows, matrix, scales, exact, sq_norms
+
+    def _load(self):
+        with self._lock:
+            for attempt in range(LOAD_ATTEMPTS):
+                mtime = self._header_mtime()
+                if mtime is None:
+                    return
+                snapshot = self._read_generation()
+                if snapshot is not None and self._header_mtime() == mtime:
+                    break
+                time.sleep(0.01 * (attempt + 1))
+            else:
+                # Still racing a rebuild: keep what is loaded, the next read retries
+                return
+
+            header, rows, matrix, scales, exact, sq_norms = snapshot
+            self.metadata = header.get("metadata", {})
+            self._ids = rows["ids"]
+            self._documents = rows["documents"]
+            self._metadatas = rows["metadatas"]
+            self._pos = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+            self._rows = len(self._ids)
+            self._matrix, self._scales, self._exact, self._sq_norms = (
+                matrix,
+                scales,
+                exact,
+                sq_norms,
+            )
+            self._mtime = mtime
+
+    def _refresh(self):
+        """Picks up a rebuild written by another process (no-op with pending writes)."""
+        with self._lock:
+            if not self._dirty and self._header_mtime() != self._mtime:
+                self._load()
+
+    def _float_rows(self, rows) -> np.ndarray:
+        """Best available float32 vectors for rows (slice or index list)."""
+        if self._exact is not None:
+            return np.asarray(self._exact[rows], dtype=np.float32)
+        block = np.asarray(self._matrix[rows], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[rows][:, None]
+        return block
+
+    def flush(self):
+        """
+        Writes buffered changes into a new generation directory, then publishes
+        it by replacing collection.json; older generations are removed last.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            generation = uuid.uuid4().hex[:16]
+            data = self.path / f"gen-{generation}"
+            data.mkdir(parents=True)
+            if self._matrix is not None:
+                vectors = np.ascontiguousarray(self._matrix[: self._rows], dtype=np.float32)
+            else:
+                vectors = np.zeros((0, 0), dtype=np.float32)
+            compressed = self.dtype != np.float32
+            rescore = compressed and self.rescore and self._rows > 0
+
+            if self.dtype == np.int8:
+                first_pass, scales = quantize_int8(vectors)
+                np.save(data / "scales.npy", scales)
+            else:
+                first_pass = vectors.astype(self.dtype)
+            np.save(data / "vectors.npy", first_pass)
+            np.save(data / "norms.npy", np.einsum("ij,ij->i", vectors, vectors))
+            if rescore:
+                np.save(data / "vectors.f32.npy", vectors)
+            (data / "rows.json").write_text(
+                json.dumps(
+                    {"ids": self._ids, "documents": self._documents, "metadatas": self._metadatas},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+
+            header = {
+                "name": self.name,
+                "metadata": self.metadata,
+                "dtype": self.dtype.name,
+                "dim": vectors.shape[1] if self._rows else None,
+                "rows": self._rows,
+                "rescore": rescore,
+                "generation": generation,
+            }
+            tmp = self.path / "collection.json.tmp"
+            tmp.write_text(json.dumps(header, indent=2), encoding="utf-8")
+            tmp.replace(self._header_file)
+
+            # Older generations (and pre-generation flat files) are unreachable now;
+            # open mmaps in other readers keep their data until they reload
+            for stale in self.path.glob("gen-*"):
+                if stale != data:
+                    shutil.rmtree(stale, ignore_errors=True)
+            for name in ("vectors.npy", "scales.npy", "vectors.f32.npy", "norms.npy", "rows.json"):
+                (self.path / name).unlink(missing_ok=True)
+
+            self._dirty = False
+            self._load()
+
+    # ---------------------------------------------------------
+    # Writes (buffered until flush)
+    # ---------------------------------------------------------
+    def _writable(self, dim: int, extra_rows: int):
+        """float32 working matrix with room for extra_rows more (capacity doubles)."""
+        needed = self._rows + extra_rows
+        current = self._matrix
+        if current is not None and current.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match collection dimensionality "
+                f"{current.shape[1]}"
+            )
+        if self._dirty and current is not None and current.shape[0] >= needed:
+            return
+        capacity = max(needed, 2 * (current.shape[0] if current is not None else 0), 64)
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        if current is not None and self._rows:
+            grown[: self._rows] = (
+                current[: self._rows] if self._dirty else self._float_rows(slice(0, self._rows))
+            )
+        self._matrix, self._scales, self._exact, self._sq_norms = grown, None, None, None
+        self._dirty = True
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise ValueError("embeddings must be a (len(ids), dim) matrix")
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [{} for _ in ids]
+
+        with self._lock:
+            self._writable(vectors.shape[1], sum(1 for i in ids if i not in self._pos))
+            for chunk_id, vector, doc, meta in zip(ids, vectors, documents, metadatas):
+                row = self._pos.get(chunk_id)
+                if row is None:
+                    row = self._rows
+                    self._pos[chunk_id] = row
+                    self._ids.append(chunk_id)
+                    self._documents.append(doc)
+                    self._metadatas.append(dict(meta or {}))
+                    self._rows += 1
+                else:
+                    self._documents[row] = doc
+                    self._metadatas[row] = dict(meta or {})
+                self._matrix[row] = vector
+
+    def update(self, ids, metadatas=None, documents=None):
+        with self._lock:
+            if not self._dirty and self._matrix is not None:
+                self._writable(self._matrix.shape[1], 0)
+            for i, chunk_id in enumerate(ids):
+                row = self._pos.get(chunk_id)
+                if row is None:
+                    continue
+                if metadatas is not None:
+                    self._metadatas[row] = dict(metadatas[i] or {})
+                if documents is not None:
+                    self._documents[row] = documents[i]
+            self._dirty = True
+
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            drop = {i for i in (ids or []) if i in self._pos}
+            if where:
+                drop |= {i for i, m in zip(self._ids, self._metadatas) if _matches(m, where)}
+            if not drop:
+                return
+            self._writable(self._matrix.shape[1], 0)
+            keep = [row for row, chunk_id in enumerate(self._ids) if chunk_id not in drop]
+            self._matrix = self._matrix[keep]
+            self._ids = [self._ids[r] for r in keep]
+            self._documents = [self._documents[r] for r in keep]
+            self._metadatas = [self._metadatas[r] for r in keep]
+            self._pos = {chunk_id: i for i, chunk_id in enumerate(self._ids)}
+            self._rows = len(keep)
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._rows
+
+    def _rows_payload(self, rows, include) -> dict:
+        embeddings = None
+        if "embeddings" in include:
+            embeddings = list(self._float_rows(list(rows))) if len(rows) else []
+        return {
+            "ids": [self._ids[r] for r in rows],
+            "documents": [self._documents[r] for r in rows] if "documents" in include else None,
+            "metadatas": [self._metadatas[r] for r in rows] if "metadatas" in include else None,
+            "embeddings": embeddings,
+        }
+
+    def get(self, ids=None, where=None, include=DEFAULT_GET_INCLUDE, limit=None):
+        with self._lock:
+            self._refresh()
+            if ids is not None:
+                rows = [self._pos[i] for i in ids if i in self._pos]
+            else:
+                rows = range(self._rows)
+            rows = [r for r in rows if _matches(self._metadatas[r], where)]
+            return self._rows_payload(rows[:limit] if limit else rows, include)
+
+    def _squared_norms(self) -> np.ndarray:
+        if self._sq_norms is None:  # working array (dirty) → computed on demand
+            block = self._matrix[: self._rows]
+            self._sq_norms = np.einsum("ij,ij->i", block, block)
+        return self._sq_norms
+
+    def distances(self, queries: np.ndarray) -> np.ndarray:
+        """
+        First-pass squared L2 distances, (n_queries, rows), block by block.
+        Exact for float32; approximate (compressed dot products) otherwise.
+        """
+        sq_norms = self._squared_norms()
+        out = np.empty((len(queries), self._rows), dtype=np.float32)
+        q_sq = np.einsum("ij,ij->i", queries, queries)[:, None]
+        for start in range(0, self._rows, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, self._rows)
+            dots = queries @ np.asarray(self._matrix[start:end], dtype=np.float32).T
+            if self._scales is not None:
+                dots *= self._scales[start:end]
+            out[:, start:end] = sq_norms[start:end] - 2.0 * dots + q_sq
+        np.maximum(out, 0.0, out=out)
+        return out
+
+    def _rescored(self, query: np.ndarray, candidates: np.ndarray):
+        """(rows, exact distances) for candidate rows, read from the float32 mmap."""
+        order = np.sort(candidates)  # sequential reads through the mmap
+        diff = np.asarray(self._exact[order], dtype=np.float32) - query
+        exact = np.einsum("ij,ij->i", diff, diff)
+        return order, exact
+
+    @staticmethod
+    def _smallest(dists: np.ndarray, k: int) -> np.ndarray:
+        if k <= 0:
+            return np.array([], dtype=np.int64)
+        top = np.argpartition(dists, k - 1)[:k] if k < len(dists) else np.arange(len(dists))
+        return top[np.argsort(dists[top], kind="stable")]
+
+    def query(
+        self, query_embeddings, n_results: int = 10, where=None, include=DEFAULT_QUERY_INCLUDE
+    ):
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        result = {key: [] for key in ("ids", "documents", "metadatas", "distances", "embeddings")}
+
+        with self._lock:
+            self._refresh()
+            if self._rows == 0:
+                for _ in queries:
+                    for key in result:
+                        result[key].append([])
+                return result
+
+            dists = self.distances(queries)
+            if where:
+                allowed = np.array([_matches(m, where) for m in self._metadatas])
+                dists[:, ~allowed] = np.inf
+
+            for q, row_dists in zip(queries, dists):
+                k = min(n_results, int(np.isfinite(row_dists).sum()))
+                if self._exact is not None and k:
+                    candidates = self._smallest(
+                        row_dists, min(k * self.rescore_factor, len(row_dists))
+                    )
+                    candidates = candidates[np.isfinite(row_dists[candidates])]
+                    rows, exact = self._rescored(q, candidates)
+                    best = self._smallest(exact, k)
+                    top, top_dists = rows[best], exact[best]
+                else:
+                    top = self._smallest(row_dists, k)
+                    top_dists = row_dists[top]
+
+                payload = self._rows_payload(top.tolist(), include)
+                for key in ("ids", "documents", "metadatas", "embeddings"):
+                    result[key].append(payload[key])
+                result["distances"].append(top_dists.tolist() if "distances" in include else None)
+            return result
+
+    # ---------------------------------------------------------
+    # Monitoring
+    # ---------------------------------------------------------
+    def storage_stats(self) -> dict:
+        """Resident first-pass size vs the float32 baseline (exact copy stays on disk)."""
+        with self._lock:
+            # Pending writes → what the next flush() will store; else what is loaded
+            if self._dirty or self._matrix is None:
+                dtype, rescore = self.dtype, self.dtype != np.float32 and self.rescore
+            else:
+                dtype, rescore = self._matrix.dtype, self._exact is not None
+            dim = self._matrix.shape[1] if self._matrix is not None else 0
+            baseline = self._rows * dim * 4
+            first_pass = self._rows * dim * dtype.itemsize
+            if dtype == np.int8:
+                first_pass += self._rows * 4  # row scales
+            return {
+                "dtype": dtype.name,
+                "rows": self._rows,
+                "dim": dim,
+                "rescore": rescore,
+                "first_pass_mb": round(first_pass / 1024**2, 2),
+                "float32_mb": round(baseline / 1024**2, 2),
+                "savings_x": round(baseline / first_pass, 2) if first_pass else 1.0,
+            }
+
+
+class NumpyClient:
+    """Chroma PersistentClient stand-in: one directory per collection."""
+
+    def __init__(
+        self, path: Path, dtype: str = "float32", rescore: bool = True, rescore_factor: int = 8
+    ):
+        self.path = Path(path) / "numpy_vectors"
+        self.dtype = dtype
+        self.rescore = rescore
+        self.rescore_factor = rescore_factor
+        self._lock = RLock()
+        self._collections: Dict[str, NumpyCollection] = {}
+
+    def _open(self, name: str) -> NumpyCollection:
+        col = self._collections.get(name)
+        if col is None:
+            col = NumpyCollection(
+                self.path / name,
+                name,
+                dtype=self.dtype,
+                rescore=self.rescore,
+                rescore_factor=self.rescore_factor,
+            )
+            self._collections[name] = col
+        return col
+
+    def get_collection(self, name: str) -> NumpyCollection:
+        with self._lock:
+            col = self._open(name)
+            with col._lock:
+                col._refresh()
+                exists = col._mtime is not None or col._dirty
+            if not exists:
+                self._collections.pop(name, None)
+                raise ValueError(f"Collection {name} does not exist.")
+            return col
+
+    def get_or_create_collection(self, name: str, metadata: Optional[dict] = None):
+        with self._lock:
+            col = self._open(name)
+            with col._lock:
+                if col._mtime is None and not col._dirty:
+                    col.metadata = metadata or {}
+                    col._dirty = True
+                    col.flush()
+            return col
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            self._collections.pop(name, None)
+            target = self.path / name
+            if not target.exists():
+                raise ValueError(f"Collection {name} does not exist.")
+            shutil.rmtree(target)
+
+    def list_collections(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        return sorted(p.name for p in self.path.iterdir() if (p / "collection.json").exists())
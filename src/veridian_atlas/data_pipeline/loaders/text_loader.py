@@ -16,6 +16,8 @@ from veridian_atlas.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+PARSER_VERSION = "v2-multideal"
+
 
 # ---------------------------------------------------------
 # Basic file utilities
@@ -134,7 +136,7 @@ def handle_text_loading(deal_name: str, doc_id: str, file_path: Path, file_hash:
                     "file_type": "txt",
                     "source_format": "txt",  # <-- NEW
                     "file_hash": file_hash,  # <-- NEW
-                    "parser_version": "v2-multideal",
+                    "parser_version": PARSER_VERSION,
                 },
             }
         )
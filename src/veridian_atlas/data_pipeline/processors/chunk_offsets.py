@@ -0,0 +1,109 @@
+"""
+chunk_offsets.py
+----------------
+Byte-offset index into a deal's chunks.jsonl (written by the chunker).
+
+ - chunk_id → (offset, length) of its line, so one chunk is a seek + read
+   instead of a scan of the file or a metadata-filtered collection query
+ - Stored next to the data → processed/chunks.offsets.json
+ - Records the size / mtime of the chunks.jsonl it describes; an index that
+   no longer matches (file rewritten without the chunker) is ignored
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def chunk_offsets_path(chunks_path: Path) -> Path:
+    return Path(chunks_path).with_name("chunks.offsets.json")
+
+
+def _file_version(path: Path) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+# -----------------------------------------------------
+# INDEX
+# -----------------------------------------------------
+class ChunkOffsetIndex:
+    def __init__(self):
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.version: Optional[Tuple[int, int]] = None  # (size, mtime_ns) of chunks.jsonl
+
+    def add(self, chunk_id: str, offset: int, length: int):
+        self.offsets[chunk_id] = (offset, length)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self.offsets
+
+    def matches(self, chunks_path: Path) -> bool:
+        try:
+            return self.version == _file_version(chunks_path)
+        except FileNotFoundError:
+            return False
+
+    @classmethod
+    def scan(cls, chunks_path: Path) -> "ChunkOffsetIndex":
+        """Rebuilds the index by reading chunks.jsonl once (files chunked before this existed)."""
+        index = cls()
+        index.version = _file_version(chunks_path)
+        offset = 0
+        with open(chunks_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    index.add(json.loads(line)["chunk_id"], offset, len(line))
+                offset += len(line)
+        return index
+
+    def read(self, chunks_path: Path, chunk_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        chunk_id → chunks.jsonl row, for the ids present in the index
+        (one open, one seek each).
+        """
+        found = [(c, self.offsets[c]) for c in dict.fromkeys(chunk_ids) if c in self.offsets]
+        rows = {}
+        if not found:
+            return rows
+        with open(chunks_path, "rb") as f:
+            for chunk_id, (offset, length) in found:
+                f.seek(offset)
+                rows[chunk_id] = json.loads(f.read(length))
+        return rows
+
+    # -------------------------------------------------
+    # Persistence
+    # -------------------------------------------------
+    def save(self, path: Path) -> Path:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": list(self.version or ()), "offsets": self.offsets}),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ChunkOffsetIndex"]:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        index = cls()
+        index.version = tuple(data.get("version", ())) or None
+        index.offsets = {k: tuple(v) for k, v in data.get("offsets", {}).items()}
+        return index
+
+
+def write_offsets(chunks_path: Path, entries: List[Tuple[str, int, int]]) -> Path:
+    """Saves the index for a chunks.jsonl that was just written (entries in file order)."""
+    index = ChunkOffsetIndex()
+    for chunk_id, offset, length in entries:
+        index.add(chunk_id, offset, length)
+    index.version = _file_version(chunks_path)
+    return index.save(chunk_offsets_path(chunks_path))
@@ -1,18 +1,24 @@
 """
 chunker.py
 ----------
-Transforms processed sections.json files into retrieval-ready chunks.
+Transforms processed sections.json / sections.jsonl files into retrieval-ready chunks.
 
 Finalized Standards:
 - Chunk IDs match embedding collection naming
 - No double-colons
 - Safe normalized document IDs
 - Normalized parent_section
+- Streaming: sections are read and chunks written one at a time,
+  so memory stays flat regardless of deal size
+- Byte offsets of every chunk are saved alongside (chunks.offsets.json)
+  for O(1) chunk lookups by id
 """
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, Tuple, Union
+from veridian_atlas.data_pipeline.processors.chunk_offsets import write_offsets
+from veridian_atlas.data_pipeline.sections_io import find_sections_file, iter_sections
 from veridian_atlas.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -60,90 +66,90 @@ def build_clause_chunk_id(deal: str, doc: str, normalized_section: str, clause_i
 # -------------------------------------------------------
 
 
-def build_chunks_from_json(parsed_json: Dict, deal_name: str, deal_root: Path) -> List[dict]:
-    chunks = []
+def build_chunks_from_json(
+    parsed_json: Union[Dict, Iterable[Tuple[str, dict]]], deal_name: str, deal_root: Path
+) -> Iterator[dict]:
+    """
+    Generator: yields chunks one section at a time.
+    Accepts the sections.json mapping {document_id: [sections]} or an
+    iterable of (document_id, section) pairs (see sections_io.iter_sections).
+    """
+    if isinstance(parsed_json, dict):
+        parsed_json = (
+            (document_id, sec) for document_id, sections in parsed_json.items() for sec in sections
+        )
 
-    for document_id, sections in parsed_json.items():
+    for document_id, sec in parsed_json:
         doc_display = display_name(document_id)
         raw_source_path = str((deal_root / "raw" / f"{document_id}.txt")).replace("\\", "/")
 
-        for sec in sections:
-            section_id = sec.get("section_id", "")
-            normalized_section = normalize_section(section_id)
-            section_title = sec.get("section_title", "").strip()
-            section_text = sec.get("section_text", "").strip()
-            clauses = sec.get("clauses", [])
-            src_meta = sec.get("source_meta", {})
-
-            file_hash = src_meta.get("file_hash")
-            source_format = src_meta.get("source_format", "txt")
-
-            # ------------------------------------------
-            # SECTION-LEVEL CHUNK
-            # ------------------------------------------
-            if not clauses:
-                chunk_id = build_section_chunk_id(deal_name, document_id, normalized_section)
-                chunks.append(
-                    {
-                        "chunk_id": chunk_id,
-                        "level": "section",
-                        "deal_name": deal_name,
-                        "document_id": document_id,
-                        "document_display_name": doc_display,
-                        "section_id": section_id,
-                        "normalized_section": normalized_section,
-                        "section_title": section_title,
-                        "content": section_text,
-                        "metadata": {
-                            "origin": "section_no_clauses",
-                            "parent_section": normalized_section,
-                            "file_hash": file_hash,
-                            "source_format": source_format,
-                            "source_path": raw_source_path,
-                            "length_chars": len(section_text),
-                        },
-                    }
-                )
-                continue
-
-            # ------------------------------------------
-            # CLAUSE-LEVEL CHUNKS
-            # ------------------------------------------
-            for clause in clauses:
-                clause_id = clause.get("clause_id", "")
-                clause_title = clause.get("clause_title", "").strip()
-                clause_text = clause.get("clause_text", "").strip()
-
-                chunk_id = build_clause_chunk_id(
-                    deal_name, document_id, normalized_section, clause_id
-                )
-
-                chunks.append(
-                    {
-                        "chunk_id": chunk_id,
-                        "level": "clause",
-                        "deal_name": deal_name,
-                        "document_id": document_id,
-                        "document_display_name": doc_display,
-                        "section_id": section_id,
-                        "normalized_section": normalized_section,
-                        "clause_id": clause_id,
-                        "section_title": section_title,
-                        "clause_title": clause_title,
-                        "content": clause_text,
-                        "metadata": {
-                            "origin": "clause",
-                            "parent_section": normalized_section,
-                            "file_hash": file_hash,
-                            "source_format": source_format,
-                            "source_path": raw_source_path,
-                            "length_chars": len(clause_text),
-                        },
-                    }
-                )
-
-    logger.info(f"[CHUNKER] ✔ Generated {len(chunks)} chunks for deal '{deal_name}'")
-    return chunks
+        section_id = sec.get("section_id", "")
+        normalized_section = normalize_section(section_id)
+        section_title = sec.get("section_title", "").strip()
+        section_text = sec.get("section_text", "").strip()
+        clauses = sec.get("clauses", [])
+        src_meta = sec.get("source_meta", {})
+
+        file_hash = src_meta.get("file_hash")
+        source_format = src_meta.get("source_format", "txt")
+
+        # ------------------------------------------
+        # SECTION-LEVEL CHUNK
+        # ------------------------------------------
+        if not clauses:
+            chunk_id = build_section_chunk_id(deal_name, document_id, normalized_section)
+            yield {
+                "chunk_id": chunk_id,
+                "level": "section",
+                "deal_name": deal_name,
+                "document_id": document_id,
+                "document_display_name": doc_display,
+                "section_id": section_id,
+                "normalized_section": normalized_section,
+                "section_title": section_title,
+                "content": section_text,
+                "metadata": {
+                    "origin": "section_no_clauses",
+                    "parent_section": normalized_section,
+                    "file_hash": file_hash,
+                    "source_format": source_format,
+                    "source_path": raw_source_path,
+                    "length_chars": len(section_text),
+                },
+            }
+            continue
+
+        # ------------------------------------------
+        # CLAUSE-LEVEL CHUNKS
+        # ------------------------------------------
+        for clause in clauses:
+            clause_id = clause.get("clause_id", "")
+            clause_title = clause.get("clause_title", "").strip()
+            clause_text = clause.get("clause_text", "").strip()
+
+            chunk_id = build_clause_chunk_id(deal_name, document_id, normalized_section, clause_id)
+
+            yield {
+                "chunk_id": chunk_id,
+                "level": "clause",
+                "deal_name": deal_name,
+                "document_id": document_id,
+                "document_display_name": doc_display,
+                "section_id": section_id,
+                "normalized_section": normalized_section,
+                "clause_id": clause_id,
+                "section_title": section_title,
+                "clause_title": clause_title,
+                "content": clause_text,
+                "metadata": {
+                    "origin": "clause",
+                    "parent_section": normalized_section,
+                    "file_hash": file_hash,
+                    "source_format": source_format,
+                    "source_path": raw_source_path,
+                    "length_chars": len(clause_text),
+                },
+            }
 
 
 # -------------------------------------------------------
@@ -152,16 +158,34 @@ def build_chunks_from_json(parsed_json: Dict, deal_name: str, deal_root: Path) -
 
 
 def chunk_from_file(section_json_path: Path):
+    """
+    Returns (deal_name, chunk generator) for a sections.json or sections.jsonl file.
+    The file is only read as the generator is consumed.
+    """
     if not section_json_path.exists():
-        raise FileNotFoundError(f"[CHUNKER] sections.json not found: {section_json_path}")
+        raise FileNotFoundError(f"[CHUNKER] sections file not found: {section_json_path}")
 
     deal_name = section_json_path.parent.parent.name
     deal_root = section_json_path.parent.parent
 
-    raw = json.loads(section_json_path.read_text(encoding="utf-8"))
-    logger.info(f"[LOAD] Deal={deal_name} | Documents={len(raw)}")
+    logger.info(f"[LOAD] Deal={deal_name} | Sections={section_json_path.name}")
 
-    return deal_name, build_chunks_from_json(raw, deal_name, deal_root)
+    return deal_name, build_chunks_from_json(iter_sections(section_json_path), deal_name, deal_root)
+
+
+def chunk_deal(processed_dir: Path) -> Tuple[str, int]:
+    """
+    Streams the deal's newest sections file into processed/chunks.jsonl.
+    Returns (deal_name, chunk_count).
+    """
+    sections_file = find_sections_file(processed_dir)
+    if sections_file is None:
+        raise FileNotFoundError(f"[CHUNKER] No sections.json/.jsonl in: {processed_dir}")
+
+    deal_name, chunks = chunk_from_file(sections_file)
+    count = save_chunks_as_jsonl(chunks, processed_dir / "chunks.jsonl")
+    logger.info(f"[CHUNKER] ✔ Generated {count} chunks for deal '{deal_name}'")
+    return deal_name, count
 
 
 # -------------------------------------------------------
@@ -169,12 +193,26 @@ def chunk_from_file(section_json_path: Path):
 # -------------------------------------------------------
 
 
-def save_chunks_as_jsonl(chunks: List[dict], output_path: Path):
+def save_chunks_as_jsonl(chunks: Iterable[dict], output_path: Path) -> int:
+    """
+    Writes chunks as they are produced (works with generators).
+    Written to a temp file first so readers never see a half-written file.
+    The byte offset of each line is recorded for chunk_offsets.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
+    tmp_path = output_path.with_suffix(".jsonl.tmp")
+    count, offset, offsets = 0, 0, []
+    with open(tmp_path, "wb") as f:
         for c in chunks:
-            f.write(json.dumps(c, ensure_ascii=False) + "\n")
-    logger.info(f"[WRITE] ✔ {len(chunks)} chunks → {output_path}")
+            line = (json.dumps(c, ensure_ascii=False) + "\n").encode("utf-8")
+            f.write(line)
+            offsets.append((c["chunk_id"], offset, len(line)))
+            offset += len(line)
+            count += 1
+    tmp_path.replace(output_path)
+    write_offsets(output_path, offsets)
+    logger.info(f"[WRITE] ✔ {count} chunks → {output_path}")
+    return count
 
 
 # -------------------------------------------------------
@@ -185,11 +223,10 @@ def save_chunks_as_jsonl(chunks: List[dict], output_path: Path):
 def chunk_all_deals() -> dict:
     results = {}
     for deal_dir in BASE_DEALS_PATH.iterdir():
-        section_json = deal_dir / "processed" / "sections.json"
-        if section_json.exists():
-            deal, chunks = chunk_from_file(section_json)
-            save_chunks_as_jsonl(chunks, deal_dir / "processed" / "chunks.jsonl")
-            results[deal] = len(chunks)
+        processed_dir = deal_dir / "processed"
+        if find_sections_file(processed_dir) is not None:
+            deal, count = chunk_deal(processed_dir)
+            results[deal] = count
     logger.info(f"[GLOBAL] Chunking complete across {len(results)} deals.")
     return results
 
@@ -2,11 +2,26 @@
 embedder.py
 -----------
 Local Hugging Face embedding service with GPU/MPS/CPU auto-detection.
+
+torch / sentence-transformers are imported and the model weights loaded
+on first embed() call, so importing this module stays cheap.
+
+Vectors are looked up in the content-addressed EmbeddingStore first;
+only unseen texts reach the model (and identical texts encode once).
+
+Backends (VA_EMBEDDING_BACKEND):
+  torch      → sentence-transformers on CUDA/MPS/CPU (default)
+  onnx       → ONNX Runtime, float32 graph exported from the same model
+  onnx-int8  → ONNX Runtime, dynamically int8-quantized graph
 """
 
-from typing import List
-import torch
-from sentence_transformers import SentenceTransformer
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional
+
+import numpy as np
+
+from veridian_atlas.core import config
 
 EMBEDDING_MODELS = {
     # "fast": "sentence-transformers/all-MiniLM-L6-v2",
@@ -16,8 +31,18 @@ EMBEDDING_MODELS = {
 
 DEFAULT_MODEL = "sentence-transformers/all-mpnet-base-v2"  # 768d
 
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _stack(vectors: List[np.ndarray]) -> np.ndarray:
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(np.stack(vectors), dtype=np.float32)
+
 
 def _select_device():
+    import torch
+
     if torch.cuda.is_available():
         return "cuda"
     if torch.backends.mps.is_available():
@@ -26,27 +51,146 @@ def _select_device():
 
 
 class EmbeddingService:
-    def __init__(self, model_name: str = DEFAULT_MODEL, normalize=False, batch_size=32):
-        self.device = _select_device()
-        self.model = SentenceTransformer(model_name, device=self.device)
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        normalize=False,
+        batch_size=32,
+        store_dir: Optional[str] = None,
+        backend: str = "torch",
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend} (expected one of {BACKENDS})")
+        self.model_name = model_name
         self.normalize = normalize
         self.batch_size = batch_size
+        self.store_dir = store_dir
+        self.backend = backend
+        self.device = None
+        self._model = None
+        self._encoder = None
+        self._store = None
+        self._load_lock = Lock()
 
-        print(f"[EMBEDDER] Model: {model_name}")
-        print(f"[EMBEDDER] Device: {self.device}\n")
+    @property
+    def model_id(self) -> str:
+        """
+        Identity of the vectors this service produces. The float32 ONNX graph
+        reproduces the torch vectors; int8 ones differ slightly, so they get
+        their own store, query-cache and index identity.
+        """
+        if self.backend == "onnx-int8":
+            return f"{self.model_name}+int8"
+        return self.model_name
 
-    def embed(self, texts: List[str], batch_size: int = None) -> List[List[float]]:
-        batch_size = batch_size or self.batch_size
-        vectors = self.model.encode(
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None or (self._encoder is not None and self._encoder.is_loaded)
+
+    @property
+    def model(self):
+        """
+        Lazy singleton load – the first caller pays for the import + weights.
+        """
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    self.device = _select_device()
+                    self._model = SentenceTransformer(self.model_name, device=self.device)
+
+                    print(f"[EMBEDDER] Model: {self.model_name}")
+                    print(f"[EMBEDDER] Device: {self.device}\n")
+        return self._model
+
+    @property
+    def encoder(self):
+        """Lazy ONNX Runtime encoder (exported on first use)."""
+        if self._encoder is None:
+            from veridian_atlas.data_pipeline.processors.onnx_embedder import OnnxEncoder
+
+            with self._load_lock:
+                if self._encoder is None:
+                    self._encoder = OnnxEncoder(
+                        self.model_name,
+                        Path(config.EMBEDDING_ONNX_DIR),
+                        quantize=self.backend == "onnx-int8",
+                        threads=config.EMBEDDING_ONNX_THREADS,
+                    )
+                    self.device = "cpu"
+        return self._encoder
+
+    @property
+    def store(self):
+        """Lazy EmbeddingStore for this model (None when disabled)."""
+        if self._store is None and self.store_dir:
+            from veridian_atlas.data_pipeline.processors.embedding_store import (
+                EmbeddingStore,
+                store_dir_for,
+            )
+
+            with self._load_lock:
+                if self._store is None:
+                    self._store = EmbeddingStore(
+                        store_dir_for(Path(self.store_dir), self.model_id),
+                        model_name=self.model_id,
+                        dtype=config.EMBEDDING_STORE_DTYPE,
+                    )
+        return self._store
+
+    def dimension(self) -> int:
+        """Vector size, from the store header when known (no model load)."""
+        if self.store is not None and self.store.dim:
+            return self.store.dim
+        return len(self.embed_single("DIM_CHECK"))
+
+    def _encode(self, texts: List[str], batch_size: int):
+        if self.backend != "torch":
+            return self.encoder.encode(texts, batch_size, normalize=self.normalize)
+        return self.model.encode(
             texts,
             batch_size=batch_size,
             convert_to_numpy=True,
             normalize_embeddings=self.normalize,
         )
-        return vectors.tolist()
+
+    def embed(self, texts: List[str], batch_size: int = None, persist: bool = True) -> np.ndarray:
+        """
+        (len(texts), dim) float32 matrix – kept as NumPy through to the vector store.
+        Store hits skip the model; misses are encoded once per unique text
+        and (persist=True) appended to the store.
+        """
+        batch_size = batch_size or self.batch_size
+        unique = list(dict.fromkeys(texts))
+        store = self.store
+
+        if store is None:
+            vectors = self._encode(unique, batch_size)
+            by_text = dict(zip(unique, vectors))
+            return _stack([by_text[t] for t in texts])
+
+        from veridian_atlas.data_pipeline.processors.embedding_store import embedding_key
+
+        keys = {t: embedding_key(self.model_id, self.normalize, t) for t in unique}
+        found = store.lookup(keys.values())
+        by_text = {t: found[k] for t, k in keys.items() if k in found}
+
+        missing = [t for t in unique if t not in by_text]
+        if missing:
+            vectors = self._encode(missing, batch_size)
+            by_text.update(zip(missing, vectors))
+            if persist:
+                store.add([keys[t] for t in missing], vectors)
+
+        return _stack([by_text[t] for t in texts])
 
     def embed_single(self, text: str) -> List[float]:
-        return self.embed([text])[0]
+        # Queries read the store but are not persisted into it
+        return self.embed([text], persist=False)[0].tolist()
 
 
-hf_embedder = EmbeddingService()
+hf_embedder = EmbeddingService(
+    store_dir=config.EMBEDDING_STORE_DIR if config.EMBEDDING_STORE_ENABLED else None,
+    backend=config.EMBEDDING_BACKEND,
+)
@@ -0,0 +1,287 @@
+"""
+embedding_store.py
+------------------
+Persistent, content-addressed embedding store.
+
+Layout (one directory per embedding model):
+    store.json   → {"dim", "dtype", "model_name", "generation"}
+    keys.bin     → 16-byte blake2b digests, row i ↔ key i
+    vectors.bin  → append-only float32/float16 matrix, memory-mapped for reads
+
+Key = blake2b(model_name, normalize flag, text), so identical boilerplate
+clauses embed once across every deal and every rebuild.
+Single writer per directory (the index build); readers pick up appended
+rows on their next lookup. compact() bumps "generation" (odd while files
+are being swapped), and readers in other processes then reload from scratch.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from veridian_atlas.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KEY_BYTES = 16
+
+
+def store_dir_for(root: Path, model_name: str) -> Path:
+    return Path(root) / re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+
+
+def embedding_key(model_name: str, normalize: bool, text: str) -> bytes:
+    h = hashlib.blake2b(digest_size=KEY_BYTES)
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\x01" if normalize else b"\x00")
+    h.update(text.encode("utf-8"))
+    return h.digest()
+
+
+class EmbeddingStore:
+    def __init__(self, path: Path, model_name: str = "", dtype: str = "float32"):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self.generation = 0
+
+        self._lock = RLock()
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0
+        self._keys_bytes_read = 0
+        self._matrix = None
+        self.hits = 0
+        self.misses = 0
+
+        self._load_header()
+        self._refresh()
+
+    # ---------------------------------------------------------
+    # Files
+    # ---------------------------------------------------------
+    @property
+    def _keys_file(self) -> Path:
+        return self.path / "keys.bin"
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.bin"
+
+    @property
+    def _header_file(self) -> Path:
+        return self.path / "store.json"
+
+    def _read_header(self) -> Optional[dict]:
+        try:
+            return json.loads(self._header_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _load_header(self):
+        header = self._read_header()
+        if header is None:
+            return
+        self.dim = header["dim"]
+        self.dtype = np.dtype(header["dtype"])
+        self.generation = header.get("generation", 0)
+
+    def _write_header(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        header = {
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "model_name": self.model_name,
+            "generation": self.generation,
+        }
+        # Atomic: readers check the generation on every refresh
+        tmp = self._header_file.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(header, indent=2), encoding="utf-8")
+        tmp.replace(self._header_file)
+
+    def _reset(self):
+        self._index = {}
+        self._rows = 0
+        self._keys_bytes_read = 0
+        self._matrix = None
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _refresh(self) -> bool:
+        """
+        Reads keys appended since the last refresh (by this or another process).
+        Rows count only when both key and vector bytes are fully on disk.
+        A new generation (compaction elsewhere) or a shrunken keys file means
+        the rows moved: state is rebuilt from scratch. Returns False while a
+        compaction is swapping files (nothing on disk can be trusted yet).
+        """
+        if self.dim is None:
+            self._load_header()
+            if self.dim is None:
+                return True
+
+        header = self._read_header()
+        generation = header.get("generation", 0) if header else self.generation
+        if generation % 2:
+            return False
+        if generation != self.generation:
+            self._reset()
+            self.generation = generation
+
+        if not self._keys_file.exists():
+            return True
+
+        keys_size = self._keys_file.stat().st_size
+        if keys_size < self._keys_bytes_read:
+            self._reset()
+        if keys_size == self._keys_bytes_read:
+            return True
+
+        vectors_rows = self._vectors_file.stat().st_size // self._row_bytes()
+        complete_rows = min(keys_size // KEY_BYTES, vectors_rows)
+        if complete_rows <= self._rows:
+            return True
+
+        with self._keys_file.open("rb") as f:
+            f.seek(self._rows * KEY_BYTES)
+            blob = f.read((complete_rows - self._rows) * KEY_BYTES)
+
+        for i in range(0, len(blob), KEY_BYTES):
+            # First occurrence wins; duplicates are removed by compact()
+            self._index.setdefault(blob[i : i + KEY_BYTES], self._rows + i // KEY_BYTES)
+
+        self._rows = complete_rows
+        self._keys_bytes_read = complete_rows * KEY_BYTES
+        self._matrix = None
+
+        # A compaction that started while the keys were read invalidates them
+        header = self._read_header()
+        if header and header.get("generation", 0) != generation:
+            self._reset()
+            return False
+        return True
+
+    def _vectors(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.memmap(
+                self._vectors_file, dtype=self.dtype, mode="r", shape=(self._rows, self.dim)
+            )
+        return self._matrix
+
+    # ---------------------------------------------------------
+    # Lookup / append
+    # ---------------------------------------------------------
+    def lookup(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        keys = list(keys)
+        with self._lock:
+            found = {}
+            if self._refresh() and self._rows:
+                matrix = self._vectors()
+                for key in keys:
+                    row = self._index.get(key)
+                    if row is not None:
+                        found[key] = np.asarray(matrix[row], dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            return found
+
+    def add(self, keys: List[bytes], vectors: np.ndarray) -> int:
+        """Appends vectors for keys not already stored. Returns rows written."""
+        vectors = np.asarray(vectors)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._write_header()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"[STORE] Dimension mismatch: {vectors.shape[1]} != {self.dim}")
+
+            self._refresh()
+            fresh, rows = [], []
+            for i, key in enumerate(keys):
+                if key not in self._index:
+                    self._index[key] = self._rows + len(fresh)
+                    fresh.append(key)
+                    rows.append(i)
+
+            if not fresh:
+                return 0
+
+            # Vectors first: a key is only trusted once its row is on disk
+            with self._vectors_file.open("ab") as f:
+                f.write(np.ascontiguousarray(vectors[rows], dtype=self.dtype).tobytes())
+            with self._keys_file.open("ab") as f:
+                f.write(b"".join(fresh))
+
+            self._rows += len(fresh)
+            self._keys_bytes_read = self._rows * KEY_BYTES
+            self._matrix = None
+            return len(fresh)
+
+    # ---------------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            disk = sum(
+                p.stat().st_size for p in (self._keys_file, self._vectors_file) if p.exists()
+            )
+            return {
+                "path": str(self.path),
+                "model_name": self.model_name,
+                "dim": self.dim,
+                "dtype": self.dtype.name,
+                "rows": self._rows,
+                "unique_keys": len(self._index),
+                "disk_bytes": disk,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def compact(self, keep: Optional[Set[bytes]] = None) -> dict:
+        """
+        Rewrites the store without duplicate rows and, if keep is given,
+        without keys outside it. Files are swapped in atomically.
+        """
+        with self._lock:
+            self._refresh()
+            before = self._rows
+            if not before:
+                return {"rows_before": 0, "rows_after": 0}
+
+            matrix = self._vectors()
+            survivors = sorted(
+                (row, key) for key, row in self._index.items() if keep is None or key in keep
+            )
+
+            # Odd generation while the files are swapped; readers wait it out
+            self.generation += 1
+            self._write_header()
+
+            tmp_keys = self._keys_file.with_suffix(".bin.tmp")
+            tmp_vectors = self._vectors_file.with_suffix(".bin.tmp")
+            with tmp_vectors.open("wb") as vf, tmp_keys.open("wb") as kf:
+                for start in range(0, len(survivors), 4096):
+                    block = survivors[start : start + 4096]
+                    vf.write(np.ascontiguousarray(matrix[[r for r, _ in block]]).tobytes())
+                    kf.write(b"".join(k for _, k in block))
+
+            self._matrix = None
+            del matrix
+            tmp_vectors.replace(self._vectors_file)
+            tmp_keys.replace(self._keys_file)
+
+            self._index = {key: i for i, (_, key) in enumerate(survivors)}
+            self._rows = len(survivors)
+            self._keys_bytes_read = self._rows * KEY_BYTES
+            self.generation += 1
+            self._write_header()
+
+            logger.info(f"[STORE] Compacted {self.path.name}: {before} → {self._rows} rows")
+            return {"rows_before": before, "rows_after": self._rows}
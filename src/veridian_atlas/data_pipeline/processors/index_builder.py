@@ -6,29 +6,76 @@ Final version:
  - No server-side embedding functions
  - All embeddings done manually with hf_embedder
  - Dimension mismatches prevented
+ - Build metadata (index_version from source file hashes) written per deal
+ - Incremental: only new/changed chunks are embedded, removed ones deleted
+ - Pipelined: chunks.jsonl reading, embedding and upserts overlap
+   (see index_pipeline.py); memory bounded by the queue depth
+ - Section / clause reference index written per deal (see reference_index.py)
+ - Vector backend (Chroma or memory-mapped NumPy) chosen by VA_VECTOR_BACKEND
 """
 
 from pathlib import Path
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+import hashlib
 import json
-import chromadb
-from chromadb.config import Settings
+from veridian_atlas.core import config
+from veridian_atlas.core.chroma_registry import chroma_registry, collection_name_for
 from veridian_atlas.data_pipeline.processors.embedder import hf_embedder
+from veridian_atlas.data_pipeline.processors.index_pipeline import run_pipeline, run_serial
+from veridian_atlas.data_pipeline.processors.reference_index import (
+    ReferenceIndex,
+    reference_index_path,
+)
 
 
 def get_chroma_client(db_path: Path):
-    db_path.mkdir(parents=True, exist_ok=True)
-    return chromadb.PersistentClient(
-        path=str(db_path), settings=Settings(anonymized_telemetry=False)
-    )
+    return chroma_registry.get_client(db_path, create=True)
+
+
+# -----------------------------------------------------
+# BUILD METADATA (index version per deal)
+# -----------------------------------------------------
+
+
+def build_meta_path(db_path: Path, deal_name: str) -> Path:
+    return Path(db_path) / "build_meta" / f"{collection_name_for(deal_name)}.json"
+
+
+def compute_index_version(file_hashes: Iterable[str], model_name: str) -> str:
+    """
+    Stable identity of an index: same source files + same embedding model → same version.
+    """
+    sha = hashlib.sha256(model_name.encode("utf-8"))
+    for file_hash in sorted({h for h in file_hashes if h}):
+        sha.update(file_hash.encode("utf-8"))
+    return sha.hexdigest()[:16]
+
+
+def write_build_meta(db_path: Path, deal_name: str, meta: dict) -> Path:
+    path = build_meta_path(db_path, deal_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def read_build_meta(db_path: Path, deal_name: str) -> Optional[dict]:
+    path = build_meta_path(db_path, deal_name)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
 def get_or_create_deal_collection(client, deal_name: str):
-    collection_name = f"VA_{deal_name}".replace(" ", "_")
-    current_dim = len(hf_embedder.embed_single("DIM_CHECK"))
+    collection_name = collection_name_for(deal_name)
+    current_dim = hf_embedder.dimension()
 
     try:
         col = client.get_collection(collection_name)
-        stored_dim = col.get()["metadata"].get("model_dim")
+        stored_dim = (col.metadata or {}).get("model_dim")
 
         if stored_dim and stored_dim != current_dim:
             print(f"[DIMENSION MISMATCH] {collection_name}: {stored_dim} != {current_dim}")
@@ -46,18 +93,130 @@ def get_or_create_deal_collection(client, deal_name: str):
         )
 
 
+# -----------------------------------------------------
+# CHUNK RECORDS (id, document, metadata)
+# -----------------------------------------------------
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def chunk_record(data: dict) -> Optional[tuple]:
+    """
+    Converts one chunks.jsonl row into (id, document, metadata).
+    Chroma rejects None metadata values, so those keys are dropped.
+    """
+    content = data.get("content", "").strip()
+    if not content:
+        return None
+
+    meta = {
+        "chunk_id": data["chunk_id"],
+        "deal_name": data.get("deal_name"),
+        "document_id": data.get("document_id"),
+        "document_display_name": data.get("document_display_name"),
+        "section_id": data.get("section_id"),
+        "normalized_section": data.get("normalized_section"),
+        "clause_id": data.get("clause_id"),
+        "source_path": data["metadata"].get("source_path"),
+        "content_hash": content_hash(content),
+    }
+    return data["chunk_id"], content, {k: v for k, v in meta.items() if v is not None}
+
+
+def existing_chunk_state(collection) -> dict:
+    """chunk_id → stored metadata for everything already in the collection."""
+    stored = collection.get(include=["metadatas"])
+    return dict(zip(stored["ids"], stored["metadatas"]))
+
+
+# -----------------------------------------------------
+# DIFF (streamed batches to embed)
+# -----------------------------------------------------
+
+
+def iter_diff_batches(
+    chunks_path: Path, existing: dict, reembed_all: bool, batch_size: int, state: dict
+):
+    """
+    Streams chunks.jsonl and yields (ids, docs, metas) batches that need embedding.
+    Everything else is accumulated in state as the file is read:
+      seen, file_hashes, references, meta_ids, meta_updates and report counters.
+    """
+    ids, docs, metas = [], [], []
+    report = state["report"]
+
+    with chunks_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            data = json.loads(line)
+            state["file_hashes"].add(data.get("metadata", {}).get("file_hash"))
+            record = chunk_record(data)
+            if record is None:
+                continue
+
+            chunk_id, content, meta = record
+            state["seen"].add(chunk_id)
+            state["references"].add(chunk_id, meta)
+            stored = existing.get(chunk_id)
+
+            if stored is None or reembed_all:
+                report["added" if stored is None else "updated"] += 1
+            elif stored.get("content_hash") != meta["content_hash"]:
+                report["updated"] += 1
+            elif stored != meta:
+                report["updated"] += 1
+                state["meta_ids"].append(chunk_id)
+                state["meta_updates"].append(meta)
+                continue
+            else:
+                report["unchanged"] += 1
+                continue
+
+            ids.append(chunk_id)
+            docs.append(content)
+            metas.append(meta)
+
+            if len(ids) >= batch_size:
+                yield ids, docs, metas
+                ids, docs, metas = [], [], []
+
+    if ids:
+        yield ids, docs, metas
+
+
+# -----------------------------------------------------
+# BUILD (incremental by default)
+# -----------------------------------------------------
+
+
 def build_chroma_index(
     deal_name: str,
     chunks_path: Path,
     db_path: Path,
     reset_existing: bool = False,
     batch_size: int = 64,
-):
+    pipelined: Optional[bool] = None,
+    queue_depth: Optional[int] = None,
+) -> dict:
+    """
+    Diffs chunks.jsonl against the deal's collection by chunk_id + content_hash:
+      - new / changed content   → embed + upsert
+      - metadata-only changes   → update (no embedding)
+      - ids no longer present   → delete
+    reset_existing=True drops the collection first (full rebuild).
+    pipelined (default VA_INDEX_PIPELINE) overlaps read / embed / upsert.
+    Returns {"added", "updated", "deleted", "unchanged", "stages"}
+    (+ "storage" for the numpy backend: first-pass size vs float32).
+    """
     if not chunks_path.exists():
         raise FileNotFoundError(f"[ERROR] chunks.jsonl missing → {chunks_path}")
 
+    pipelined = config.INDEX_PIPELINE if pipelined is None else pipelined
+    queue_depth = queue_depth or config.INDEX_QUEUE_DEPTH
+
     client = get_chroma_client(db_path)
-    collection_name = f"VA_{deal_name}".replace(" ", "_")
+    collection_name = collection_name_for(deal_name)
 
     if reset_existing:
         try:
@@ -68,43 +227,95 @@ def build_chroma_index(
 
     collection = get_or_create_deal_collection(client, deal_name)
 
-    ids, docs, metas = [], [], []
+    # Query-side handles are stale once the collection is reset or recreated
+    chroma_registry.invalidate(deal_name, db_path)
 
-    with chunks_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            data = json.loads(line)
-            content = data.get("content", "").strip()
-            if not content:
-                continue
+    # Vectors from another embedding model cannot be reused
+    previous_meta = read_build_meta(db_path, deal_name) or {}
+    existing = existing_chunk_state(collection)
+    reembed_all = bool(existing) and previous_meta.get("model_name") != hf_embedder.model_id
+    if reembed_all:
+        print("[MODEL CHANGED] Re-embedding every chunk")
 
-            ids.append(data["chunk_id"])
-            docs.append(content)
-            metas.append(
-                {
-                    "chunk_id": data["chunk_id"],
-                    "deal_name": data.get("deal_name"),
-                    "document_id": data.get("document_id"),
-                    "document_display_name": data.get("document_display_name"),
-                    "section_id": data.get("section_id"),
-                    "normalized_section": data.get("normalized_section"),
-                    "clause_id": data.get("clause_id"),
-                    "source_path": data["metadata"].get("source_path"),
-                }
-            )
-
-    print(f"[STATS] {len(ids)} chunks detected. Embedding now...")
-
-    for i in range(0, len(ids), batch_size):
-        batch_ids = ids[i : i + batch_size]
-        batch_docs = docs[i : i + batch_size]
-        batch_meta = metas[i : i + batch_size]
-
-        vectors = hf_embedder.embed(batch_docs)
+    report = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    state = {
+        "seen": set(),
+        "file_hashes": set(),
+        "references": ReferenceIndex(),
+        "meta_ids": [],
+        "meta_updates": [],
+        "report": report,
+    }
+    written = [0]
 
+    def write(batch_ids, batch_docs, batch_meta, vectors):
         collection.upsert(
             ids=batch_ids, documents=batch_docs, metadatas=batch_meta, embeddings=vectors
         )
-        print(f"[BATCH] {i} → {i+len(batch_ids)-1}")
+        print(f"[BATCH] {written[0]} → {written[0] + len(batch_ids) - 1}")
+        written[0] += len(batch_ids)
+
+    batches = iter_diff_batches(chunks_path, existing, reembed_all, batch_size, state)
+    if pipelined:
+        stages = run_pipeline(batches, hf_embedder.embed, write, queue_depth=queue_depth)
+    else:
+        stages = run_serial(batches, hf_embedder.embed, write)
+
+    meta_ids, meta_updates = state["meta_ids"], state["meta_updates"]
+    if meta_ids:
+        collection.update(ids=meta_ids, metadatas=meta_updates)
 
-    print(f"[OK] Completed → {collection_name}")
-    return collection
+    stale = [chunk_id for chunk_id in existing if chunk_id not in state["seen"]]
+    if stale:
+        collection.delete(ids=stale)
+        report["deleted"] = len(stale)
+
+    # Write-back backends (numpy) persist the whole build at once
+    flush = getattr(collection, "flush", None)
+    if flush is not None:
+        flush()
+
+    print(
+        f"[DIFF] {written[0]} embedded | {len(meta_ids)} metadata-only | "
+        f"{len(stale)} deleted | {report['unchanged']} unchanged"
+    )
+    print(
+        "[THROUGHPUT] "
+        + " | ".join(
+            f"{name}={stages[name]['chunks_per_s']} chunks/s"
+            for name in ("reader", "embedder", "writer")
+        )
+        + f" | wall={stages['wall_seconds']}s"
+    )
+
+    state["references"].save(reference_index_path(db_path, deal_name))
+
+    write_build_meta(
+        db_path,
+        deal_name,
+        {
+            "deal_name": deal_name,
+            "collection": collection_name,
+            "index_version": compute_index_version(state["file_hashes"], hf_embedder.model_id),
+            "model_name": hf_embedder.model_id,
+            "chunk_count": len(state["seen"]),
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "last_build": report,
+        },
+    )
+
+    report["stages"] = stages
+    storage_stats = getattr(collection, "storage_stats", None)
+    if storage_stats is not None:
+        report["storage"] = storage_stats()
+        print(
+            f"[STORAGE] {report['storage']['dtype']} first pass: "
+            f"{report['storage']['first_pass_mb']} MB vs {report['storage']['float32_mb']} MB "
+            f"float32 ({report['storage']['savings_x']}x)"
+        )
+    print(
+        f"[OK] Completed → {collection_name} | added={report['added']} "
+        f"updated={report['updated']} deleted={report['deleted']} "
+        f"unchanged={report['unchanged']}"
+    )
+    return report
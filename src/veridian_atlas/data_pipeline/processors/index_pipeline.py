@@ -0,0 +1,184 @@
+"""
+index_pipeline.py
+-----------------
+Three-stage producer/consumer runner for index builds.
+
+    reader (batches) ──queue──▶ embedder ──queue──▶ writer (caller thread)
+
+ - Bounded queues: at most `queue_depth` batches wait between two stages,
+   so memory is capped regardless of deal size
+ - Embedding batch N+1 overlaps with the upsert of batch N
+ - The first error in any stage stops the others and is re-raised
+ - Per-stage throughput (chunks/s of busy time) is reported
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Tuple
+
+Batch = Tuple[List[str], List[str], List[dict]]
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.chunks = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+    def record(self, chunks: int, seconds: float):
+        self.chunks += chunks
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def as_dict(self) -> dict:
+        rate = self.chunks / self.busy_seconds if self.busy_seconds else 0.0
+        return {
+            "chunks": self.chunks,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "chunks_per_s": round(rate, 1),
+        }
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage has already failed."""
+
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+    raise _Stopped()
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    raise _Stopped()
+
+
+def run_pipeline(
+    batches: Iterable[Batch],
+    embed: Callable[[List[str]], list],
+    write: Callable[[List[str], List[str], List[dict], list], None],
+    queue_depth: int = 4,
+) -> dict:
+    """
+    Drives batches through embed() and write().
+    write() runs on the calling thread; reader and embedder run on worker threads.
+    Returns {"reader": {...}, "embedder": {...}, "writer": {...}, "wall_seconds": float}.
+    """
+    stats = {name: StageStats(name) for name in ("reader", "embedder", "writer")}
+    to_embed: queue.Queue = queue.Queue(maxsize=max(1, queue_depth))
+    to_write: queue.Queue = queue.Queue(maxsize=max(1, queue_depth))
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def fail(exc: BaseException):
+        errors.append(exc)
+        stop.set()
+
+    def reader():
+        try:
+            it = iter(batches)
+            while True:
+                start = time.perf_counter()
+                batch = next(it, _DONE)
+                if batch is _DONE:
+                    break
+                stats["reader"].record(len(batch[0]), time.perf_counter() - start)
+                _put(to_embed, batch, stop)
+            _put(to_embed, _DONE, stop)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            fail(exc)
+
+    def embedder():
+        try:
+            while True:
+                batch = _get(to_embed, stop)
+                if batch is _DONE:
+                    break
+                ids, docs, metas = batch
+                start = time.perf_counter()
+                vectors = embed(docs)
+                stats["embedder"].record(len(ids), time.perf_counter() - start)
+                _put(to_write, (ids, docs, metas, vectors), stop)
+            _put(to_write, _DONE, stop)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            fail(exc)
+
+    wall_start = time.perf_counter()
+    workers = [
+        threading.Thread(target=reader, name="index-reader", daemon=True),
+        threading.Thread(target=embedder, name="index-embedder", daemon=True),
+    ]
+    for t in workers:
+        t.start()
+
+    try:
+        while True:
+            item = _get(to_write, stop)
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            write(*item)
+            stats["writer"].record(len(item[0]), time.perf_counter() - start)
+    except _Stopped:
+        pass
+    except BaseException as exc:
+        fail(exc)
+    finally:
+        stop.set()
+        for t in workers:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+    result = {name: s.as_dict() for name, s in stats.items()}
+    result["wall_seconds"] = round(time.perf_counter() - wall_start, 4)
+    return result
+
+
+def run_serial(
+    batches: Iterable[Batch],
+    embed: Callable[[List[str]], list],
+    write: Callable[[List[str], List[str], List[dict], list], None],
+) -> dict:
+    """Same contract as run_pipeline(), one stage at a time on the calling thread."""
+    stats = {name: StageStats(name) for name in ("reader", "embedder", "writer")}
+    wall_start = time.perf_counter()
+    it = iter(batches)
+    while True:
+        start = time.perf_counter()
+        batch = next(it, _DONE)
+        if batch is _DONE:
+            break
+        ids, docs, metas = batch
+        stats["reader"].record(len(ids), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        vectors = embed(docs)
+        stats["embedder"].record(len(ids), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        write(ids, docs, metas, vectors)
+        stats["writer"].record(len(ids), time.perf_counter() - start)
+
+    result = {name: s.as_dict() for name, s in stats.items()}
+    result["wall_seconds"] = round(time.perf_counter() - wall_start, 4)
+    return result
@@ -0,0 +1,207 @@
+"""
+onnx_embedder.py
+----------------
+ONNX Runtime backend for EmbeddingService (CPU nodes).
+
+ - Exports the sentence-transformer's underlying HF transformer to ONNX once
+   (torch is only needed for the export, not for serving)
+ - Optional dynamic int8 quantization of the exported graph (needs `onnx`)
+ - Pooling / normalization read from the sentence-transformers config, so
+   vectors match the PyTorch backend (same max_seq_length, mean/CLS pooling,
+   Normalize module)
+
+Layout (one directory per model):
+    model.onnx         → float32 graph
+    model.int8.onnx    → dynamically quantized graph (if requested)
+    tokenizer files    → saved next to the graph
+    export.json        → {"model_name", "pooling", "normalize", "max_seq_length"}
+"""
+
+import inspect
+import json
+import re
+from pathlib import Path
+from threading import Lock
+from typing import List
+
+import numpy as np
+
+ONNX_OPSET = 14
+
+
+def onnx_dir_for(root: Path, model_name: str) -> Path:
+    return Path(root) / re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+
+
+# ---------------------------------------------------------
+# sentence-transformers config (pooling / normalize / max length)
+# ---------------------------------------------------------
+def _st_file(model_name: str, filename: str):
+    local = Path(model_name) / filename
+    if local.exists():
+        return local
+    try:
+        from huggingface_hub import hf_hub_download
+
+        return Path(hf_hub_download(model_name, filename))
+    except Exception:
+        return None
+
+
+def read_st_config(model_name: str) -> dict:
+    """Pooling + normalization as sentence-transformers would apply them."""
+    cfg = {"pooling": "mean", "normalize": False, "max_seq_length": 512}
+
+    modules_file = _st_file(model_name, "modules.json")
+    modules = json.loads(modules_file.read_text()) if modules_file else []
+    for module in modules:
+        kind = module.get("type", "")
+        if kind.endswith("Normalize"):
+            cfg["normalize"] = True
+        elif kind.endswith("Pooling"):
+            pooling_file = _st_file(model_name, f"{module['path']}/config.json")
+            if pooling_file:
+                pooling = json.loads(pooling_file.read_text())
+                if pooling.get("pooling_mode_cls_token"):
+                    cfg["pooling"] = "cls"
+
+    bert_file = _st_file(model_name, "sentence_bert_config.json")
+    if bert_file:
+        cfg["max_seq_length"] = json.loads(bert_file.read_text()).get(
+            "max_seq_length", cfg["max_seq_length"]
+        )
+    return cfg
+
+
+# ---------------------------------------------------------
+# Export / quantize
+# ---------------------------------------------------------
+def export_onnx(model_name: str, out_dir: Path) -> Path:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    axes = {0: "batch", 1: "sequence"}
+    path = out_dir / "model.onnx"
+    tmp = out_dir / "model.onnx.tmp"
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False  # TorchScript exporter: no onnxscript needed
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(tmp),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": axes,
+                "attention_mask": axes,
+                "last_hidden_state": axes,
+            },
+            opset_version=ONNX_OPSET,
+            **export_kwargs,
+        )
+    tmp.replace(path)
+
+    tokenizer.save_pretrained(out_dir)
+    meta = {"model_name": model_name, "opset": ONNX_OPSET, **read_st_config(model_name)}
+    (out_dir / "export.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    print(f"[ONNX] Exported {model_name} → {path}")
+    return path
+
+
+def quantize_onnx(src: Path, dst: Path) -> Path:
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as exc:  # onnxruntime.quantization imports `onnx`
+        raise RuntimeError("int8 quantization needs the `onnx` package: pip install onnx") from exc
+
+    quantize_dynamic(str(src), str(dst), weight_type=QuantType.QInt8)
+    print(f"[ONNX] Quantized (dynamic int8) → {dst}")
+    return dst
+
+
+# ---------------------------------------------------------
+# Encoder
+# ---------------------------------------------------------
+class OnnxEncoder:
+    def __init__(self, model_name: str, root: Path, quantize: bool = False, threads: int = 0):
+        self.model_name = model_name
+        self.dir = onnx_dir_for(root, model_name)
+        self.quantize = quantize
+        self.threads = threads
+        self._session = None
+        self._tokenizer = None
+        self._meta = None
+        self._lock = Lock()
+
+    @property
+    def graph_path(self) -> Path:
+        return self.dir / ("model.int8.onnx" if self.quantize else "model.onnx")
+
+    def _load(self):
+        with self._lock:
+            if self._session is not None:
+                return
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+
+            fp32 = self.dir / "model.onnx"
+            if not fp32.exists() or not (self.dir / "export.json").exists():
+                export_onnx(self.model_name, self.dir)
+            if self.quantize and not self.graph_path.exists():
+                quantize_onnx(fp32, self.graph_path)
+
+            options = ort.SessionOptions()
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            self._session = ort.InferenceSession(
+                str(self.graph_path), options, providers=["CPUExecutionProvider"]
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(self.dir)
+            self._meta = json.loads((self.dir / "export.json").read_text(encoding="utf-8"))
+            print(f"[EMBEDDER] ONNX graph: {self.graph_path.name} ({self.model_name})")
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._session is not None
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool = False) -> np.ndarray:
+        if self._session is None:
+            self._load()
+
+        meta = self._meta
+        out = []
+        for i in range(0, len(texts), batch_size):
+            enc = self._tokenizer(
+                texts[i : i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=meta["max_seq_length"],
+                return_tensors="np",
+            )
+            mask = enc["attention_mask"].astype(np.int64)
+            hidden = self._session.run(
+                None, {"input_ids": enc["input_ids"].astype(np.int64), "attention_mask": mask}
+            )[0]
+
+            if meta["pooling"] == "cls":
+                pooled = hidden[:, 0]
+            else:
+                weights = mask[..., None].astype(np.float32)
+                pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+
+            if meta["normalize"] or normalize:
+                pooled = pooled / np.clip(
+                    np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None
+                )
+            out.append(pooled.astype(np.float32))
+
+        return np.concatenate(out) if out else np.zeros((0, 0), dtype=np.float32)
@@ -0,0 +1,100 @@
+"""
+reference_index.py
+------------------
+Exact section / clause reference index per deal (built with the vector index).
+
+ - Keys come from chunk metadata: normalized_section (SECTION_004) and
+   clause_id (2.1(a) → "2.1.a"), so "Section 4" or "2.1(a)" resolve in O(1)
+ - Values are chunk_ids in chunks.jsonl order (document, section, clause)
+ - Stored next to build_meta → {db_path}/reference_index/VA_{deal}.json
+ - Indexes built before this file existed are rebuilt from collection metadata
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from veridian_atlas.core.chroma_registry import collection_name_for
+
+
+# -----------------------------------------------------
+# KEYS
+# -----------------------------------------------------
+def section_key(value: str) -> Optional[str]:
+    """'SECTION 4', 'Section 04', '4' → 'SECTION_004' (same as chunker.normalize_section)."""
+    match = re.search(r"\d+", str(value))
+    return f"SECTION_{int(match.group()):03d}" if match else None
+
+
+def clause_key(value: str) -> Optional[str]:
+    """'2.1(a)', '2.1 (a)', '2.1.a', 'Clause 2.1(A)' → '2.1.a'."""
+    text = re.sub(r"^\s*clause\s*", "", str(value).casefold())
+    parts = re.findall(r"\d+|[a-z]+", text)
+    if not parts or not parts[0].isdigit():
+        return None
+    return ".".join(str(int(p)) if p.isdigit() else p for p in parts)
+
+
+def reference_index_path(db_path: Path, deal_name: str) -> Path:
+    return Path(db_path) / "reference_index" / f"{collection_name_for(deal_name)}.json"
+
+
+# -----------------------------------------------------
+# INDEX
+# -----------------------------------------------------
+class ReferenceIndex:
+    def __init__(self):
+        self.sections: Dict[str, List[str]] = {}
+        self.clauses: Dict[str, List[str]] = {}
+
+    def add(self, chunk_id: str, meta: dict):
+        section = meta.get("normalized_section") or section_key(meta.get("section_id") or "")
+        if section:
+            self.sections.setdefault(section, []).append(chunk_id)
+        clause = clause_key(meta["clause_id"]) if meta.get("clause_id") else None
+        if clause:
+            self.clauses.setdefault(clause, []).append(chunk_id)
+
+    def section(self, key: str) -> List[str]:
+        return self.sections.get(key, [])
+
+    def clause(self, key: str) -> List[str]:
+        return self.clauses.get(key, [])
+
+    def __len__(self) -> int:
+        return len(self.sections) + len(self.clauses)
+
+    @classmethod
+    def from_metadatas(cls, ids: Iterable[str], metadatas: Iterable[dict]) -> "ReferenceIndex":
+        """
+        Rebuilds the index from a collection's metadatas. Chroma returns rows
+        in storage order, so chunk_ids are sorted to restore document order.
+        """
+        index = cls()
+        for chunk_id, meta in sorted(zip(ids, metadatas), key=lambda row: row[0]):
+            index.add(chunk_id, meta or {})
+        return index
+
+    # -------------------------------------------------
+    # Persistence
+    # -------------------------------------------------
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"sections": self.sections, "clauses": self.clauses}), encoding="utf-8"
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ReferenceIndex"]:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        index = cls()
+        index.sections = data.get("sections", {})
+        index.clauses = data.get("clauses", {})
+        return index
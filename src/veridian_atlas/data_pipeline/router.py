@@ -5,22 +5,33 @@ Multi-deal ingestion router for Veridian Atlas.
 
 Directory Standard:
 veridian_atlas.data.deals.{deal_name}.raw/*.txt
-veridian_atlas.data.deals.{deal_name}.processed/sections.json
+veridian_atlas.data.deals.{deal_name}.processed/sections.json (or sections.jsonl)
 
 Features:
 - Multi-document routing
 - SHA256 hashing for version tracking
-- Overwrites processed/sections.json on each ingest
+- Incremental: processed/manifest.json (hash, size, mtime per file) lets
+  unchanged files reuse their previous sections; mtime+size skips re-hashing
+- Parallel mode: changed files from every deal parsed on a process pool
 - Loader map is future-proof for PDF/DOCX
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 import hashlib
 import json
 
+from veridian_atlas.core import config
+from veridian_atlas.data_pipeline.sections_io import (
+    find_sections_file,
+    load_sections,
+    sections_file_for,
+    write_sections,
+)
 from veridian_atlas.utils.logger import get_logger
-from veridian_atlas.data_pipeline.loaders.text_loader import handle_text_loading
+from veridian_atlas.data_pipeline.loaders.text_loader import PARSER_VERSION, handle_text_loading
 
 logger = get_logger(__name__)
 
@@ -49,10 +60,50 @@ def compute_file_hash(file_path: Path) -> str:
     return sha.hexdigest()
 
 
+# ---------------------------------------------------------
+# Per-deal manifest (file → hash, size, mtime)
+# ---------------------------------------------------------
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(processed_path: Path) -> dict:
+    path = processed_path / MANIFEST_NAME
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"files": {}}
+
+    # Parser upgrades invalidate every cached parse
+    if manifest.get("parser_version") != PARSER_VERSION:
+        return {"files": {}}
+    return manifest
+
+
+def save_manifest(processed_path: Path, files: Dict[str, dict]) -> None:
+    path = processed_path / MANIFEST_NAME
+    payload = {"parser_version": PARSER_VERSION, "files": files}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def load_previous_sections(processed_path: Path) -> Dict[str, List[dict]]:
+    path = find_sections_file(processed_path)
+    if path is None:
+        return {}
+    try:
+        return load_sections(path)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
 # ---------------------------------------------------------
 # Route a single file
 # ---------------------------------------------------------
-def route_file(file_path: Path, deal_name: str, doc_id: Optional[str] = None) -> List[dict]:
+def route_file(
+    file_path: Path,
+    deal_name: str,
+    doc_id: Optional[str] = None,
+    file_hash: Optional[str] = None,
+) -> List[dict]:
     if not file_path.exists():
         logger.error(f"[ROUTER] Missing file → {file_path}")
         return []
@@ -66,7 +117,7 @@ def route_file(file_path: Path, deal_name: str, doc_id: Optional[str] = None) ->
         logger.error(f"[ROUTER] Unsupported file type '{ext}' | File={file_path.name}")
         raise ValueError(f"Unsupported extension: {ext}")
 
-    file_hash = compute_file_hash(file_path)
+    file_hash = file_hash or compute_file_hash(file_path)
 
     try:
         loader = LOADER_MAP[ext]
@@ -76,13 +127,110 @@ def route_file(file_path: Path, deal_name: str, doc_id: Optional[str] = None) ->
         return []
 
 
+# ---------------------------------------------------------
+# File task (runs in-process or in a pool worker)
+# ---------------------------------------------------------
+def ingest_file(
+    file_path: Path, deal_name: str, doc_id: str, known_hash: Optional[str], reusable: bool
+) -> Tuple[str, Optional[List[dict]]]:
+    """
+    Hashes and parses one raw file. Returns (hash, sections), or (hash, None)
+    when the content matches known_hash and the previous parse can be reused.
+    Never raises: a crashing loader yields an empty parse for that file only.
+    """
+    try:
+        file_hash = compute_file_hash(file_path)
+        if reusable and file_hash == known_hash:
+            return file_hash, None
+        return file_hash, route_file(file_path, deal_name, doc_id, file_hash=file_hash)
+    except Exception as exc:
+        logger.exception(f"[ROUTER] Ingest failed → {file_path.name}: {exc}")
+        return known_hash or "", []
+
+
+def ingest_file_batch(tasks: List[tuple]) -> List[Tuple[str, Optional[List[dict]]]]:
+    return [ingest_file(*task) for task in tasks]
+
+
+def run_isolated(tasks: List[tuple]) -> List[Tuple[str, Optional[List[dict]]]]:
+    """
+    Re-runs tasks one at a time on a single-worker pool, so a file that kills
+    its worker process is identified and fails alone (the pool is replaced).
+    """
+    results: List[Tuple[str, Optional[List[dict]]]] = []
+    pool = ProcessPoolExecutor(max_workers=1)
+    try:
+        for task in tasks:
+            try:
+                results.append(pool.submit(ingest_file, *task).result())
+            except BrokenProcessPool as exc:
+                logger.error(f"[ROUTER] Worker crashed → {Path(task[0]).name}: {exc!r}")
+                results.append((task[3] or "", []))
+                pool.shutdown(wait=True)
+                pool = ProcessPoolExecutor(max_workers=1)
+    finally:
+        pool.shutdown(wait=True)
+    return results
+
+
+def run_file_tasks(tasks: List[tuple], workers: int = 1) -> List[Tuple[str, Optional[List[dict]]]]:
+    """
+    Runs ingest_file over tasks, serially or across a process pool.
+    Tasks are shipped in small batches to amortize IPC; results are
+    returned in task order, so output is deterministic.
+    If a worker process dies, the pool is broken for every batch still in
+    flight: those batches are re-run through run_isolated, so only the file
+    that crashes is marked failed.
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return ingest_file_batch(tasks)
+
+    workers = min(workers, len(tasks))
+    size = max(1, min(64, len(tasks) // (workers * 4)))
+    batches = [(i, tasks[i : i + size]) for i in range(0, len(tasks), size)]
+
+    results: List[Tuple[str, Optional[List[dict]]]] = [("", [])] * len(tasks)
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(ingest_file_batch, batch): (i, batch) for i, batch in batches}
+        for future in as_completed(futures):
+            start, batch = futures[future]
+            try:
+                results[start : start + len(batch)] = future.result()
+            except BrokenProcessPool:
+                unfinished.append((start, batch))
+            except Exception as exc:
+                # e.g. unpicklable results (loader exceptions never get here)
+                names = [Path(t[0]).name for t in batch]
+                logger.error(f"[ROUTER] Batch failed → {names}: {exc!r}")
+                results[start : start + len(batch)] = [(t[3] or "", []) for t in batch]
+
+    if unfinished:
+        logger.warning(f"[ROUTER] Process pool broke → re-running {len(unfinished)} batch(es)")
+        for start, batch in sorted(unfinished):
+            results[start : start + len(batch)] = run_isolated(batch)
+    return results
+
+
 # ---------------------------------------------------------
 # Deal-level ingestion
 # ---------------------------------------------------------
-def ingest_deal(deal_name: str) -> Dict[str, List[dict]]:
+def _deal_paths(deal_name: str, sections_format: str) -> Tuple[Path, Path, Path]:
     raw_path = BASE_DEALS_PATH / deal_name / "raw"
     processed_path = BASE_DEALS_PATH / deal_name / "processed"
-    output_file = processed_path / "sections.json"
+    return raw_path, processed_path, sections_file_for(processed_path, sections_format)
+
+
+def plan_deal(
+    deal_name: str, force: bool = False, sections_format: Optional[str] = None
+) -> Optional[dict]:
+    """
+    Scans a deal's raw folder against its manifest.
+    Files with unchanged size + mtime are reused without hashing;
+    everything else becomes an ingest_file task.
+    """
+    sections_format = sections_format or config.SECTIONS_FORMAT
+    raw_path, processed_path, output_file = _deal_paths(deal_name, sections_format)
 
     logger.info("\n==============================")
     logger.info(f"[DEAL] Ingesting {deal_name}")
@@ -91,43 +239,157 @@ def ingest_deal(deal_name: str) -> Dict[str, List[dict]]:
 
     if not raw_path.exists():
         logger.error(f"[DEAL] Raw directory missing → {raw_path}")
-        return {}
+        return None
+
+    manifest = {"files": {}} if force else load_manifest(processed_path)
+    previous = {} if force else load_previous_sections(processed_path)
+
+    entries, tasks = [], []
+    for file in sorted(raw_path.iterdir()):
+        if not file.is_file():
+            continue
+
+        doc_id = file.stem
+        known = manifest["files"].get(file.name)
+        stat = file.stat()
+        entry = {"file": file, "doc_id": doc_id, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+        reusable = bool(known) and doc_id in previous
+
+        if (
+            reusable
+            and known.get("size") == stat.st_size
+            and known.get("mtime") == stat.st_mtime_ns
+        ):
+            entry["hash"] = known["hash"]
+        else:
+            entry["task"] = len(tasks)
+            tasks.append((file, deal_name, doc_id, known["hash"] if known else None, reusable))
+        entries.append(entry)
+
+    return {
+        "deal_name": deal_name,
+        "processed_path": processed_path,
+        "output_file": output_file,
+        "known_files": manifest["files"],
+        "previous": previous,
+        "entries": entries,
+        "tasks": tasks,
+    }
 
-    results = {}
-    for file in raw_path.iterdir():
-        if file.is_file():
-            doc_id = file.stem
-            results[doc_id] = route_file(file, deal_name, doc_id)
+
+def finalize_deal(plan: dict, task_results: List[tuple]) -> Dict[str, List[dict]]:
+    """
+    Assembles sections in file order, then writes the sections file + manifest
+    if anything changed.
+    """
+    processed_path, output_file = plan["processed_path"], plan["output_file"]
+    known_files, previous = plan["known_files"], plan["previous"]
+
+    results, files = {}, {}
+    parsed = reused = 0
+    for entry in plan["entries"]:
+        doc_id, name = entry["doc_id"], entry["file"].name
+        sections = None
+        file_hash = entry.get("hash")
+        if "task" in entry:
+            file_hash, sections = task_results[entry["task"]]
+
+        files[name] = {
+            "hash": file_hash,
+            "size": entry["size"],
+            "mtime": entry["mtime"],
+            "doc_id": doc_id,
+        }
+
+        if sections is None:
+            results[doc_id] = previous[doc_id]
+            reused += 1
+            continue
+
+        parsed += 1
+        if sections:
+            results[doc_id] = sections
+            continue
+
+        # Nothing parsed (or loader / worker crashed) → retry on the next run,
+        # keeping the previous sections rather than overwriting them with []
+        del files[name]
+        results[doc_id] = previous.get(doc_id, [])
+        if results[doc_id]:
+            logger.warning(f"[DEAL] {name}: empty parse, keeping previous sections")
+
+    removed = len(set(known_files) - set(files))
+    logger.info(
+        f"[DEAL] {plan['deal_name']}: Parsed={parsed} | Reused={reused} | Removed={removed}"
+    )
 
     # Ensure processed folder
     processed_path.mkdir(parents=True, exist_ok=True)
 
-    # Write output JSON
+    if not parsed and not removed and output_file.exists() and known_files == files:
+        logger.info(f"[DEAL] ✔ Up to date → {output_file}")
+        return results
+
+    # Write sections, then the manifest that describes them
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        write_sections(output_file, results)
         logger.info(f"[DEAL] ✔ Saved → {output_file}")
+        save_manifest(processed_path, files)
     except Exception as exc:
         logger.exception(f"[DEAL] FAILED writing output: {exc}")
 
     return results
 
 
+def ingest_deal(
+    deal_name: str, force: bool = False, workers: int = 1, sections_format: Optional[str] = None
+) -> Dict[str, List[dict]]:
+    """
+    Ingests one deal. Files whose hash matches the manifest reuse their
+    previous sections; force=True re-parses everything.
+    workers > 1 parses changed files across a process pool.
+    sections_format: "json" (default) or "jsonl" (streamable by the chunker).
+    """
+    plan = plan_deal(deal_name, force=force, sections_format=sections_format)
+    if plan is None:
+        return {}
+    return finalize_deal(plan, run_file_tasks(plan["tasks"], workers))
+
+
 # ---------------------------------------------------------
 # Global multi-deal ingest
 # ---------------------------------------------------------
-def ingest_all_deals() -> Dict[str, Dict[str, List[dict]]]:
+def ingest_all_deals(
+    force: bool = False, workers: int = 1, sections_format: Optional[str] = None
+) -> Dict[str, Dict[str, List[dict]]]:
+    """
+    Ingests every deal. With workers > 1, files from all deals share
+    one process pool, so small deals do not leave cores idle.
+    """
     logger.info("[GLOBAL] Starting multi-deal ingestion...")
 
     if not BASE_DEALS_PATH.exists():
         logger.error(f"[GLOBAL] Deals directory missing: {BASE_DEALS_PATH}")
         return {}
 
-    deals = {}
-    for deal_folder in BASE_DEALS_PATH.iterdir():
-        if deal_folder.is_dir():
-            deal_name = deal_folder.name
-            deals[deal_name] = ingest_deal(deal_name)
+    plans = {
+        deal_folder.name: plan_deal(deal_folder.name, force=force, sections_format=sections_format)
+        for deal_folder in sorted(BASE_DEALS_PATH.iterdir())
+        if deal_folder.is_dir()
+    }
+
+    all_tasks = [task for plan in plans.values() if plan for task in plan["tasks"]]
+    logger.info(f"[GLOBAL] {len(all_tasks)} files to parse | workers={workers}")
+    all_results = run_file_tasks(all_tasks, workers)
+
+    deals, offset = {}, 0
+    for deal_name, plan in plans.items():
+        if plan is None:
+            deals[deal_name] = {}
+            continue
+        count = len(plan["tasks"])
+        deals[deal_name] = finalize_deal(plan, all_results[offset : offset + count])
+        offset += count
 
     logger.info(f"[GLOBAL] Completed ingestion for {len(deals)} deals.")
     return deals
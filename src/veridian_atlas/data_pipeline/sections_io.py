@@ -0,0 +1,74 @@
+"""
+sections_io.py
+--------------
+Read/write helpers for processed section files.
+
+Formats:
+- sections.json  → {document_id: [section, ...]}  (original, loaded whole)
+- sections.jsonl → one section per line, each carrying its document_id
+                   (streamable: memory stays flat regardless of deal size)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SECTIONS_JSON = "sections.json"
+SECTIONS_JSONL = "sections.jsonl"
+SECTION_FORMATS = {"json": SECTIONS_JSON, "jsonl": SECTIONS_JSONL}
+
+
+def sections_file_for(processed_path: Path, sections_format: str) -> Path:
+    if sections_format not in SECTION_FORMATS:
+        raise ValueError(f"Unknown sections format: {sections_format}")
+    return processed_path / SECTION_FORMATS[sections_format]
+
+
+def find_sections_file(processed_path: Path) -> Optional[Path]:
+    """Newest existing sections file in processed_path (either format)."""
+    candidates = [processed_path / name for name in SECTION_FORMATS.values()]
+    existing = [p for p in candidates if p.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda p: p.stat().st_mtime_ns)
+
+
+def iter_sections(path: Path) -> Iterator[Tuple[str, dict]]:
+    """Yields (document_id, section) in file order."""
+    if path.suffix == ".jsonl":
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    section = json.loads(line)
+                    yield section.get("document_id", ""), section
+        return
+
+    parsed = json.loads(path.read_text(encoding="utf-8"))
+    for document_id, sections in parsed.items():
+        for section in sections:
+            yield document_id, section
+
+
+def load_sections(path: Path) -> Dict[str, List[dict]]:
+    grouped: Dict[str, List[dict]] = {}
+    for document_id, section in iter_sections(path):
+        grouped.setdefault(document_id, []).append(section)
+    return grouped
+
+
+def write_sections(path: Path, results: Dict[str, List[dict]]) -> None:
+    """Writes results in the format implied by path, then drops the other format."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for document_id, sections in results.items():
+                for section in sections:
+                    record = {"document_id": document_id, **section}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    tmp.replace(path)
+
+    for other in SECTION_FORMATS.values():
+        if other != path.name:
+            (path.parent / other).unlink(missing_ok=True)
@@ -0,0 +1,99 @@
+"""
+chunk_lookup.py
+---------------
+Chunk retrieval by primary key for the UI (citation side panel, bulk fetch).
+
+ - Reads the deal's chunks.jsonl through its byte-offset index
+   (chunks.offsets.json, written by the chunker): one seek per chunk
+ - Offset indexes are cached per deal and reloaded when chunks.jsonl changes;
+   a missing or stale index file is rebuilt in memory with one scan
+ - Rows come back as the vector index stores them (id, document, metadata),
+   so responses match what retrieval returns
+ - Deals without chunks.jsonl return None → callers fall back to the collection
+"""
+
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from veridian_atlas.core.constants import DEALS_DIR
+from veridian_atlas.data_pipeline.processors.chunk_offsets import (
+    ChunkOffsetIndex,
+    chunk_offsets_path,
+)
+from veridian_atlas.data_pipeline.processors.index_builder import chunk_record
+
+
+class ChunkLookup:
+    def __init__(self, deals_dir: Path = DEALS_DIR):
+        self.deals_dir = Path(deals_dir)
+        self._lock = Lock()
+        self._entries: Dict[str, ChunkOffsetIndex] = {}
+        self.requested = 0
+        self.found = 0
+        self.rebuilt = 0
+
+    def chunks_path(self, deal_name: str) -> Path:
+        return self.deals_dir / deal_name / "processed" / "chunks.jsonl"
+
+    def index(self, deal_name: str) -> Optional[ChunkOffsetIndex]:
+        path = self.chunks_path(deal_name)
+        if not path.exists():
+            return None
+
+        with self._lock:
+            cached = self._entries.get(deal_name)
+        if cached is not None and cached.matches(path):
+            return cached
+
+        index = ChunkOffsetIndex.load(chunk_offsets_path(path))
+        if index is None or not index.matches(path):
+            index = ChunkOffsetIndex.scan(path)
+            with self._lock:
+                self.rebuilt += 1
+
+        with self._lock:
+            self._entries[deal_name] = index
+        return index
+
+    def get(
+        self, deal_name: str, chunk_ids: Iterable[str]
+    ) -> Optional[Dict[str, Tuple[str, dict]]]:
+        """
+        chunk_id → (document, metadata) for the ids found;
+        None if the deal has no chunks.jsonl.
+        """
+        chunk_ids = list(chunk_ids)
+        index = self.index(deal_name)
+        if index is None:
+            return None
+
+        rows = {}
+        for chunk_id, row in index.read(self.chunks_path(deal_name), chunk_ids).items():
+            record = chunk_record(row)
+            if record is not None:
+                rows[chunk_id] = record[1:]
+
+        with self._lock:
+            self.requested += len(chunk_ids)
+            self.found += len(rows)
+        return rows
+
+    def invalidate(self, deal_name: Optional[str] = None):
+        with self._lock:
+            if deal_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(deal_name, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "deals": len(self._entries),
+                "requested": self.requested,
+                "from_chunks_file": self.found,
+                "indexes_rebuilt": self.rebuilt,
+            }
+
+
+chunk_lookup = ChunkLookup()
@@ -0,0 +1,156 @@
+"""
+context_packer.py
+-----------------
+Token-budgeted context packing between retrieve_context() and build_rag_prompt().
+
+ - Chunks measured with the LLM tokenizer (count_tokens)
+ - Duplicates / chunks contained in another retrieved chunk are dropped
+   (e.g. a clause repeated inside a section-level chunk)
+ - Chunks over max_chunk_tokens keep only their most query-relevant sentences
+ - Packed in retrieval order until the token budget is spent
+ - chunk_ids are never changed, so citation validation still works
+"""
+
+import re
+from typing import Callable, Dict, List, Optional
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.;!?])\s+(?=[A-Z0-9(\"'])")
+WORD = re.compile(r"[a-z0-9%$.]+")
+ELLIPSIS = " ... "
+MIN_USEFUL_TOKENS = 24
+
+STOPWORDS = {
+    "the", "and", "for", "are", "was", "what", "which", "who", "whom", "when", "where",
+    "how", "does", "did", "this", "that", "with", "from", "under", "into", "any", "all",
+    "shall", "will", "may", "such", "its", "their", "there", "is", "of", "to", "in", "a",
+    "an", "on", "or", "by", "be", "as", "at", "it",
+}  # fmt: skip
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def _stems(text: str) -> set:
+    # 5-char prefixes: "fees"/"fee", "covenants"/"covenant" match without a stemmer
+    return {w[:5] for w in WORD.findall(text.casefold()) if w not in STOPWORDS and len(w) > 1}
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in SENTENCE_SPLIT.split(text.strip()) if s]
+
+
+def drop_contained(contexts: List[dict]) -> List[dict]:
+    """
+    Removes chunks whose text equals or is contained in another retrieved chunk.
+    Exact duplicates keep the best-ranked copy.
+    """
+    normalized = [_normalize(c["content"]) for c in contexts]
+    kept = []
+    for i, c in enumerate(contexts):
+        text = normalized[i]
+        covered = any(
+            j != i
+            and text in other
+            and (len(other) > len(text) or j < i)  # contained, or an earlier duplicate
+            for j, other in enumerate(normalized)
+        )
+        if not covered:
+            kept.append(c)
+    return kept
+
+
+def _truncate_words(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    words = text.split()
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid])) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo])
+
+
+def compress(text: str, query: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    """
+    Keeps the sentences sharing the most terms with the query (ties → earlier),
+    in their original order, within max_tokens.
+    """
+    sentences = split_sentences(text)
+    query_terms = _stems(query)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-len(query_terms & _stems(sentences[i])), i),
+    )
+
+    chosen, used = [], 0
+    sep_tokens = count_tokens(ELLIPSIS)
+    for i in ranked:
+        cost = count_tokens(sentences[i]) + (sep_tokens if chosen else 0)
+        if used + cost <= max_tokens:
+            chosen.append(i)
+            used += cost
+
+    if not chosen:
+        # One sentence larger than the whole allowance → cut it by words
+        return _truncate_words(
+            sentences[ranked[0]] if sentences else text, max_tokens, count_tokens
+        )
+
+    chosen.sort()
+    parts = []
+    for prev, i in zip([None] + chosen, chosen):
+        if prev is not None:
+            parts.append(" " if i == prev + 1 else ELLIPSIS)
+        parts.append(sentences[i])
+    return "".join(parts)
+
+
+def pack_contexts(
+    query: str,
+    contexts: List[dict],
+    count_tokens: Callable[[str], int],
+    token_budget: int = 1200,
+    max_chunk_tokens: int = 400,
+    stats: Optional[Dict] = None,
+) -> List[dict]:
+    """
+    Returns copies of the chunks that go into the prompt, in retrieval order.
+    Trimmed chunks carry "trimmed": True; every packed chunk has "tokens".
+    """
+    packed, remaining = [], token_budget
+    unique = drop_contained(contexts)
+
+    for c in unique:
+        if remaining < MIN_USEFUL_TOKENS:
+            break
+
+        # The prompt line is "[chunk_id] content"; the id costs tokens too
+        id_tokens = count_tokens(f"[{c['chunk_id']}] ")
+        content = c["content"]
+        tokens = count_tokens(content)
+        allowance = min(max_chunk_tokens, remaining - id_tokens)
+        trimmed = tokens > allowance
+        if trimmed:
+            if allowance < MIN_USEFUL_TOKENS:
+                continue
+            content = compress(content, query, allowance, count_tokens)
+            if not content:
+                continue
+            tokens = count_tokens(content)
+
+        packed.append({**c, "content": content, "tokens": id_tokens + tokens, "trimmed": trimmed})
+        remaining -= id_tokens + tokens
+
+    if stats is not None:
+        stats.update(
+            {
+                "retrieved": len(contexts),
+                "deduplicated": len(contexts) - len(unique),
+                "packed": len(packed),
+                "trimmed": sum(1 for c in packed if c["trimmed"]),
+                "tokens": token_budget - remaining,
+            }
+        )
+    return packed
@@ -2,76 +2,300 @@
 rag_engine.py
 -------------
 Per-deal RAG engine (improved):
- - Per-deal collections → VA_{deal_name}
+ - Per-deal collections → VA_{deal_name} (cached via core.chroma_registry)
  - Manual embedding for queries (no dimension mismatch)
+ - LRU cache of query embeddings (repeat questions skip the model)
+ - Index-version-aware answer cache (repeat questions skip generation)
+ - Streaming variant (stream_answer) for SSE: sources → answer text → final
+ - Token-budgeted context packing (dedupe + sentence-level trimming)
+ - Batched variants (retrieve_context_batch / answer_query_batch): one embed
+   call, one multi-vector collection query, prompts generated in LLM batches
+ - Federated retrieval across an explicit deal allow-list (one query
+   embedding, concurrent per-collection queries, global top-k)
+ - Clause / section references ("2.1(a)", "Section 4") resolved exactly from
+   the reference index, ahead of vector hits; pure lookups skip embedding
  - Allows semantic paraphrasing (no overstrict substring match)
  - Still prevents hallucinated citations
 """
 
+import re
 from pathlib import Path
-from typing import List, Dict, Any
-import chromadb
-from chromadb.config import Settings
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from veridian_atlas.rag_engine.services.local_llm import generate_response
+from veridian_atlas.core import config
+from veridian_atlas.core.chroma_registry import chroma_registry
+from veridian_atlas.rag_engine.pipeline.context_packer import pack_contexts
+from veridian_atlas.rag_engine.pipeline.reference_lookup import (
+    is_pure_lookup,
+    parse_references,
+    reference_indexes,
+    resolve,
+)
+from veridian_atlas.rag_engine.services.answer_cache import AnswerCache
+from veridian_atlas.rag_engine.services.local_llm import (
+    MODEL_NAME,
+    AnswerFieldStreamer,
+    count_tokens,
+    generate_response,
+    generate_responses,
+    parse_response,
+    register_prompt_prefix,
+    stream_response,
+)
 from veridian_atlas.data_pipeline.processors.embedder import hf_embedder
+from veridian_atlas.utils.cache import LRUCache
 
 PACKAGE_ROOT = Path(__file__).resolve().parent.parent.parent
 DEFAULT_DB_PATH = PACKAGE_ROOT / "data" / "indexes" / "chroma_db"
 TOP_K = 5
 
+# (model_name, normalized query) → embedding tuple
+query_embedding_cache = LRUCache(maxsize=config.QUERY_EMBED_CACHE_SIZE)
+
+# Per-collection queries of federated searches (Chroma/HNSW release the GIL)
+_fanout_pool = ThreadPoolExecutor(
+    max_workers=config.SEARCH_FANOUT_WORKERS, thread_name_prefix="search-fanout"
+)
+
+answer_cache = AnswerCache(
+    db_path=DEFAULT_DB_PATH,
+    maxsize=config.ANSWER_CACHE_SIZE,
+    ttl=config.ANSWER_CACHE_TTL,
+    disk_dir=config.ANSWER_CACHE_DIR,
+)
+
 
 # ------------------------------------------------------------
-# COLLECTION ACCESS (one per deal)
+# COLLECTION ACCESS (one per deal, shared process-wide client)
 # ------------------------------------------------------------
 def get_chroma_collection(deal_name: str, db_path: Path = DEFAULT_DB_PATH):
-    collection_name = f"VA_{deal_name}".replace(" ", "_")
-    client = chromadb.PersistentClient(
-        path=str(db_path), settings=Settings(anonymized_telemetry=False)
-    )
-    return client.get_collection(collection_name)
+    return chroma_registry.get_collection(deal_name, db_path)
+
+
+# ------------------------------------------------------------
+# QUERY EMBEDDING (cached)
+# ------------------------------------------------------------
+def normalize_query(query: str) -> str:
+    # mpnet's tokenizer lower-cases, so case/whitespace variants embed identically
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+def embed_query(query: str) -> List[float]:
+    normalized = normalize_query(query)
+    key = (hf_embedder.model_id, normalized)
+
+    cached = query_embedding_cache.get(key)
+    if cached is not None:
+        return list(cached)
+
+    vector = hf_embedder.embed_single(normalized)
+    query_embedding_cache.put(key, tuple(vector))
+    return vector
+
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    """embed_query() for many queries: cache misses share one embed() call."""
+    keys = [(hf_embedder.model_id, normalize_query(q)) for q in queries]
+    vectors = {key: query_embedding_cache.get(key) for key in dict.fromkeys(keys)}
+
+    missing = [key for key, vec in vectors.items() if vec is None]
+    if missing:
+        encoded = hf_embedder.embed([text for _, text in missing], persist=False)
+        for key, vec in zip(missing, encoded):
+            vectors[key] = tuple(vec.tolist())
+            query_embedding_cache.put(key, vectors[key])
+
+    return [list(vectors[key]) for key in keys]
+
+
+# ------------------------------------------------------------
+# REFERENCE FAST PATH (no embedding)
+# ------------------------------------------------------------
+def _context_row(chunk_id: str, document: str, meta: dict, distance: float) -> Dict[str, Any]:
+    return {
+        "chunk_id": meta.get("chunk_id", chunk_id),
+        "content": document.replace("\n", " ").strip(),
+        "section": meta.get("section_id"),
+        "clause": meta.get("clause_id"),
+        "distance": float(distance),
+    }
+
+
+def lookup_references(
+    query: str,
+    deal_name: str,
+    collection,
+    db_path: Path = DEFAULT_DB_PATH,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Returns (chunks named by the query, pure_lookup).
+    Exact hits carry distance 0.0 and keep reference order. They rank first,
+    so only the first `limit` (top_k) are fetched: "Section 4" on a long
+    section does not pull every chunk of it from the collection.
+    """
+    refs = parse_references(query) if config.REFERENCE_LOOKUP else []
+    if not refs:
+        return [], False
+
+    index = reference_indexes.get(deal_name, db_path, collection)
+    chunk_ids = resolve(index, refs) if index is not None else []
+    pure = bool(chunk_ids) and is_pure_lookup(query)
+    reference_indexes.record(hit=bool(chunk_ids), pure=pure)
+    if not chunk_ids:
+        return [], False
+
+    chunk_ids = chunk_ids[:limit]
+    found = collection.get(ids=chunk_ids, include=["documents", "metadatas"])
+    rows = {
+        chunk_id: _context_row(chunk_id, doc, meta or {}, 0.0)
+        for chunk_id, doc, meta in zip(found["ids"], found["documents"], found["metadatas"])
+    }
+    return [rows[c] for c in chunk_ids if c in rows], pure
 
 
 # ------------------------------------------------------------
 # RETRIEVAL (manual embedding fixes 384 vs 768 errors)
 # ------------------------------------------------------------
-def retrieve_context(query: str, deal_name: str, top_k: int = TOP_K) -> List[Dict[str, Any]]:
-    collection = get_chroma_collection(deal_name)
-    if collection is None:
-        return []
-    # Manual embedding → avoids auto-embed mismatch
-    q_vec = hf_embedder.embed_single(query)
+def _search_collection(
+    query: str,
+    deal_name: str,
+    collection,
+    query_vector: Callable[[], List[float]],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    exact, pure = lookup_references(query, deal_name, collection, DEFAULT_DB_PATH, top_k)
+    if pure:
+        return exact
 
     results = collection.query(
-        query_embeddings=[q_vec],
+        query_embeddings=[query_vector()],
         n_results=top_k,
         include=["documents", "metadatas", "distances"],
     )
+    return _merge_hits(exact, results, 0, top_k)
 
-    docs = results.get("documents", [[]])[0]
-    metas = results.get("metadatas", [[]])[0]
-    dists = results.get("distances", [[]])[0]
 
-    return [
-        {
-            "chunk_id": m.get("chunk_id"),
-            "content": d.replace("\n", " ").strip(),
-            "section": m.get("section_id"),
-            "clause": m.get("clause_id"),
-            "distance": float(dist),
-        }
-        for d, m, dist in zip(docs, metas, dists)
-    ]
+def _merge_hits(exact: List[dict], results: dict, row: int, top_k: int) -> List[Dict[str, Any]]:
+    """Row `row` of a collection.query() result, after the exact reference hits."""
+
+    def column(name: str) -> list:
+        rows = results.get(name) or []
+        return rows[row] if row < len(rows) else []
+
+    docs, metas = column("documents"), column("metadatas")
+    dists, ids = column("distances"), column("ids")
+
+    # Exact reference hits first, then vector hits not already included
+    merged = list(exact)
+    seen = {c["chunk_id"] for c in exact}
+    for chunk_id, d, m, dist in zip(ids, docs, metas, dists):
+        row = _context_row(chunk_id, d, m, dist)
+        if row["chunk_id"] not in seen:
+            seen.add(row["chunk_id"])
+            merged.append(row)
+    return merged[:top_k]
+
+
+def retrieve_context(query: str, deal_name: str, top_k: int = TOP_K) -> List[Dict[str, Any]]:
+    collection = get_chroma_collection(deal_name)
+    if collection is None:
+        return []
+    # Manual embedding → avoids auto-embed mismatch (skipped for pure reference lookups)
+    return _search_collection(query, deal_name, collection, lambda: embed_query(query), top_k)
+
+
+def retrieve_context_batch(
+    queries: List[str], deal_name: str, top_k: int = TOP_K
+) -> List[List[Dict[str, Any]]]:
+    """
+    retrieve_context() for many queries against one deal, in query order:
+    one embed call and one multi-vector collection query for all of them
+    (pure reference lookups are answered from the reference index only).
+    """
+    collection = get_chroma_collection(deal_name)
+    if collection is None:
+        return [[] for _ in queries]
+
+    lookups = [lookup_references(q, deal_name, collection, DEFAULT_DB_PATH, top_k) for q in queries]
+    contexts = [exact for exact, _ in lookups]
+
+    pending = [i for i, (_, pure) in enumerate(lookups) if not pure]
+    if pending:
+        results = collection.query(
+            query_embeddings=embed_queries([queries[i] for i in pending]),
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"],
+        )
+        for row, i in enumerate(pending):
+            contexts[i] = _merge_hits(lookups[i][0], results, row, top_k)
+    return contexts
 
 
 # ------------------------------------------------------------
-# PROMPT BUILDER (restores original behavior)
+# FEDERATED RETRIEVAL (explicit deal allow-list)
 # ------------------------------------------------------------
-def build_rag_prompt(query: str, contexts: List[dict], deal_name: str) -> str:
-    ctx = "\n".join([f"[{c['chunk_id']}] {c['content']}" for c in contexts])
+def _is_missing_collection(exc: Exception) -> bool:
+    """Not-found errors of get_chroma_collection (chroma / numpy backends, no index dir)."""
+    if isinstance(exc, FileNotFoundError):
+        return True
+    # Newer chromadb; matched by name so chromadb stays a lazy import
+    if type(exc).__name__ == "InvalidCollectionException":
+        return True
+    return isinstance(exc, ValueError) and "does not exist" in str(exc)
+
 
-    return f"""
-You are a financial contract assistant. Use ONLY the provided context.
+def retrieve_across_deals(
+    query: str, deal_names: List[str], top_k: int = TOP_K
+) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, str]]:
+    """
+    Searches every allowed deal with one query embedding; collections are
+    queried concurrently and merged into a global top_k by distance
+    (exact reference hits, distance 0.0, rank first).
+    Returns (hits tagged with "deal", deals that have no index,
+    deal → error for deals whose search failed). A failing deal is reported,
+    never raised: the other deals still answer.
+    """
+    deal_names = list(dict.fromkeys(deal_names))
+    # Embedded once up front; pure reference lookups only embed if a deal lacks the clause
+    pure = config.REFERENCE_LOOKUP and bool(parse_references(query)) and is_pure_lookup(query)
+    q_vec = None if pure else embed_query(query)
+
+    def vector() -> List[float]:
+        return q_vec if q_vec is not None else embed_query(query)
+
+    def search(deal_name: str):
+        try:
+            collection = get_chroma_collection(deal_name)
+            if collection is None:
+                return deal_name, None, None
+            hits = _search_collection(query, deal_name, collection, vector, top_k)
+        except Exception as exc:
+            if _is_missing_collection(exc):
+                return deal_name, None, None
+            # Corrupt / locked index, load errors... → reported, not "missing"
+            return deal_name, None, f"{type(exc).__name__}: {exc}"
+        return deal_name, [{**h, "deal": deal_name} for h in hits], None
+
+    if len(deal_names) == 1:
+        results = [search(deal_names[0])]
+    else:
+        results = list(_fanout_pool.map(search, deal_names))
+
+    errors = {deal: error for deal, _, error in results if error is not None}
+    missing = [deal for deal, hits, error in results if hits is None and error is None]
+    merged = [hit for _, hits, _ in results if hits for hit in hits]
+    # sorted() is stable: equal distances keep allow-list order
+    return sorted(merged, key=lambda h: h["distance"])[:top_k], missing, errors
+
+
+# ------------------------------------------------------------
+# PROMPT BUILDER (restores original behavior)
+# ------------------------------------------------------------
+# Identical for every query → its KV cache is computed once per model load
+RAG_PROMPT_PREFIX = """You are a financial contract assistant. Use ONLY the provided context.
 
 RULES:
 - If the answer is not present, respond exactly:
@@ -80,7 +304,15 @@ RULES:
 - Citations must reference chunk_ids exactly as shown.
 
 QUESTION:
-{query}
+"""
+
+register_prompt_prefix(RAG_PROMPT_PREFIX)
+
+
+def build_rag_prompt(query: str, contexts: List[dict], deal_name: str) -> str:
+    ctx = "\n".join([f"[{c['chunk_id']}] {c['content']}" for c in contexts])
+
+    return (RAG_PROMPT_PREFIX + f"""{query}
 
 CONTEXT:
 {ctx}
@@ -90,28 +322,148 @@ RESPONSE FORMAT (JSON ONLY):
   "answer": "short answer here",
   "citations": ["chunk_id_1", "chunk_id_2"]
 }}
-""".strip()
+""").strip()
+
+
+# ------------------------------------------------------------
+# CONTEXT PACKING (token budget)
+# ------------------------------------------------------------
+def pack_for_prompt(query: str, contexts: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """
+    Returns (packed, visible):
+      packed  → possibly trimmed chunks for the prompt
+      visible → the original retrieved chunks that made it into the prompt
+                (citations are validated against these ids)
+    """
+    if not config.CONTEXT_PACKING:
+        return contexts, contexts
+
+    packed = pack_contexts(
+        query,
+        contexts,
+        count_tokens,
+        token_budget=config.CONTEXT_TOKEN_BUDGET,
+        max_chunk_tokens=config.CONTEXT_CHUNK_MAX_TOKENS,
+    )
+    kept = {c["chunk_id"] for c in packed}
+    return packed, [c for c in contexts if c["chunk_id"] in kept]
 
 
 # ------------------------------------------------------------
 # MAIN ENTRYPOINT
 # ------------------------------------------------------------
+def _answer_cache_key(query: str, deal_name: str, top_k: int):
+    # Only versioned indexes (built with build_meta) are cacheable
+    version = answer_cache.index_version(deal_name)
+    if version is None:
+        return None
+    models = (hf_embedder.model_id, MODEL_NAME)
+    return AnswerCache.make_key(
+        deal_name, normalize_query(query), top_k, models, version, answer_settings()
+    )
+
+
+def answer_settings() -> Tuple:
+    """
+    Settings that change the returned answer or its sources; part of the
+    answer cache key (the embedding model_id is keyed alongside, in `models`).
+    """
+    return (
+        # Retrieval
+        config.REFERENCE_LOOKUP,
+        config.VECTOR_BACKEND,
+        config.NUMPY_VECTOR_DTYPE,
+        config.NUMPY_RESCORE,
+        config.NUMPY_RESCORE_FACTOR,
+        # Generation
+        config.LLM_PRECISION,
+        config.CONTEXT_PACKING,
+        config.CONTEXT_TOKEN_BUDGET,
+        config.CONTEXT_CHUNK_MAX_TOKENS,
+    )
+
+
 def answer_query(query: str, deal_name: str, top_k: int = TOP_K) -> Dict[str, Any]:
+    key = _answer_cache_key(query, deal_name, top_k)
+    if key is None:
+        return _answer_uncached(query, deal_name, top_k)
+
+    cached = answer_cache.get(deal_name, key)
+    if cached is not None:
+        cached["query"] = query
+        return cached
+
+    result = _answer_uncached(query, deal_name, top_k)
+    answer_cache.put(deal_name, key, result)
+    return result
+
+
+def _answer_uncached(query: str, deal_name: str, top_k: int) -> Dict[str, Any]:
     contexts = retrieve_context(query, deal_name, top_k)
 
     if not contexts:
-        return {
-            "query": query,
-            "deal": deal_name,
-            "answer": "The provided text does not contain enough information.",
-            "citations": [],
-            "retrieved_chunks": [],
-            "sources": [],
-        }
-
-    prompt = build_rag_prompt(query, contexts, deal_name)
+        return _no_context_answer(query, deal_name)
+
+    packed, visible = pack_for_prompt(query, contexts)
+    prompt = build_rag_prompt(query, packed, deal_name)
     raw = generate_response(prompt)
+    return _validated_answer(query, deal_name, visible, raw)
+
+
+def _no_context_answer(query: str, deal_name: str) -> Dict[str, Any]:
+    return {
+        "query": query,
+        "deal": deal_name,
+        "answer": "The provided text does not contain enough information.",
+        "citations": [],
+        "retrieved_chunks": [],
+        "sources": [],
+    }
+
+
+def answer_query_batch(
+    queries: List[str], deal_name: str, top_k: int = TOP_K
+) -> List[Dict[str, Any]]:
+    """
+    answer_query() for many queries against one deal, in query order.
+    Cache misses are retrieved together (retrieve_context_batch) and their
+    prompts handed to the LLM batcher at once.
+    """
+    keys = [_answer_cache_key(q, deal_name, top_k) for q in queries]
+    answers: List[Any] = [None] * len(queries)
+    for i, (query, key) in enumerate(zip(queries, keys)):
+        cached = answer_cache.get(deal_name, key) if key is not None else None
+        if cached is not None:
+            cached["query"] = query
+            answers[i] = cached
+
+    pending = [i for i, a in enumerate(answers) if a is None]
+    if not pending:
+        return answers
+
+    contexts = retrieve_context_batch([queries[i] for i in pending], deal_name, top_k)
+    prompts, prompted = [], []
+    for i, ctx in zip(pending, contexts):
+        if not ctx:
+            answers[i] = _no_context_answer(queries[i], deal_name)
+            continue
+        packed, visible = pack_for_prompt(queries[i], ctx)
+        prompts.append(build_rag_prompt(queries[i], packed, deal_name))
+        prompted.append((i, visible))
 
+    for (i, visible), raw in zip(prompted, generate_responses(prompts)):
+        answers[i] = _validated_answer(queries[i], deal_name, visible, raw)
+
+    for i in pending:
+        if keys[i] is not None:
+            answer_cache.put(deal_name, keys[i], answers[i])
+    return answers
+
+
+def _validated_answer(
+    query: str, deal_name: str, contexts: List[dict], raw: dict
+) -> Dict[str, Any]:
+    """Applies the citation rules to the model's parsed JSON."""
     model_answer = raw.get("answer", "").strip()
     model_citations = raw.get("citations", [])
 
@@ -139,3 +491,67 @@ def answer_query(query: str, deal_name: str, top_k: int = TOP_K) -> Dict[str, An
         "retrieved_chunks": retrieved_ids,
         "sources": contexts,
     }
+
+
+# ------------------------------------------------------------
+# STREAMING ENTRYPOINT (SSE)
+# ------------------------------------------------------------
+def stream_answer(
+    query: str, deal_name: str, top_k: int = TOP_K, cancel: Optional[Event] = None
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Yields (event, payload):
+      "sources" → retrieved chunks, as soon as retrieval finishes
+      "token"   → {"text": ...} pieces of the answer as the model writes them
+      "final"   → same dict as answer_query() (citations validated)
+    The final answer is authoritative: it may replace the streamed text
+    when citations fail validation. Setting `cancel` stops generation.
+    """
+    key = _answer_cache_key(query, deal_name, top_k)
+    cached = answer_cache.get(deal_name, key) if key is not None else None
+    if cached is not None:
+        cached["query"] = query
+        yield "sources", _sources_event(cached, deal_name)
+        yield "token", {"text": cached["answer"]}
+        yield "final", cached
+        return
+
+    contexts = retrieve_context(query, deal_name, top_k)
+    # Sources are the chunks the model will actually see
+    packed, contexts = pack_for_prompt(query, contexts) if contexts else ([], [])
+    yield "sources", _sources_event(
+        {
+            "query": query,
+            "retrieved_chunks": [c["chunk_id"] for c in contexts],
+            "sources": contexts,
+        },
+        deal_name,
+    )
+
+    if not contexts:
+        result = _no_context_answer(query, deal_name)
+        yield "token", {"text": result["answer"]}
+        yield "final", result
+        return
+
+    prompt = build_rag_prompt(query, packed, deal_name)
+    pieces, answer_stream = [], AnswerFieldStreamer()
+    for piece in stream_response(prompt, cancel=cancel):
+        pieces.append(piece)
+        text = answer_stream.feed(piece)
+        if text:
+            yield "token", {"text": text}
+
+    result = _validated_answer(query, deal_name, contexts, parse_response("".join(pieces)))
+    if key is not None:
+        answer_cache.put(deal_name, key, result)
+    yield "final", result
+
+
+def _sources_event(result: Dict[str, Any], deal_name: str) -> dict:
+    return {
+        "query": result["query"],
+        "deal": deal_name,
+        "retrieved_chunks": result.get("retrieved_chunks", []),
+        "sources": result.get("sources", []),
+    }
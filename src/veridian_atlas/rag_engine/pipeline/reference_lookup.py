@@ -0,0 +1,179 @@
+"""
+reference_lookup.py
+-------------------
+Fast path for queries that name a clause or section ("what does 2.1(a) say",
+"Section 4 fees").
+
+ - References parsed from the query: "Section 4", "§ 4", "Clause 2.1(a)", bare
+   "2.1(a)" / "2.1.3"; a bare "2.1" only when the query is nothing but
+   references and filler ("what does 2.1 say"), since "rate of 2.5" is an amount
+ - Resolved against the deal's ReferenceIndex (dict lookups, no embedding)
+ - A clause missing from the deal falls back to its parent ("2.1(c)" → "2.1")
+ - is_pure_lookup(): nothing but references and filler words → vector search
+   (and the embedding model) is skipped entirely
+ - Index files are reloaded when a rebuild rewrites them (mtime check)
+"""
+
+import re
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from veridian_atlas.data_pipeline.processors.reference_index import (
+    ReferenceIndex,
+    clause_key,
+    reference_index_path,
+    section_key,
+)
+
+_NUMBER = r"\d+(?:\.\d+)*(?:\s*\([a-z0-9]{1,4}\))*"
+SECTION_REF = re.compile(rf"(?:\b(?:section|sec\.?)|§)\s*({_NUMBER})", re.IGNORECASE)
+CLAUSE_REF = re.compile(rf"\b(?:clause|cl\.|paragraph|para\.?)\s*({_NUMBER})", re.IGNORECASE)
+# Bare "2.1" / "2.1(a)"; not amounts like "2.5%", "$1.5", "5,50,000.00",
+# "USD 2.5", "2.5 million" or "1.5 percent" (currency / unit words around it)
+_UNIT_WORDS = (
+    r"million|mn|billion|bn|thousand|crores?|lakhs?|lacs?|percent|per\s*cent|pct|bps"
+    r"|basis\s+points?|times|years?|months?|weeks?|days?|hours?"
+    r"|usd|inr|eur|gbp|dollars?|rupees?|euros?|pounds?"
+)
+_CURRENCY_BEFORE = "".join(
+    rf"(?<!{re.escape(code)}\s)" for code in ("usd", "inr", "eur", "gbp", "rs", "rs.", "$", "€")
+)
+BARE_REF = re.compile(
+    rf"(?<![\w.,$€£₹]){_CURRENCY_BEFORE}"
+    r"(\d+\.\d+(?:\.\d+)*(?:\s*\([a-z0-9]{1,4}\))*)"
+    rf"(?![\w%]|\.\d|,\d|\s*(?:{_UNIT_WORDS})\b)",
+    re.IGNORECASE,
+)
+# Bare "2.5" alone is as likely an amount as a clause
+_PLAIN_NUMBER = re.compile(r"\d+\.\d+")
+
+FILLER = {
+    "what", "whats", "does", "do", "did", "say", "says", "said", "state", "states", "show",
+    "me", "the", "text", "of", "in", "is", "are", "full", "read", "give", "get", "find",
+    "contents", "content", "wording", "a", "an", "please", "and", "about", "under", "per",
+    "see", "provision", "provisions", "exact", "quote", "clause", "clauses", "section",
+    "sections", "sec", "cl", "para", "paragraph", "to", "refer", "tell", "us", "from",
+}  # fmt: skip
+
+
+# -----------------------------------------------------
+# QUERY PARSING
+# -----------------------------------------------------
+def parse_references(query: str) -> List[Tuple[str, str]]:
+    """
+    Returns [(kind, key)] in query order, kind ∈ {"section", "clause"}.
+    "Section 4.2" names a clause (4.2 lives in section 4). A bare "2.5"
+    counts only in a pure lookup ("what does 2.5 say", not "rate of 2.5").
+    """
+    found, pure = [], None
+    for pattern, kind in ((SECTION_REF, "section"), (CLAUSE_REF, "clause"), (BARE_REF, "clause")):
+        for match in pattern.finditer(query):
+            number = match.group(1)
+            if pattern is BARE_REF and _PLAIN_NUMBER.fullmatch(number):
+                pure = is_pure_lookup(query) if pure is None else pure
+                if not pure:
+                    continue
+            if kind == "section" and not re.search(r"[.(]", number):
+                key = section_key(number)
+            else:
+                kind, key = "clause", clause_key(number)
+            if key:
+                found.append((match.start(), kind, key))
+
+    refs, seen = [], set()
+    for _, kind, key in sorted(found):
+        if (kind, key) not in seen:
+            seen.add((kind, key))
+            refs.append((kind, key))
+    return refs
+
+
+def is_pure_lookup(query: str) -> bool:
+    """True when the query is only references plus filler ("what does 2.1(a) say?")."""
+    rest = query
+    for pattern in (SECTION_REF, CLAUSE_REF, BARE_REF):
+        rest = pattern.sub(" ", rest)
+    words = re.findall(r"[a-z]+", rest.casefold())
+    return all(w in FILLER for w in words)
+
+
+def resolve(index: ReferenceIndex, refs: List[Tuple[str, str]]) -> List[str]:
+    """chunk_ids for the references, in query order, without duplicates."""
+    chunk_ids = []
+    for kind, key in refs:
+        if kind == "section":
+            ids = index.section(key)
+        else:
+            ids, parts = [], key.split(".")
+            while parts and not ids:
+                ids = index.clause(".".join(parts))
+                parts.pop()
+        chunk_ids.extend(c for c in ids if c not in chunk_ids)
+    return chunk_ids
+
+
+# -----------------------------------------------------
+# PER-DEAL INDEX CACHE
+# -----------------------------------------------------
+class ReferenceIndexStore:
+    def __init__(self):
+        self._lock = Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[float], ReferenceIndex]] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.pure = 0
+
+    def get(self, deal_name: str, db_path: Path, collection=None) -> Optional[ReferenceIndex]:
+        """
+        The deal's index file (reloaded when its mtime changes). Without a file,
+        the index is rebuilt once from the collection's metadata.
+        """
+        path = reference_index_path(db_path, deal_name)
+        key = (str(Path(db_path).resolve()), deal_name)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        if mtime is not None:
+            index = ReferenceIndex.load(path)
+        elif collection is not None:
+            stored = collection.get(include=["metadatas"])
+            index = ReferenceIndex.from_metadatas(stored["ids"], stored["metadatas"])
+        else:
+            return None
+
+        if index is not None:
+            with self._lock:
+                self._entries[key] = (mtime, index)
+        return index
+
+    def invalidate(self, deal_name: Optional[str] = None):
+        with self._lock:
+            for key in list(self._entries):
+                if deal_name is None or key[1] == deal_name:
+                    del self._entries[key]
+
+    def record(self, hit: bool, pure: bool):
+        with self._lock:
+            self.lookups += 1
+            self.hits += hit
+            self.pure += pure
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "deals": len(self._entries),
+                "queries_with_references": self.lookups,
+                "resolved": self.hits,
+                "embedding_skipped": self.pure,
+            }
+
+
+reference_indexes = ReferenceIndexStore()
@@ -0,0 +1,132 @@
+"""
+answer_cache.py
+---------------
+Index-version-aware cache for answer_query results.
+
+Key = deal + normalized query + top_k + model ids + index_version +
+generation settings (LLM precision, context packing budget), where
+index_version comes from the deal's build metadata (source file hashes).
+A rebuild that changes the sources changes the version, which drops the
+deal's old entries from memory and from the optional disk tier.
+"""
+
+import copy
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from veridian_atlas.data_pipeline.processors.index_builder import build_meta_path
+from veridian_atlas.utils.cache import LRUCache
+from veridian_atlas.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        db_path: Path,
+        maxsize: int = 256,
+        ttl: Optional[float] = None,
+        disk_dir: Optional[Path] = None,
+    ):
+        self.db_path = Path(db_path)
+        self.ttl = ttl or None
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory = LRUCache(maxsize=maxsize, ttl=self.ttl)
+        self._versions: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._lock = Lock()
+
+    # ---------------------------------------------------------
+    # Index version (cached per build_meta mtime)
+    # ---------------------------------------------------------
+    def index_version(self, deal_name: str) -> Optional[str]:
+        path = build_meta_path(self.db_path, deal_name)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            seen = self._versions.get(deal_name)
+            if seen and seen[0] == mtime:
+                return seen[1]
+
+        try:
+            version = json.loads(path.read_text(encoding="utf-8")).get("index_version")
+        except (OSError, json.JSONDecodeError):
+            version = None
+
+        with self._lock:
+            previous = self._versions.get(deal_name)
+            self._versions[deal_name] = (mtime, version)
+
+        if previous and previous[1] != version:
+            logger.info(f"[ANSWER CACHE] Index changed for {deal_name}; dropping old entries")
+            self.invalidate_deal(deal_name)
+        return version
+
+    @staticmethod
+    def make_key(
+        deal_name: str,
+        query: str,
+        top_k: int,
+        models: Tuple[str, ...],
+        version: str,
+        settings: Tuple = (),
+    ):
+        raw = json.dumps([deal_name, query, top_k, list(models), version, list(settings)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------------------------------------------------------
+    # Lookup / store
+    # ---------------------------------------------------------
+    def get(self, deal_name: str, key: str) -> Optional[Dict[str, Any]]:
+        hit = self._memory.get((deal_name, key))
+        if hit is not None:
+            return copy.deepcopy(hit)
+
+        if self.disk_dir is None:
+            return None
+
+        path = self._disk_path(deal_name, key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self.ttl is not None and time.time() - entry["created_at"] > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        self._memory.put((deal_name, key), entry["value"])
+        return copy.deepcopy(entry["value"])
+
+    def put(self, deal_name: str, key: str, value: Dict[str, Any]) -> None:
+        self._memory.put((deal_name, key), copy.deepcopy(value))
+        if self.disk_dir is None:
+            return
+
+        path = self._disk_path(deal_name, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"created_at": time.time(), "value": value}), "utf-8")
+            tmp.replace(path)
+        except (OSError, TypeError) as exc:
+            logger.warning(f"[ANSWER CACHE] Disk write skipped: {exc}")
+
+    def invalidate_deal(self, deal_name: str) -> None:
+        self._memory.evict_matching(lambda k: k[0] == deal_name)
+        if self.disk_dir is not None:
+            shutil.rmtree(self.disk_dir / deal_name, ignore_errors=True)
+
+    def stats(self) -> dict:
+        return {**self._memory.stats(), "disk_dir": str(self.disk_dir) if self.disk_dir else None}
+
+    def _disk_path(self, deal_name: str, key: str) -> Path:
+        return self.disk_dir / deal_name / f"{key}.json"
@@ -0,0 +1,174 @@
+"""
+deal_catalog.py
+---------------
+In-process catalog of deals for the /deals endpoints (sidebar polling).
+
+ - Built once from DEALS_DIR (package path, not the working directory)
+ - Per deal: raw / processed documents, chunk count, index status from the
+   deal's build_meta (indexed, index_version, model, built_at)
+ - Change detection: a generation signature of directory / file mtimes
+   (deals dir, each deal's raw/ and processed/, chunks.jsonl, build_meta);
+   only deals whose signature changed are rescanned
+ - Signatures are re-checked at most every VA_DEAL_CATALOG_CHECK_SECONDS,
+   so polling in between is served from memory without touching the disk
+"""
+
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from veridian_atlas.core import config
+from veridian_atlas.core.constants import DEALS_DIR, INDEXES_DIR
+from veridian_atlas.data_pipeline.processors.index_builder import (
+    build_meta_path,
+    read_build_meta,
+)
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _names(path: Path) -> List[str]:
+    try:
+        return sorted(entry.name for entry in os.scandir(path))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _count_lines(path: Path) -> int:
+    count = 0
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                count += block.count(b"\n")
+    except FileNotFoundError:
+        return 0
+    return count
+
+
+class DealCatalog:
+    def __init__(
+        self,
+        deals_dir: Path = DEALS_DIR,
+        db_path: Path = INDEXES_DIR / "chroma_db",
+        check_interval: float = config.DEAL_CATALOG_CHECK_SECONDS,
+    ):
+        self.deals_dir = Path(deals_dir)
+        self.db_path = Path(db_path)
+        self.check_interval = check_interval
+        self._lock = Lock()
+        self._root_mtime: Optional[int] = None
+        self._signatures: Dict[str, Tuple] = {}
+        self._deals: Dict[str, Dict[str, Any]] = {}
+        self._checked_at = float("-inf")
+        self.generation = 0
+        self.refreshes = 0
+        self.deal_scans = 0
+
+    # -------------------------------------------------
+    # Change detection
+    # -------------------------------------------------
+    def _signature(self, deal_id: str) -> Tuple:
+        base = self.deals_dir / deal_id
+        return (
+            _mtime(base),
+            _mtime(base / "raw"),
+            _mtime(base / "processed"),
+            _mtime(base / "processed" / "chunks.jsonl"),
+            _mtime(build_meta_path(self.db_path, deal_id)),
+        )
+
+    def _scan_deal(self, deal_id: str) -> Dict[str, Any]:
+        base = self.deals_dir / deal_id
+        raw, processed = base / "raw", base / "processed"
+        chunks = processed / "chunks.jsonl"
+        meta = read_build_meta(self.db_path, deal_id) or {}
+        raw_documents = _names(raw)
+        self.deal_scans += 1
+        return {
+            "deal_id": deal_id,
+            "raw_documents": raw_documents,
+            "processed_documents": _names(processed),
+            "document_count": len(raw_documents),
+            "chunk_count": _count_lines(chunks),
+            "index": {
+                "indexed": bool(meta),
+                "index_version": meta.get("index_version"),
+                "model_name": meta.get("model_name"),
+                "chunk_count": meta.get("chunk_count"),
+                "built_at": meta.get("built_at"),
+            },
+            "paths": {
+                "raw_dir": str(raw),
+                "processed_chunks_file": str(chunks),
+                "raw_exists": raw.is_dir(),
+                "chunks_exists": chunks.is_file(),
+                "embeddings_exists": bool(meta),
+            },
+        }
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescans deals whose signature changed. Returns True if anything did."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+
+            root_mtime = _mtime(self.deals_dir)
+            if root_mtime is None:
+                deal_ids = []
+            elif root_mtime == self._root_mtime and not force:
+                deal_ids = list(self._deals)
+            else:
+                deal_ids = sorted(
+                    entry.name for entry in os.scandir(self.deals_dir) if entry.is_dir()
+                )
+
+            changed = root_mtime != self._root_mtime or set(deal_ids) != set(self._deals)
+            signatures, deals = {}, {}
+            for deal_id in deal_ids:
+                signatures[deal_id] = self._signature(deal_id)
+                if not force and self._signatures.get(deal_id) == signatures[deal_id]:
+                    deals[deal_id] = self._deals[deal_id]
+                else:
+                    deals[deal_id] = self._scan_deal(deal_id)
+                    changed = True
+
+            self._root_mtime, self._signatures, self._deals = root_mtime, signatures, deals
+            self.refreshes += 1
+            if changed:
+                self.generation += 1
+            return changed
+
+    # -------------------------------------------------
+    # Reads (served from memory)
+    # -------------------------------------------------
+    def deal_ids(self) -> List[str]:
+        self.refresh()
+        with self._lock:
+            return list(self._deals)
+
+    def get(self, deal_id: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            return self._deals.get(deal_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "deals": len(self._deals),
+                "generation": self.generation,
+                "refresh_checks": self.refreshes,
+                "deal_scans": self.deal_scans,
+                "check_interval_s": self.check_interval,
+            }
+
+
+deal_catalog = DealCatalog()
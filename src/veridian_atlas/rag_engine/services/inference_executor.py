@@ -0,0 +1,142 @@
+"""
+inference_executor.py
+---------------------
+Dedicated, size-limited executor for model work (query embedding + generation).
+
+ - max_workers threads run model calls; Starlette's default threadpool
+   stays free for light routes (/health, /deals, /chunk)
+ - At most max_queue calls wait for a worker; beyond that submit() raises
+   ServiceOverloaded immediately (API → 503 + Retry-After)
+ - A call that waited longer than queue_timeout is dropped before it runs
+ - Queue depth, wait and service times exposed via stats() (/health)
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from veridian_atlas.core import config
+
+
+class ServiceOverloaded(Exception):
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    def __init__(self, max_workers: int = 4, max_queue: int = 16, queue_timeout: float = 30.0):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._service_total = 0.0
+        self._started = 0
+
+    # ---------------------------------------------------------
+    # Admission
+    # ---------------------------------------------------------
+    def retry_after(self) -> int:
+        """Seconds until a worker is likely free, from the average service time."""
+        with self._lock:
+            finished = self.completed + self.failed
+            avg_service = self._service_total / finished if finished else 1.0
+            backlog = self.queued + self.running
+        return max(1, math.ceil(avg_service * backlog / self.max_workers))
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            if self.running + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                overloaded = True
+            else:
+                self.queued += 1
+                overloaded = False
+
+        if overloaded:
+            raise ServiceOverloaded(
+                "Inference capacity exhausted, retry later.", retry_after=self.retry_after()
+            )
+
+        enqueued_at = time.monotonic()
+        return self._pool.submit(self._run, enqueued_at, fn, args, kwargs)
+
+    def _run(self, enqueued_at: float, fn: Callable, args, kwargs):
+        waited = time.monotonic() - enqueued_at
+        with self._lock:
+            self.queued -= 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._started += 1
+            if self.queue_timeout and waited > self.queue_timeout:
+                self.timed_out += 1
+                expired = True
+            else:
+                self.running += 1
+                expired = False
+
+        if expired:
+            raise ServiceOverloaded(
+                f"Queued {waited:.1f}s without a free worker.", retry_after=self.retry_after()
+            )
+
+        start = time.monotonic()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+                self._service_total += time.monotonic() - start
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    # ---------------------------------------------------------
+    # Monitoring
+    # ---------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "max_queue": self.max_queue,
+                "queue_timeout_s": self.queue_timeout,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_wait_ms": (
+                    round(1000 * self._wait_total / self._started, 2) if self._started else 0.0
+                ),
+                "max_wait_ms": round(1000 * self._wait_max, 2),
+                "avg_service_ms": (
+                    round(1000 * self._service_total / finished, 2) if finished else 0.0
+                ),
+            }
+
+
+inference_executor = InferenceExecutor(
+    max_workers=config.INFERENCE_WORKERS,
+    max_queue=config.INFERENCE_QUEUE_SIZE,
+    queue_timeout=config.INFERENCE_QUEUE_TIMEOUT,
+)
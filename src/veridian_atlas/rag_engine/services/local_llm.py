@@ -3,16 +3,46 @@ local_llm.py
 ------------
 Local Qwen wrapper for 0.5B instruct model optimized for GTX 1060 or CPU.
 Ensures deterministic output with correct JSON extraction.
+
+CPU nodes can run int8 dynamically-quantized (or bf16) linears via
+VA_LLM_PRECISION, with torch threads sized to the host (VA_LLM_THREADS).
+
+torch / transformers are imported on first get_qwen() call only.
+
+Concurrent generate_response() calls are micro-batched: prompts arriving
+within VA_LLM_MAX_WAIT_MS are left-padded into one model.generate call
+(up to VA_LLM_MAX_BATCH prompts), and each caller gets its own parsed JSON.
+
+stream_response() yields decoded text pieces as tokens are generated (SSE /ask).
+
+Prompts starting with a registered prefix (the RAG instructions) reuse its
+precomputed KV cache, so only the per-query tail is prefilled. Single-prompt
+calls and streams use it; left-padded batches prefill in full.
 """
 
-import torch
 import re
 import json
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from threading import Event, Lock, Thread
+from typing import Iterator, List, Optional, Tuple
+
+from veridian_atlas.core import config
+from veridian_atlas.rag_engine.services.prefix_cache import PrefixKVCache
+from veridian_atlas.utils.batching import MicroBatcher
 
 _MODEL = None
 _TOKENIZER = None
+_model_lock = Lock()
 MODEL_NAME = "Qwen/Qwen2.5-0.5B-Instruct"
+LLM_PRECISIONS = ("auto", "fp32", "fp16", "bf16", "int8")
+# Filled by get_qwen(): resolved precision, CPU threads, load time (/health)
+llm_runtime: dict = {}
+
+prompt_prefix_cache = PrefixKVCache(enabled=config.LLM_PREFIX_CACHE)
+
+
+def register_prompt_prefix(prefix: str):
+    """Fixed leading prompt text whose KV cache is computed once and reused."""
+    prompt_prefix_cache.register(prefix)
 
 
 def _extract_json(text: str):
@@ -24,48 +54,240 @@ def _extract_json(text: str):
     return match.group(0).strip() if match else text.strip()
 
 
+class AnswerFieldStreamer:
+    """
+    Incrementally pulls the "answer" string value out of streamed JSON text,
+    so clients see the answer itself rather than raw JSON syntax.
+    feed() returns the newly decoded answer characters (possibly "").
+    """
+
+    _START = re.compile(r'"answer"\s*:\s*"')
+    _ESCAPES = {"n": "\n", "t": "\t", '"': '"', "\\": "\\", "/": "/"}
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self.done = False
+
+    def feed(self, piece: str) -> str:
+        if self.done:
+            return ""
+        self._buffer += piece
+
+        if self._pos is None:
+            match = self._START.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        out = []
+        buf = self._buffer
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if ch == "\\":
+                # Wait for the escaped character (\uXXXX needs all four digits)
+                if self._pos + 1 >= len(buf):
+                    break
+                nxt = buf[self._pos + 1]
+                if nxt == "u":
+                    if self._pos + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[self._pos + 2 : self._pos + 6], 16)))
+                    except ValueError:
+                        pass
+                    self._pos += 6
+                    continue
+                out.append(self._ESCAPES.get(nxt, nxt))
+                self._pos += 2
+                continue
+            if ch == '"':
+                self.done = True
+                break
+            out.append(ch)
+            self._pos += 1
+        return "".join(out)
+
+
+def get_tokenizer():
+    """
+    Tokenizer only (no weights) – enough for token accounting before generation.
+    """
+    global _TOKENIZER
+    if _TOKENIZER is None:
+        from transformers import AutoTokenizer
+
+        _TOKENIZER = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+    return _TOKENIZER
+
+
+def count_tokens(text: str) -> int:
+    return len(get_tokenizer()(text, add_special_tokens=False)["input_ids"])
+
+
+def configure_cpu_threads(threads: int = 0) -> int:
+    """
+    Sets torch intra-op threads (0 = one per core available to this process).
+    Inter-op parallelism is pinned to 1: generate() is a sequential loop.
+    """
+    import os
+
+    import torch
+
+    if threads <= 0:
+        try:
+            threads = len(os.sched_getaffinity(0))
+        except AttributeError:  # macOS / Windows
+            threads = os.cpu_count() or 1
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # only settable before the first parallel op
+    return threads
+
+
+def resolve_precision(precision: str, use_gpu: bool) -> str:
+    """
+    auto → fp16 on CUDA, fp32 on CPU. fp16 without CUDA falls back to fp32
+    (half-precision matmuls on CPU are slow or unsupported). int8 is CPU-only.
+    """
+    if precision not in LLM_PRECISIONS:
+        raise ValueError(
+            f"Unknown VA_LLM_PRECISION: {precision} (expected one of {LLM_PRECISIONS})"
+        )
+    if precision == "auto":
+        return "fp16" if use_gpu else "fp32"
+    if precision == "fp16" and not use_gpu:
+        print("[WARN] VA_LLM_PRECISION=fp16 needs CUDA, none available → using fp32")
+        return "fp32"
+    return precision
+
+
+def resolve_device(precision: str, use_gpu: bool) -> str:
+    """CUDA whenever it is available, except int8 (dynamic quantization runs on CPU)."""
+    return "cuda" if use_gpu and precision != "int8" else "cpu"
+
+
+def apply_precision(model, precision: str):
+    """
+    int8: dynamic quantization of every nn.Linear (weights int8, activations
+          quantized per batch) – ~4x smaller linears, faster matmuls on CPU.
+    bf16: bfloat16 weights (CPUs with AVX512-BF16 / AMX).
+    """
+    import torch
+
+    if precision == "int8":
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if precision == "bf16":
+        return model.to(torch.bfloat16)
+    return model
+
+
+def _json_self_check(model, tokenizer) -> bool:
+    """Low-precision weights must still produce parseable JSON answers."""
+    prompt = (
+        "Respond in pure JSON only.\n"
+        'RESPONSE FORMAT: {"answer": "short answer here", "citations": []}\n'
+        "QUESTION: What is 2 + 2?"
+    )
+    inputs = tokenizer(prompt, return_tensors="pt").to(next(model.parameters()).device)
+    output = model.generate(**inputs, **_generation_kwargs(tokenizer, 48))
+    text = tokenizer.decode(output[0, inputs["input_ids"].shape[1] :], skip_special_tokens=True)
+    try:
+        return isinstance(json.loads(_extract_json(text)), dict)
+    except json.JSONDecodeError:
+        return False
+
+
 def get_qwen():
     """
     Singleton load – prevents repeatedly reloading the model.
+    Precision / threads come from VA_LLM_PRECISION / VA_LLM_THREADS.
     """
     global _MODEL, _TOKENIZER
     if _MODEL is not None and _TOKENIZER is not None:
         return _MODEL, _TOKENIZER
 
-    use_gpu = torch.cuda.is_available()
-    device = torch.device("cuda" if use_gpu else "cpu")
-    dtype = torch.float16 if use_gpu else torch.float32
+    with _model_lock:
+        if _MODEL is not None:
+            return _MODEL, _TOKENIZER
 
-    print(f"[LLM] Loading Qwen-0.5B → {device}")
+        import time
 
-    _TOKENIZER = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
+        import torch
+        from transformers import AutoModelForCausalLM
 
-    _MODEL = AutoModelForCausalLM.from_pretrained(
-        MODEL_NAME, torch_dtype=dtype, trust_remote_code=True
-    ).to(device)
+        start = time.perf_counter()
+        cuda = torch.cuda.is_available()
+        precision = resolve_precision(config.LLM_PRECISION, cuda)
+        device = torch.device(resolve_device(precision, cuda))
+        use_gpu = device.type == "cuda"
+        dtype = torch.float16 if precision == "fp16" else torch.float32
 
-    if use_gpu:
-        print(f"[GPU READY] {torch.cuda.get_device_name(0)}")
-        print(f"[VRAM USED] {torch.cuda.memory_allocated()/1024**2:.2f} MB\n")
-    else:
-        print("[CPU MODE] Running slower but stable.\n")
+        print(f"[LLM] Loading Qwen-0.5B → {device} ({precision})")
+        threads = None
+        if not use_gpu:
+            threads = configure_cpu_threads(config.LLM_THREADS)
+            print(f"[LLM] CPU threads: {threads}")
 
-    return _MODEL, _TOKENIZER
+        tokenizer = get_tokenizer()
 
+        model = AutoModelForCausalLM.from_pretrained(
+            MODEL_NAME, torch_dtype=dtype, trust_remote_code=True
+        ).to(device)
+        model = apply_precision(model.eval(), precision)
 
-def generate_response(prompt: str, max_tokens: int = 256) -> dict:
-    """
-    Deterministic generation – no sampling noise.
-    Returns parsed JSON or a fallback dict.
-    """
-    model, tokenizer = get_qwen()
-    device = next(model.parameters()).device
+        self_check = None
+        if precision in ("int8", "bf16") and config.LLM_SELF_CHECK:
+            self_check = _json_self_check(model, tokenizer)
+            if self_check:
+                print(f"[LLM] {precision} JSON self-check passed")
+            else:
+                print(
+                    f"[WARN] {precision} output failed the JSON self-check; "
+                    "consider VA_LLM_PRECISION=fp32"
+                )
 
-    inputs = tokenizer(prompt, return_tensors="pt").to(device)
+        # KV caches belong to the weights they were computed with
+        prompt_prefix_cache.clear()
+        _MODEL = model
+        llm_runtime.update(
+            {
+                "precision": precision,
+                "device": str(device),
+                "threads": threads,
+                "json_self_check": self_check,
+                "load_seconds": round(time.perf_counter() - start, 2),
+            }
+        )
 
-    output = model.generate(
-        **inputs,
-        max_new_tokens=max_tokens,
+        if use_gpu:
+            print(f"[GPU READY] {torch.cuda.get_device_name(0)}")
+            print(f"[VRAM USED] {torch.cuda.memory_allocated()/1024**2:.2f} MB\n")
+        else:
+            print(f"[CPU MODE] {precision} weights.\n")
+
+        return _MODEL, _TOKENIZER
+
+
+def parse_response(text: str) -> dict:
+    extracted = _extract_json(text)
+
+    # Try to parse JSON safely
+    try:
+        return json.loads(extracted)
+    except json.JSONDecodeError:
+        return {"answer": "The model did not return valid JSON.", "citations": []}
+
+
+_stats_lock = Lock()
+generation_stats = {"generated_tokens": 0, "generate_calls": 0}
+
+
+def _generation_kwargs(tokenizer, max_new_tokens: int) -> dict:
+    return dict(
+        max_new_tokens=max_new_tokens,
         do_sample=False,  # Ensures reproducible output
         temperature=None,
         top_k=None,
@@ -75,16 +297,184 @@ def generate_response(prompt: str, max_tokens: int = 256) -> dict:
         eos_token_id=tokenizer.eos_token_id,
     )
 
-    text = tokenizer.decode(output[0], skip_special_tokens=True)
 
-    # Remove prompt echo if the model repeats input
-    if prompt in text:
-        text = text.replace(prompt, "").strip()
+def _prefix_kwargs(model, tokenizer, prompt: str, inputs) -> dict:
+    past = prompt_prefix_cache.lookup(model, tokenizer, prompt, inputs["input_ids"])
+    return {} if past is None else {"past_key_values": past}
 
-    extracted = _extract_json(text)
 
-    # Try to parse JSON safely
+def _generate_single(prompt: str, max_tokens: int) -> Tuple[str, int]:
+    """Unpadded generation for one prompt, reusing the prefix KV cache when it applies."""
+    model, tokenizer = get_qwen()
+    device = next(model.parameters()).device
+
+    inputs = tokenizer(prompt, return_tensors="pt").to(device)
+    prompt_len = inputs["input_ids"].shape[1]
+
+    output = model.generate(
+        **inputs,
+        **_generation_kwargs(tokenizer, max_tokens),
+        **_prefix_kwargs(model, tokenizer, prompt, inputs),
+    )
+
+    new_tokens = output[0, prompt_len:]
+    generated = int((new_tokens != tokenizer.eos_token_id).sum())
+    return tokenizer.decode(new_tokens, skip_special_tokens=True), generated
+
+
+def _generate_batch(items: List[Tuple[str, int]]) -> List[dict]:
+    """
+    One model.generate call for several (prompt, max_tokens) requests.
+    Prompts are left-padded so every row ends at the same position and
+    generation continues straight from each prompt. Decoding is greedy, so
+    running to the largest max_tokens and truncating per row gives each
+    caller the same output as a solo call, up to numerical differences
+    (padding and batch shape can change low-order bits of the logits, which
+    may flip a near-tie between tokens).
+    """
+    if len(items) == 1:
+        text, generated = _generate_single(*items[0])
+        with _stats_lock:
+            generation_stats["generated_tokens"] += generated
+            generation_stats["generate_calls"] += 1
+        return [parse_response(text)]
+
+    model, tokenizer = get_qwen()
+    device = next(model.parameters()).device
+    prompts = [prompt for prompt, _ in items]
+
+    # Shared tokenizer: left padding for this call only (no per-call option in
+    # transformers 4.41); unpadded calls elsewhere are unaffected either way
+    padding_side, tokenizer.padding_side = tokenizer.padding_side, "left"
     try:
-        return json.loads(extracted)
-    except json.JSONDecodeError:
-        return {"answer": "The model did not return valid JSON.", "citations": []}
+        inputs = tokenizer(prompts, return_tensors="pt", padding=True).to(device)
+    finally:
+        tokenizer.padding_side = padding_side
+    prompt_len = inputs["input_ids"].shape[1]
+
+    output = model.generate(
+        **inputs, **_generation_kwargs(tokenizer, max(max_tokens for _, max_tokens in items))
+    )
+
+    results, generated = [], 0
+    for row, (_, max_tokens) in zip(output, items):
+        # Only the new tokens: the prompt never echoes into the parsed text
+        new_tokens = row[prompt_len : prompt_len + max_tokens]
+        generated += int((new_tokens != tokenizer.eos_token_id).sum())
+        text = tokenizer.decode(new_tokens, skip_special_tokens=True)
+        results.append(parse_response(text))
+
+    with _stats_lock:
+        generation_stats["generated_tokens"] += generated
+        generation_stats["generate_calls"] += 1
+    return results
+
+
+llm_batcher = MicroBatcher(
+    _generate_batch,
+    max_batch_size=config.LLM_MAX_BATCH_SIZE,
+    max_wait_ms=config.LLM_MAX_WAIT_MS,
+    name="llm-batcher",
+)
+
+
+def generate_response(prompt: str, max_tokens: int = 256) -> dict:
+    """
+    Deterministic generation – no sampling noise.
+    Returns parsed JSON or a fallback dict.
+    Blocks until the batch containing this prompt has been generated.
+    """
+    return llm_batcher.submit((prompt, max_tokens))
+
+
+def generate_responses(prompts: List[str], max_tokens: int = 256) -> List[dict]:
+    """
+    generate_response() for many prompts: queued together so the batcher runs
+    them VA_LLM_MAX_BATCH at a time. Results are in prompt order.
+    """
+    return llm_batcher.submit_many([(prompt, max_tokens) for prompt in prompts])
+
+
+def _stop_when(*events: Event):
+    """StoppingCriteriaList that ends generate at the next token once any event is set."""
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class EventStop(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            done = any(event.is_set() for event in events)
+            return torch.full(
+                (input_ids.shape[0],), done, dtype=torch.bool, device=input_ids.device
+            )
+
+    return StoppingCriteriaList([EventStop()])
+
+
+def stream_response(
+    prompt: str, max_tokens: int = 256, cancel: Optional[Event] = None
+) -> Iterator[str]:
+    """
+    Same greedy decoding as generate_response(), yielding text as it is generated.
+    Streams run outside the micro-batcher: each one owns its generate call.
+    A generate failure ends the stream and is re-raised to the consumer; a
+    generate call that produces nothing for VA_LLM_STREAM_TIMEOUT seconds
+    raises TimeoutError instead of blocking the consumer forever.
+    Setting `cancel`, closing this generator or a timeout stops generate at
+    its next token, so an abandoned stream does not run on to max_tokens.
+    """
+    from queue import Empty
+
+    from transformers import TextIteratorStreamer
+
+    model, tokenizer = get_qwen()
+    device = next(model.parameters()).device
+
+    inputs = tokenizer(prompt, return_tensors="pt").to(device)
+    prompt_len = inputs["input_ids"].shape[1]
+    streamer = TextIteratorStreamer(
+        tokenizer,
+        skip_prompt=True,
+        skip_special_tokens=True,
+        timeout=config.LLM_STREAM_TIMEOUT,
+    )
+    stop = Event()
+    outcome = {}
+
+    def run():
+        try:
+            outcome["output"] = model.generate(
+                **inputs,
+                **_generation_kwargs(tokenizer, max_tokens),
+                **_prefix_kwargs(model, tokenizer, prompt, inputs),
+                streamer=streamer,
+                stopping_criteria=_stop_when(stop, *([cancel] if cancel else [])),
+            )
+        except BaseException as exc:
+            outcome["error"] = exc
+        finally:
+            # Unblocks the consumer even when generate raised before finishing
+            streamer.end()
+
+    worker = Thread(target=run, daemon=True)
+    worker.start()
+    timed_out = False
+    try:
+        for piece in streamer:
+            yield piece
+    except Empty:
+        timed_out = True
+        raise TimeoutError(f"[LLM] No tokens generated for {config.LLM_STREAM_TIMEOUT}s") from None
+    finally:
+        stop.set()
+        # After a timeout the current step may itself be stuck: the worker
+        # exits at its next token, nobody waits for it
+        if not timed_out:
+            worker.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+
+    new_tokens = outcome["output"][0, prompt_len:]
+    with _stats_lock:
+        generation_stats["generated_tokens"] += int((new_tokens != tokenizer.eos_token_id).sum())
+        generation_stats["generate_calls"] += 1
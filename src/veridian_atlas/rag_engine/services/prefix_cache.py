@@ -0,0 +1,100 @@
+"""
+prefix_cache.py
+---------------
+Reusable attention KV cache for fixed prompt prefixes (e.g. the RAG instructions).
+
+ - Prefixes are registered as text at import time (no model needed)
+ - The KV cache for a prefix is prefilled once per model load, on first use
+ - A prompt only reuses it when its token ids really start with the prefix ids
+   (tokenizer merges across the boundary → silent fallback to a full prefill)
+ - Each generation gets its own copy, so the shared cache is never extended
+ - Single-prompt generation only (solo calls and streams): micro-batched
+   prompts are left-padded, so the prefix sits at a different offset in
+   every row and the batched path always prefills in full
+ - Counters are updated under the lock (lookups run on several threads)
+"""
+
+import copy
+from threading import Lock
+from typing import Dict, List, Optional
+
+
+class PrefixKVCache:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._prefixes: List[str] = []
+        self._entries: Dict[str, tuple] = {}
+        self._model_id: Optional[int] = None
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.token_mismatches = 0
+        self.reused_tokens = 0
+
+    def register(self, prefix: str):
+        with self._lock:
+            if prefix and prefix not in self._prefixes:
+                self._prefixes.append(prefix)
+                # Longest first, so nested prefixes pick the most specific one
+                self._prefixes.sort(key=len, reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._model_id = None
+
+    def _prefill(self, model, tokenizer, prefix: str) -> tuple:
+        import torch
+        from transformers import DynamicCache
+
+        device = next(model.parameters()).device
+        prefix_ids = tokenizer(prefix, return_tensors="pt")["input_ids"].to(device)
+        with torch.no_grad():
+            out = model(input_ids=prefix_ids, past_key_values=DynamicCache(), use_cache=True)
+        return prefix_ids[0], out.past_key_values
+
+    def lookup(self, model, tokenizer, prompt: str, input_ids):
+        """
+        Returns a private copy of the prefix KV cache for input_ids (shape 1 × n),
+        or None when no registered prefix applies.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            prefix = next((p for p in self._prefixes if prompt.startswith(p)), None)
+            if prefix is None:
+                self.misses += 1
+                return None
+
+            if self._model_id != id(model):
+                self._entries.clear()
+                self._model_id = id(model)
+            entry = self._entries.get(prefix)
+            if entry is None:
+                entry = self._prefill(model, tokenizer, prefix)
+                self._entries[prefix] = entry
+
+        prefix_ids, past = entry
+        n = prefix_ids.shape[0]
+        # At least one prompt token must remain for the model to process
+        if input_ids.shape[1] <= n or not bool((input_ids[0, :n] == prefix_ids).all()):
+            with self._lock:
+                self.token_mismatches += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.reused_tokens += n
+        return copy.deepcopy(past)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "prefixes": len(self._prefixes),
+                "prefilled": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "token_mismatches": self.token_mismatches,
+                "reused_tokens": self.reused_tokens,
+            }
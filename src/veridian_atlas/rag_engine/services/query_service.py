@@ -1,7 +1,33 @@
 # veridian_atlas/rag/query_service.py
+import sys
 from typing import Dict, Any
-import torch
-from veridian_atlas.rag_engine.pipeline.rag_engine import answer_query, get_chroma_collection
+from veridian_atlas.core import config
+from veridian_atlas.rag_engine.pipeline.rag_engine import (
+    answer_cache,
+    answer_query,
+    get_chroma_collection,
+    query_embedding_cache,
+)
+from veridian_atlas.rag_engine.pipeline.chunk_lookup import chunk_lookup
+from veridian_atlas.rag_engine.pipeline.reference_lookup import reference_indexes
+from veridian_atlas.rag_engine.services.deal_catalog import deal_catalog
+from veridian_atlas.rag_engine.services.inference_executor import inference_executor
+from veridian_atlas.rag_engine.services.local_llm import (
+    generation_stats,
+    llm_batcher,
+    llm_runtime,
+    prompt_prefix_cache,
+)
+
+
+def _loaded_device() -> str:
+    """
+    Reports the torch device without forcing a torch import on /health.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return "not loaded"
+    return "cuda" if torch.cuda.is_available() else "cpu"
 
 
 class QueryService:
@@ -34,6 +60,17 @@ class QueryService:
         return {
             "status": "ok",
             "database_connected": db_status,
-            "device": "cuda" if torch.cuda.is_available() else "cpu",
+            "device": _loaded_device(),
             "deal_check": deal_id or "not provided",
+            "caches": {
+                "query_embeddings": query_embedding_cache.stats(),
+                "answers": answer_cache.stats(),
+                "reference_index": reference_indexes.stats(),
+                "chunk_lookup": chunk_lookup.stats(),
+                "deal_catalog": deal_catalog.stats(),
+            },
+            "llm": dict(llm_runtime) or {"precision": config.LLM_PRECISION, "loaded": False},
+            "llm_batching": {**llm_batcher.stats(), **generation_stats},
+            "llm_prefix_cache": prompt_prefix_cache.stats(),
+            "inference": inference_executor.stats(),
         }
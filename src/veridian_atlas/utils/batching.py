@@ -0,0 +1,153 @@
+"""
+batching.py
+-----------
+Dynamic micro-batcher: coalesces concurrent blocking calls into one batch call.
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=5)
+    result = batcher.submit(item)   # blocks; run_batch sees up to 8 items
+    results = batcher.submit_many(items)  # bulk callers: queued together, in order
+
+ - The first waiting item opens a window of max_wait_ms; the batch is
+   dispatched when the window closes or max_batch_size items are queued
+ - run_batch(items) must return one result per item, in order
+ - A failing batch raises the same exception in every caller of that batch
+ - One worker thread, started on first submit
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+
+class _Pending:
+    __slots__ = ("item", "done", "result", "error")
+
+    def __init__(self, item):
+        self.item = item
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: "deque[_Pending]" = deque()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+
+    def submit(self, item) -> Any:
+        # Nothing to coalesce with → call straight through on the caller's thread
+        if self.max_batch_size == 1:
+            with self._cond:
+                self.requests += 1
+                self.batches += 1
+                self.max_batch_seen = 1
+            return self.run_batch([item])[0]
+
+        pending = _Pending(item)
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append(pending)
+            self.requests += 1
+            self._cond.notify()
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def submit_many(self, items: List[Any]) -> List[Any]:
+        """
+        Queues all items at once (full batches form without waiting) and
+        blocks until every one is done. Results come back in item order;
+        the first failed item's exception is raised.
+        """
+        items = list(items)
+        if self.max_batch_size == 1:
+            return [self.submit(item) for item in items]
+        if not items:
+            return []
+
+        pending = [_Pending(item) for item in items]
+        with self._cond:
+            self._ensure_worker()
+            self._queue.extend(pending)
+            self.requests += len(pending)
+            self._cond.notify()
+
+        for p in pending:
+            p.done.wait()
+        for p in pending:
+            if p.error is not None:
+                raise p.error
+        return [p.result for p in pending]
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> List[_Pending]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            size = min(len(self._queue), self.max_batch_size)
+            batch = [self._queue.popleft() for _ in range(size)]
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, size)
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.run_batch([p.item for p in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"[BATCH] {self.name} returned {len(results)} results "
+                        f"for {len(batch)} items"
+                    )
+                for p, result in zip(batch, results):
+                    p.result = result
+            except BaseException as exc:
+                for p in batch:
+                    p.error = exc
+            finally:
+                for p in batch:
+                    p.done.set()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size_seen": self.max_batch_seen,
+                "queued": len(self._queue),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api import server
+from veridian_atlas.rag_engine.services.inference_executor import (
+    InferenceExecutor,
+    ServiceOverloaded,
+)
+
+client = TestClient(server.create_app())
+PAYLOAD = {"deal_id": "Deal", "query": "What is the upfront fee?", "top_k": 1}
+
+
+def test_executor_rejects_beyond_capacity():
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue=1, queue_timeout=0)
+
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: "queued")
+    with pytest.raises(ServiceOverloaded) as exc:
+        executor.submit(lambda: "rejected")
+    assert exc.value.retry_after >= 1
+
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+
+    release.set()
+    assert running.result(timeout=1) is True
+    assert queued.result(timeout=1) == "queued"
+    assert executor.stats()["completed"] == 2
+
+
+def test_executor_drops_calls_that_waited_too_long():
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue=1, queue_timeout=0.01)
+
+    executor.submit(release.wait)
+    stale = executor.submit(lambda: "too late")
+    time.sleep(0.05)
+    release.set()
+
+    with pytest.raises(ServiceOverloaded):
+        stale.result(timeout=1)
+    assert executor.stats()["timed_out"] == 1
+
+
+def test_saturated_ask_gets_503_while_health_stays_up(monkeypatch):
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue=0, queue_timeout=0)
+    monkeypatch.setattr(server, "inference_executor", executor)
+
+    def slow_answer(query, deal, top_k):
+        release.wait(5)
+        return {"query": query, "answer": "ok", "citations": [], "sources": []}
+
+    monkeypatch.setattr(server, "answer_query", slow_answer)
+
+    blocked = threading.Thread(target=client.post, args=("/ask/Deal",), kwargs={"json": PAYLOAD})
+    blocked.start()
+    while executor.stats()["running"] == 0:
+        time.sleep(0.005)
+
+    try:
+        response = client.post("/ask/Deal", json=PAYLOAD)
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+        start = time.perf_counter()
+        assert client.get("/health").status_code == 200
+        assert time.perf_counter() - start < 1.0
+    finally:
+        release.set()
+        blocked.join()
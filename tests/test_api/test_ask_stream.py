@@ -0,0 +1,68 @@
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api.server import create_app
+from veridian_atlas.rag_engine.pipeline import rag_engine
+
+client = TestClient(create_app())
+
+CONTEXTS = [
+    {"chunk_id": "VA_Deal_Fees", "content": "Upfront fee of 2%.", "section": "1", "clause": "1.1"},
+]
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def _stream(monkeypatch, model_output, calls=None):
+    def stream_response(prompt, **kw):
+        if calls is not None:
+            calls.append(kw)
+        return iter(model_output)
+
+    monkeypatch.setattr(rag_engine, "retrieve_context", lambda q, d, k: CONTEXTS)
+    monkeypatch.setattr(rag_engine, "stream_response", stream_response)
+    monkeypatch.setattr(rag_engine, "count_tokens", lambda text: len(text.split()))
+    payload = {"deal_id": "Deal", "query": "What is the upfront fee?", "top_k": 1}
+    response = client.post("/ask/Deal/stream", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _events(response.text)
+
+
+def test_stream_sends_sources_tokens_then_final(monkeypatch):
+    pieces = ['{"ans', 'wer": "The upfront', ' fee is 2%."', ', "citations": ["VA_Deal_Fees"]}']
+    calls = []
+    events = _stream(monkeypatch, pieces, calls)
+
+    # Generation gets the request's cancel event (set when the client disconnects)
+    assert isinstance(calls[0]["cancel"], threading.Event)
+
+    names = [name for name, _ in events]
+    assert names[0] == "sources" and names[-1] == "final"
+    assert events[0][1]["sources"][0]["chunk_id"] == "VA_Deal_Fees"
+    assert "".join(data["text"] for name, data in events if name == "token") == (
+        "The upfront fee is 2%."
+    )
+    assert events[-1][1]["citations"] == ["VA_Deal_Fees"]
+    assert events[-1][1]["answer"] == "The upfront fee is 2%."
+
+
+def test_stream_final_applies_citation_rules(monkeypatch):
+    events = _stream(monkeypatch, ['{"answer": "Made up.", "citations": ["VA_Other"]}'])
+
+    final = events[-1][1]
+    assert final["answer"] == "The provided text does not contain enough information."
+    assert final["citations"] == []
+
+
+def test_stream_missing_deal_is_404():
+    payload = {"deal_id": "missing", "query": "anything", "top_k": 1}
+    assert client.post("/ask/missing_deal_xyz/stream", json=payload).status_code == 404
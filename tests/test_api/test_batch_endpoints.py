@@ -0,0 +1,99 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api import server
+from veridian_atlas.rag_engine.pipeline import rag_engine
+
+client = TestClient(server.create_app())
+
+
+class FakeCollection:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, query_embeddings, n_results, include):
+        self.queries.append(len(query_embeddings))
+        # One row per query vector; the first component identifies the query
+        rows = [int(v[0]) for v in query_embeddings]
+        return {
+            "ids": [[f"VA_Deal_{r}_{i}" for i in range(n_results)] for r in rows],
+            "documents": [[f"text for query {r}"] * n_results for r in rows],
+            "metadatas": [[{"section_id": f"SECTION {r}"}] * n_results for r in rows],
+            "distances": [[0.1 * i for i in range(n_results)] for _ in rows],
+        }
+
+
+def _patch(monkeypatch, answers=None):
+    collection, embeds, prompts = FakeCollection(), [], []
+    index = {}
+
+    def embed(texts, **kw):
+        embeds.append(list(texts))
+        return np.array([[float(t.split()[-1]), 1.0] for t in texts], dtype=np.float32)
+
+    def generate(batch, max_tokens=256):
+        prompts.append(len(batch))
+        return [answers or {"answer": "A", "citations": []} for _ in batch]
+
+    monkeypatch.setattr(rag_engine, "get_chroma_collection", lambda deal: collection)
+    monkeypatch.setattr(rag_engine.hf_embedder, "embed", embed)
+    monkeypatch.setattr(
+        rag_engine, "query_embedding_cache", type(rag_engine.query_embedding_cache)(8)
+    )
+    monkeypatch.setattr(rag_engine, "generate_responses", generate)
+    monkeypatch.setattr(rag_engine.answer_cache, "index_version", lambda deal: None)
+    monkeypatch.setattr(rag_engine.config, "CONTEXT_PACKING", False)  # no tokenizer
+    monkeypatch.setattr(rag_engine.reference_indexes, "get", lambda *a: index or None)
+    return collection, embeds, prompts
+
+
+def test_batch_search_embeds_and_queries_once(monkeypatch):
+    collection, embeds, _ = _patch(monkeypatch)
+    queries = [f"fee question {i}" for i in (3, 1, 2, 1)]
+
+    res = client.post("/search/Deal/batch", json={"queries": queries, "top_k": 2})
+    assert res.status_code == 200
+    data = res.json()
+
+    assert data["count"] == 4
+    assert [r["query"] for r in data["results"]] == queries
+    assert [r["results"][0]["chunk_id"] for r in data["results"]] == [
+        "VA_Deal_3_0",
+        "VA_Deal_1_0",
+        "VA_Deal_2_0",
+        "VA_Deal_1_0",
+    ]
+    # Duplicates are encoded once, all in a single embed call
+    assert embeds == [["fee question 3", "fee question 1", "fee question 2"]]
+    assert collection.queries == [4]
+
+    # Matches the single-query path
+    single = rag_engine.retrieve_context("fee question 2", "Deal", top_k=2)
+    assert single == rag_engine.retrieve_context_batch(["fee question 2"], "Deal", top_k=2)[0]
+    assert len(embeds) == 1  # served from the query embedding cache
+
+
+def test_batch_ask_generates_prompts_together(monkeypatch):
+    collection, embeds, prompts = _patch(
+        monkeypatch, answers={"answer": "2% fee", "citations": ["VA_Deal_1_0"]}
+    )
+    queries = ["fee question 1", "fee question 2"]
+
+    res = client.post("/ask/Deal/batch", json={"queries": queries, "top_k": 2})
+    assert res.status_code == 200
+    results = res.json()["results"]
+
+    assert [r["query"] for r in results] == queries
+    assert results[0]["answer"] == "2% fee" and results[0]["citations"] == ["VA_Deal_1_0"]
+    # Question 2 never retrieved VA_Deal_1_0, so its citation is rejected
+    assert results[1]["citations"] == []
+    assert prompts == [2] and collection.queries == [2] and len(embeds) == 1
+
+
+def test_batch_limits(monkeypatch):
+    _patch(monkeypatch)
+    assert client.post("/search/Deal/batch", json={"queries": []}).status_code == 422
+
+    monkeypatch.setattr(server.config, "BATCH_MAX_QUERIES", 2)
+    res = client.post("/ask/Deal/batch", json={"queries": ["a 1", "b 2", "c 3"]})
+    assert res.status_code == 400
@@ -0,0 +1,98 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api import server
+from veridian_atlas.data_pipeline.processors.chunker import save_chunks_as_jsonl
+from veridian_atlas.rag_engine.pipeline.chunk_lookup import ChunkLookup
+
+client = TestClient(server.create_app())
+
+
+def _chunk(i):
+    return {
+        "chunk_id": f"VA_Deal_Doc_SECTION_00{i}",
+        "deal_name": "Deal",
+        "section_id": f"SECTION {i}",
+        "content": f"Section {i} — fee text ₹{i}",
+        "metadata": {"source_path": "raw/Doc.txt"},
+    }
+
+
+class FakeCollection:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, ids=None, include=None, where=None):
+        assert where is None  # primary key only
+        self.calls.append(list(ids))
+        known = [c for c in ids if c == "VA_Deal_indexed_only"]
+        return {
+            "ids": known,
+            "documents": ["from the collection" for _ in known],
+            "metadatas": [{"chunk_id": c} for c in known],
+        }
+
+
+def _patch(tmp_path, monkeypatch, count=5):
+    save_chunks_as_jsonl(
+        (_chunk(i) for i in range(count)), tmp_path / "Deal" / "processed" / "chunks.jsonl"
+    )
+    collection = FakeCollection()
+    monkeypatch.setattr(server, "chunk_lookup", ChunkLookup(tmp_path))
+    monkeypatch.setattr(server, "get_chroma_collection", lambda deal: collection)
+    return collection
+
+
+def test_single_chunk_is_read_by_offset(tmp_path, monkeypatch):
+    collection = _patch(tmp_path, monkeypatch)
+
+    res = client.get("/chunk/Deal/VA_Deal_Doc_SECTION_003")
+    assert res.status_code == 200
+    data = res.json()
+    # Same payload shape the UI reads (documents[0]); metadata as the index stores it
+    assert data["ids"] == ["VA_Deal_Doc_SECTION_003"]
+    assert data["documents"] == ["Section 3 — fee text ₹3"]
+    assert data["metadatas"][0]["section_id"] == "SECTION 3"
+    assert data["metadatas"][0]["source_path"] == "raw/Doc.txt"
+    assert collection.calls == []
+
+    assert client.get("/chunk/Deal/VA_Deal_nope").status_code == 404
+
+
+def test_bulk_fetch_keeps_request_order(tmp_path, monkeypatch):
+    collection = _patch(tmp_path, monkeypatch)
+    ids = ["VA_Deal_Doc_SECTION_004", "VA_Deal_indexed_only", "VA_Deal_nope"]
+    ids.append("VA_Deal_Doc_SECTION_001")
+
+    res = client.post("/chunks/Deal", json={"chunk_ids": ids})
+    assert res.status_code == 200
+    data = res.json()
+
+    assert data["ids"] == [ids[0], ids[1], ids[3]]
+    assert data["documents"][1] == "from the collection"
+    assert data["missing"] == ["VA_Deal_nope"]
+    # Only ids absent from chunks.jsonl reach the collection, in one call
+    assert collection.calls == [["VA_Deal_indexed_only", "VA_Deal_nope"]]
+
+    monkeypatch.setattr(server.config, "CHUNK_FETCH_MAX", 2)
+    assert client.post("/chunks/Deal", json={"chunk_ids": ids}).status_code == 400
+    assert client.post("/chunks/Deal", json={"chunk_ids": []}).status_code == 422
+
+
+def test_stale_offsets_are_rebuilt(tmp_path, monkeypatch):
+    _patch(tmp_path, monkeypatch)
+    lookup = server.chunk_lookup
+    assert lookup.get("Deal", ["VA_Deal_Doc_SECTION_000"])
+
+    # chunks.jsonl rewritten without the chunker (offsets file now describes the old file)
+    chunks_path = tmp_path / "Deal" / "processed" / "chunks.jsonl"
+    rows = [_chunk(i) for i in range(3)][::-1]
+    chunks_path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    os.utime(chunks_path, ns=(1, 1))
+
+    found = lookup.get("Deal", ["VA_Deal_Doc_SECTION_000", "VA_Deal_Doc_SECTION_004"])
+    assert list(found) == ["VA_Deal_Doc_SECTION_000"]
+    assert found["VA_Deal_Doc_SECTION_000"][0] == "Section 0 — fee text ₹0"
+    assert lookup.stats()["indexes_rebuilt"] == 1
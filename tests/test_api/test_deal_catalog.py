@@ -0,0 +1,82 @@
+import itertools
+import os
+
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api import server
+from veridian_atlas.data_pipeline.processors.index_builder import write_build_meta
+from veridian_atlas.rag_engine.services.deal_catalog import DealCatalog
+
+client = TestClient(server.create_app())
+_mtimes = itertools.count(10**9, 10**9)
+
+
+def _deal(root, name, docs=("Agreement.txt",), chunks=3):
+    (root / name / "raw").mkdir(parents=True)
+    (root / name / "processed").mkdir()
+    for doc in docs:
+        (root / name / "raw" / doc).write_text("SECTION 1", encoding="utf-8")
+    (root / name / "processed" / "chunks.jsonl").write_text("{}\n" * chunks, encoding="utf-8")
+
+
+def _touch(path):
+    # Explicit mtimes: coarse filesystem timestamps can hide a change made right after a scan
+    ns = next(_mtimes)
+    os.utime(path, ns=(ns, ns))
+
+
+def _catalog(tmp_path, monkeypatch, **kw):
+    deals, db = tmp_path / "deals", tmp_path / "db"
+    _deal(deals, "Alpha", docs=("A.txt", "B.txt"), chunks=5)
+    _deal(deals, "Beta")
+    write_build_meta(db, "Alpha", {"index_version": "v1", "model_name": "mpnet", "chunk_count": 5})
+    catalog = DealCatalog(deals, db, **kw)
+    monkeypatch.setattr(server, "deal_catalog", catalog)
+    return catalog, deals, db
+
+
+def test_deals_are_served_from_the_catalog(tmp_path, monkeypatch):
+    catalog, _, _ = _catalog(tmp_path, monkeypatch, check_interval=0)
+
+    assert client.get("/deals").json() == {"deals": ["Alpha", "Beta"]}
+    alpha = client.get("/deals/Alpha").json()
+    assert (alpha["document_count"], alpha["chunk_count"]) == (2, 5)
+    assert alpha["index"]["indexed"] and alpha["index"]["index_version"] == "v1"
+    assert alpha["paths"]["embeddings_exists"] is True
+
+    beta = client.get("/deals/Beta").json()
+    assert beta["index"]["indexed"] is False and beta["paths"]["embeddings_exists"] is False
+    docs = client.get("/deals/Alpha/docs").json()["documents"]
+    assert docs == {"raw": ["A.txt", "B.txt"], "processed": ["chunks.jsonl"]}
+    assert client.get("/deals/Nope").status_code == 404
+
+    # Unchanged tree: every request above reused the first scan
+    assert catalog.stats()["deal_scans"] == 2 and catalog.generation == 1
+
+
+def test_only_changed_deals_are_rescanned(tmp_path, monkeypatch):
+    catalog, deals, db = _catalog(tmp_path, monkeypatch, check_interval=0)
+    catalog.refresh()
+
+    (deals / "Beta" / "raw" / "Side_Letter.txt").write_text("x", encoding="utf-8")
+    _touch(deals / "Beta" / "raw")
+    assert client.get("/deals/Beta").json()["document_count"] == 2
+    assert catalog.stats()["deal_scans"] == 3 and catalog.generation == 2
+
+    write_build_meta(db, "Beta", {"index_version": "v2", "chunk_count": 3})
+    assert client.get("/deals/Beta").json()["index"]["index_version"] == "v2"
+
+    _deal(deals, "Gamma")
+    _touch(deals)
+    assert client.get("/deals").json()["deals"] == ["Alpha", "Beta", "Gamma"]
+    assert catalog.stats()["deal_scans"] == 5  # Beta (build_meta) + Gamma
+
+
+def test_checks_are_rate_limited(tmp_path, monkeypatch):
+    catalog, deals, _ = _catalog(tmp_path, monkeypatch, check_interval=3600)
+    assert catalog.deal_ids() == ["Alpha", "Beta"]
+
+    _deal(deals, "Gamma")
+    _touch(deals)
+    assert catalog.deal_ids() == ["Alpha", "Beta"]  # within the check interval
+    assert catalog.refresh(force=True) and catalog.deal_ids()[-1] == "Gamma"
@@ -0,0 +1,146 @@
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+from veridian_atlas.api import server
+from veridian_atlas.rag_engine.pipeline import rag_engine
+
+client = TestClient(server.create_app())
+
+
+class FakeCollection:
+    def __init__(self, deal, distances, delay=0.0):
+        self.deal = deal
+        self.distances = distances
+        self.delay = delay
+
+    def query(self, query_embeddings, n_results, include):
+        time.sleep(self.delay)
+        ids = [f"VA_{self.deal}_{i}" for i in range(len(self.distances))][:n_results]
+        return {
+            "ids": [ids],
+            "documents": [[f"{self.deal} prepayment fee text {i}" for i in range(len(ids))]],
+            "metadatas": [[{"chunk_id": i, "section_id": "SECTION 1"} for i in ids]],
+            "distances": [self.distances[:n_results]],
+        }
+
+
+def _patch(monkeypatch, collections):
+    embeds = []
+
+    def get_collection(deal):
+        if deal not in collections:
+            raise ValueError(f"Collection VA_{deal} does not exist.")
+        return collections[deal]
+
+    def embed(query):
+        embeds.append(query)
+        return [0.0, 1.0]
+
+    monkeypatch.setattr(rag_engine, "get_chroma_collection", get_collection)
+    monkeypatch.setattr(rag_engine, "embed_query", embed)
+    return embeds
+
+
+def test_federated_search_merges_global_top_k(monkeypatch):
+    embeds = _patch(
+        monkeypatch,
+        {
+            "Alpha": FakeCollection("Alpha", [0.30, 0.50, 0.90]),
+            "Beta": FakeCollection("Beta", [0.10, 0.40, 0.95]),
+            "Gamma": FakeCollection("Gamma", [0.05]),
+        },
+    )
+
+    res = client.post(
+        "/search",
+        json={"query": "2% prepayment fee", "deal_ids": ["Alpha", "Beta", "Nope"], "top_k": 3},
+    )
+    assert res.status_code == 200
+    data = res.json()
+
+    # Gamma is not on the allow-list, so its closer hit never appears
+    assert [(r["deal_id"], r["distance"]) for r in data["results"]] == [
+        ("Beta", 0.10),
+        ("Alpha", 0.30),
+        ("Beta", 0.40),
+    ]
+    assert data["deals_searched"] == ["Alpha", "Beta"]
+    assert data["missing_deals"] == ["Nope"]
+    assert embeds == ["2% prepayment fee"]
+
+
+def test_federated_search_queries_deals_concurrently(monkeypatch):
+    deals = {f"D{i}": FakeCollection(f"D{i}", [0.1 * i], delay=0.2) for i in range(4)}
+    _patch(monkeypatch, deals)
+
+    start = time.perf_counter()
+    hits, missing, errors = rag_engine.retrieve_across_deals("fee", list(deals), top_k=4)
+    elapsed = time.perf_counter() - start
+
+    assert missing == [] and errors == {} and len(hits) == 4
+    assert elapsed < 0.6  # serial would be >= 0.8s
+
+
+class BrokenCollection:
+    def query(self, query_embeddings, n_results, include):
+        raise RuntimeError("Embedding dimension 2 does not match collection dimensionality 384")
+
+
+def test_one_broken_deal_does_not_fail_the_search(monkeypatch):
+    _patch(
+        monkeypatch,
+        {"Alpha": FakeCollection("Alpha", [0.30, 0.50]), "Broken": BrokenCollection()},
+    )
+
+    res = client.post("/search", json={"query": "fee", "deal_ids": ["Alpha", "Broken"]})
+    assert res.status_code == 200
+    data = res.json()
+    assert [r["deal_id"] for r in data["results"]] == ["Alpha", "Alpha"]
+    assert data["deals_searched"] == ["Alpha"]
+    assert list(data["errors"]) == ["Broken"]
+    assert "dimension" in data["errors"]["Broken"]
+
+    res = client.post("/search", json={"query": "fee", "deal_ids": ["Broken", "Nope"]})
+    assert res.status_code == 503
+
+
+def test_collection_load_failures_are_errors_not_missing(monkeypatch):
+    _patch(monkeypatch, {"Alpha": FakeCollection("Alpha", [0.30])})
+    real_get = rag_engine.get_chroma_collection
+
+    def get_collection(deal):
+        if deal == "Locked":
+            raise sqlite3.OperationalError("database is locked")
+        return real_get(deal)
+
+    monkeypatch.setattr(rag_engine, "get_chroma_collection", get_collection)
+    hits, missing, errors = rag_engine.retrieve_across_deals("fee", ["Alpha", "Locked", "Nope"])
+
+    assert [h["deal"] for h in hits] == ["Alpha"]
+    assert missing == ["Nope"]
+    assert errors == {"Locked": "OperationalError: database is locked"}
+
+
+def test_federated_pure_lookup_respects_reference_switch(monkeypatch):
+    deals = {"Alpha": FakeCollection("Alpha", [0.30]), "Beta": FakeCollection("Beta", [0.20])}
+    embeds = _patch(monkeypatch, deals)
+    monkeypatch.setattr(rag_engine.config, "REFERENCE_LOOKUP", False)
+
+    # Not a reference lookup when the switch is off → embedded once, up front
+    hits, _, _ = rag_engine.retrieve_across_deals("what does 2.1(a) say", list(deals))
+    assert embeds == ["what does 2.1(a) say"]
+    assert [h["deal"] for h in hits] == ["Beta", "Alpha"]
+
+
+def test_federated_search_requires_allow_list(monkeypatch):
+    _patch(monkeypatch, {})
+
+    assert client.post("/search", json={"query": "fee", "deal_ids": []}).status_code == 422
+    assert client.post("/search", json={"query": "fee"}).status_code == 422
+    assert client.post("/search", json={"query": "fee", "deal_ids": ["Nope"]}).status_code == 404
+
+    monkeypatch.setattr(server.config, "SEARCH_MAX_DEALS", 2)
+    res = client.post("/search", json={"query": "fee", "deal_ids": ["A", "B", "C"]})
+    assert res.status_code == 400
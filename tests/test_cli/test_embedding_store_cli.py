@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from veridian_atlas.cli import run_embedding_store
+from veridian_atlas.core.constants import DEALS_DIR
+from veridian_atlas.data_pipeline.processors.embedder import EmbeddingService
+
+
+class FakeStore:
+    def __init__(self):
+        self.kept = "not called"
+
+    def stats(self):
+        return {}
+
+    def compact(self, keep=None):
+        self.kept = keep
+        return {"kept": None if keep is None else len(keep)}
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(EmbeddingService, "store", property(lambda self: store))
+    return store
+
+
+def test_deals_path_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    assert run_embedding_store.DEALS_BASE == DEALS_DIR and DEALS_DIR.is_absolute()
+
+    processed = tmp_path / "deals" / "Deal" / "processed"
+    processed.mkdir(parents=True)
+    rows = [{"chunk_id": "a", "content": "Upfront fee."}, {"chunk_id": "b", "content": "Agent."}]
+    (processed / "chunks.jsonl").write_text("\n".join(json.dumps(r) for r in rows))
+    monkeypatch.setattr(run_embedding_store, "DEALS_BASE", tmp_path / "deals")
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    assert len(run_embedding_store.live_keys()) == 2
+
+
+def test_prune_without_chunk_files_refuses(tmp_path, monkeypatch, fake_store):
+    monkeypatch.setattr(run_embedding_store, "DEALS_BASE", tmp_path / "deals")
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(RuntimeError, match="refusing to prune"):
+        run_embedding_store.run(compact=True, prune=True)
+    assert fake_store.kept == "not called"
+
+    # Compaction without pruning keeps everything and needs no chunk files
+    run_embedding_store.run(compact=True)
+    assert fake_store.kept is None
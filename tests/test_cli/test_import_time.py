@@ -0,0 +1,55 @@
+"""
+Import-time budget for CLI and API entrypoints.
+Models and heavy libraries must load on first use, not on import.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+HEAVY_MODULES = ["torch", "transformers", "sentence_transformers", "chromadb"]
+IMPORT_BUDGET_SECONDS = 2.0
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{elapsed:.4f}}|{{','.join(heavy)}}")
+"""
+
+
+def _probe_import(module: str):
+    out = (
+        subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": str(SRC), "PATH": ""},
+        )
+        .stdout.strip()
+        .splitlines()[-1]
+    )
+    elapsed, heavy = out.split("|")
+    return float(elapsed), [m for m in heavy.split(",") if m]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "veridian_atlas.cli.run_ingestion",
+        "veridian_atlas.cli.run_chunker",
+        "veridian_atlas.cli.run_query",
+        "veridian_atlas.cli.run_project",
+        "veridian_atlas.api.server",
+    ],
+)
+def test_entrypoint_import_is_light(module):
+    elapsed, heavy = _probe_import(module)
+    assert heavy == [], f"{module} imported heavy modules at import time: {heavy}"
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"{module} import took {elapsed:.2f}s"
@@ -0,0 +1,65 @@
+import json
+
+from veridian_atlas.data_pipeline import router
+from veridian_atlas.data_pipeline.processors.chunk_offsets import (
+    ChunkOffsetIndex,
+    chunk_offsets_path,
+)
+from veridian_atlas.data_pipeline.processors.chunker import chunk_deal
+
+DOC = """SECTION 1 - Fees
+1.1 Upfront Fee
+The Borrower shall pay an upfront fee of 2%.
+1.2 Commitment Fee
+A commitment fee of 0.5% accrues on undrawn amounts.
+
+SECTION 2 - Covenants
+The Borrower shall maintain leverage below 4.0x.
+"""
+
+
+def _chunks(tmp_path, monkeypatch, sections_format):
+    raw = tmp_path / sections_format / "Deal" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "Agreement.txt").write_text(DOC, encoding="utf-8")
+    monkeypatch.setattr(router, "BASE_DEALS_PATH", tmp_path / sections_format)
+
+    router.ingest_deal("Deal", sections_format=sections_format)
+    processed = tmp_path / sections_format / "Deal" / "processed"
+    assert (processed / f"sections.{sections_format}").exists()
+
+    deal, count = chunk_deal(processed)
+    lines = (processed / "chunks.jsonl").read_text(encoding="utf-8").splitlines()
+    assert deal == "Deal" and count == len(lines)
+    return [json.loads(line) for line in lines]
+
+
+def test_jsonl_sections_produce_identical_chunks(tmp_path, monkeypatch):
+    from_json = _chunks(tmp_path, monkeypatch, "json")
+    from_jsonl = _chunks(tmp_path, monkeypatch, "jsonl")
+
+    assert from_json
+    assert [c["chunk_id"] for c in from_jsonl] == [c["chunk_id"] for c in from_json]
+    assert [c["content"] for c in from_jsonl] == [c["content"] for c in from_json]
+
+
+def test_switching_format_removes_stale_file(tmp_path, monkeypatch):
+    _chunks(tmp_path, monkeypatch, "json")
+    processed = tmp_path / "json" / "Deal" / "processed"
+
+    router.ingest_deal("Deal", force=True, sections_format="jsonl")
+    assert not (processed / "sections.json").exists()
+    assert (processed / "sections.jsonl").exists()
+
+
+def test_chunker_writes_byte_offsets(tmp_path, monkeypatch):
+    chunks = _chunks(tmp_path, monkeypatch, "jsonl")
+    chunks_path = tmp_path / "jsonl" / "Deal" / "processed" / "chunks.jsonl"
+
+    index = ChunkOffsetIndex.load(chunk_offsets_path(chunks_path))
+    assert index.matches(chunks_path) and len(index) == len(chunks)
+
+    wanted = [chunks[-1]["chunk_id"], chunks[0]["chunk_id"]]
+    rows = index.read(chunks_path, wanted)
+    assert [rows[c] for c in wanted] == [chunks[-1], chunks[0]]
+    assert ChunkOffsetIndex.scan(chunks_path).offsets == index.offsets
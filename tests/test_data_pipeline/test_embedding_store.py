@@ -0,0 +1,73 @@
+import numpy as np
+
+from veridian_atlas.data_pipeline.processors.embedder import EmbeddingService
+from veridian_atlas.data_pipeline.processors.embedding_store import EmbeddingStore, embedding_key
+
+
+class CountingModel:
+    def __init__(self):
+        self.seen = []
+
+    def encode(self, texts, **kwargs):
+        self.seen.extend(texts)
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def _service(tmp_path):
+    service = EmbeddingService(model_name="stub-model", store_dir=str(tmp_path))
+    service._model = CountingModel()
+    return service
+
+
+def test_store_dedupes_and_persists_across_instances(tmp_path):
+    service = _service(tmp_path)
+    first = service.embed(["fee clause", "fee clause", "maturity"])
+
+    assert isinstance(first, np.ndarray) and first.shape == (3, 3)
+    np.testing.assert_array_equal(first[0], first[1])
+    assert service.model.seen == ["fee clause", "maturity"]
+
+    rebuilt = _service(tmp_path)
+    np.testing.assert_array_equal(rebuilt.embed(["maturity", "fee clause"]), first[[2, 0]])
+    assert rebuilt.model.seen == []
+    assert rebuilt.dimension() == 3
+
+
+def test_queries_are_not_persisted(tmp_path):
+    service = _service(tmp_path)
+    service.embed_single("what is the fee?")
+    assert service.store.stats()["rows"] == 0
+
+
+def test_compact_prunes_unused_rows(tmp_path):
+    store = EmbeddingStore(tmp_path, model_name="m")
+    keys = [embedding_key("m", False, t) for t in ("a", "b", "c")]
+    store.add(keys, np.eye(3, dtype=np.float32))
+
+    assert store.compact(keep={keys[0], keys[2]}) == {"rows_before": 3, "rows_after": 2}
+    reopened = EmbeddingStore(tmp_path, model_name="m")
+    assert set(reopened.lookup(keys)) == {keys[0], keys[2]}
+    assert reopened.lookup([keys[2]])[keys[2]].tolist() == [0.0, 0.0, 1.0]
+
+
+def test_reader_reloads_after_compaction_elsewhere(tmp_path):
+    writer = EmbeddingStore(tmp_path, model_name="m")
+    reader = EmbeddingStore(tmp_path, model_name="m")
+    keys = [embedding_key("m", False, t) for t in "abcd"]
+    writer.add(keys, np.eye(4, dtype=np.float32))
+    assert len(reader.lookup(keys)) == 4  # reader now maps rows 0..3
+
+    # Drop "a" (rows shift up) and append "e" so the keys file is as long as before
+    writer.compact(keep=set(keys[1:]))
+    extra = embedding_key("m", False, "e")
+    writer.add([extra], np.full((1, 4), 9.0, dtype=np.float32))
+
+    found = reader.lookup(keys + [extra])
+    assert set(found) == set(keys[1:]) | {extra}
+    assert found[keys[3]].tolist() == [0.0, 0.0, 0.0, 1.0]
+    assert found[extra].tolist() == [9.0] * 4
+
+    # Mid-swap (odd generation) nothing is served rather than rows from the wrong file
+    writer.generation += 1
+    writer._write_header()
+    assert reader.lookup(keys) == {}
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+
+import pytest
+
+from veridian_atlas.data_pipeline.processors import index_builder
+from veridian_atlas.data_pipeline.processors.index_pipeline import run_pipeline, run_serial
+
+
+def _batches(n, size=4):
+    for b in range(n):
+        ids = [f"c{b}_{i}" for i in range(size)]
+        yield ids, [f"text {i}" for i in ids], [{"chunk_id": i} for i in ids]
+
+
+def _embed(docs):
+    return [[float(len(d)), 1.0] for d in docs]
+
+
+def test_pipeline_matches_serial_and_keeps_order():
+    serial, piped = [], []
+    run_serial(_batches(5), _embed, lambda ids, d, m, v: serial.append((ids, v)))
+    stats = run_pipeline(_batches(5), _embed, lambda ids, d, m, v: piped.append((ids, v)))
+
+    assert piped == serial
+    assert stats["writer"]["chunks"] == stats["embedder"]["chunks"] == 20
+    assert stats["reader"]["batches"] == 5
+
+
+def test_pipeline_overlaps_embed_with_write():
+    embedding = threading.Event()
+    overlapped = []
+
+    def embed(docs):
+        embedding.set()
+        time.sleep(0.02)
+        embedding.clear()
+        return _embed(docs)
+
+    def write(ids, docs, metas, vectors):
+        time.sleep(0.01)
+        overlapped.append(embedding.is_set())
+
+    run_pipeline(_batches(6), embed, write, queue_depth=1)
+    assert any(overlapped)
+
+
+def test_pipeline_reraises_stage_errors():
+    def embed(docs):
+        raise RuntimeError("model exploded")
+
+    with pytest.raises(RuntimeError, match="model exploded"):
+        run_pipeline(_batches(10), embed, lambda *a: None, queue_depth=1)
+
+
+def test_build_is_incremental_in_both_modes(tmp_path, monkeypatch):
+    monkeypatch.setattr(index_builder.hf_embedder, "embed", lambda texts, **kw: _embed(texts))
+    monkeypatch.setattr(index_builder.hf_embedder, "dimension", lambda: 2)
+
+    chunks = tmp_path / "chunks.jsonl"
+    rows = [
+        {"chunk_id": f"VA_Deal_{i}", "content": f"clause {i}", "metadata": {"file_hash": "h"}}
+        for i in range(10)
+    ]
+    chunks.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+
+    first = index_builder.build_chroma_index("Deal", chunks, tmp_path / "db", batch_size=3)
+    assert (first["added"], first["unchanged"]) == (10, 0)
+    assert first["stages"]["writer"]["chunks"] == 10
+
+    rows[0]["content"] = "clause zero, amended"
+    chunks.write_text("\n".join(json.dumps(r) for r in rows[:-1]), encoding="utf-8")
+    second = index_builder.build_chroma_index(
+        "Deal", chunks, tmp_path / "db", batch_size=3, pipelined=False
+    )
+    assert (second["updated"], second["deleted"], second["unchanged"]) == (1, 1, 8)
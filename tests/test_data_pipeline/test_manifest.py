@@ -0,0 +1,97 @@
+import json
+import os
+
+from veridian_atlas.data_pipeline import router
+
+DOC = """SECTION 1 - Fees
+1.1 Upfront Fee
+The Borrower shall pay an upfront fee of 2%.
+"""
+
+
+def _setup_deal(tmp_path, monkeypatch):
+    raw = tmp_path / "Deal" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "Agreement.txt").write_text(DOC, encoding="utf-8")
+    (raw / "Schedule.txt").write_text(DOC.replace("2%", "3%"), encoding="utf-8")
+    monkeypatch.setattr(router, "BASE_DEALS_PATH", tmp_path)
+    return raw
+
+
+def test_unchanged_files_are_not_reparsed(tmp_path, monkeypatch):
+    raw = _setup_deal(tmp_path, monkeypatch)
+    first = router.ingest_deal("Deal")
+
+    manifest = json.loads((tmp_path / "Deal" / "processed" / "manifest.json").read_text())
+    assert set(manifest["files"]) == {"Agreement.txt", "Schedule.txt"}
+
+    routed = []
+    real_route = router.route_file
+    monkeypatch.setattr(
+        router, "route_file", lambda f, *a, **kw: routed.append(f.name) or real_route(f, *a, **kw)
+    )
+
+    assert router.ingest_deal("Deal") == first
+    assert routed == []
+
+    (raw / "Schedule.txt").write_text(DOC.replace("2%", "4%"), encoding="utf-8")
+    second = router.ingest_deal("Deal")
+    assert routed == ["Schedule.txt"]
+    assert second["Agreement"] == first["Agreement"]
+    assert second["Schedule"] != first["Schedule"]
+
+
+def test_removed_files_drop_out(tmp_path, monkeypatch):
+    raw = _setup_deal(tmp_path, monkeypatch)
+    router.ingest_deal("Deal")
+    (raw / "Schedule.txt").unlink()
+
+    assert list(router.ingest_deal("Deal")) == ["Agreement"]
+
+
+def test_parallel_ingest_matches_serial(tmp_path, monkeypatch):
+    raw = _setup_deal(tmp_path, monkeypatch)
+    (raw / "Notes.csv").write_text("not,a,loader", encoding="utf-8")
+
+    serial = router.ingest_deal("Deal", force=True)
+    parallel = router.ingest_deal("Deal", force=True, workers=2)
+
+    assert parallel == serial
+    assert list(parallel) == ["Agreement", "Notes", "Schedule"]
+    assert parallel["Notes"] == []
+
+
+def _kill_worker(**kwargs):
+    os._exit(1)
+
+
+def test_worker_crash_fails_only_that_file(tmp_path, monkeypatch):
+    raw = _setup_deal(tmp_path, monkeypatch)
+    for n in range(20):
+        (raw / f"Exhibit{n:02d}.txt").write_text(DOC.replace("2%", f"{n}%"), encoding="utf-8")
+    first = router.ingest_deal("Deal")
+
+    # Several files per batch; the crash breaks the pool for every batch in flight
+    (raw / "Bad.crash").write_text("boom", encoding="utf-8")
+    monkeypatch.setitem(router.LOADER_MAP, ".crash", _kill_worker)
+
+    results = router.ingest_deal("Deal", force=True, workers=2)
+
+    assert results.pop("Bad") == []
+    assert results == first
+    manifest = json.loads((tmp_path / "Deal" / "processed" / "manifest.json").read_text())
+    assert "Bad.crash" not in manifest["files"]
+    assert len(manifest["files"]) == 22
+
+
+def test_failed_parse_keeps_previous_sections(tmp_path, monkeypatch):
+    raw = _setup_deal(tmp_path, monkeypatch)
+    first = router.ingest_deal("Deal")
+
+    (raw / "Schedule.txt").write_text(DOC.replace("2%", "6%"), encoding="utf-8")
+    monkeypatch.setattr(router, "route_file", lambda *a, **kw: [])
+
+    results = router.ingest_deal("Deal")
+    assert results["Schedule"] == first["Schedule"]
+    manifest = json.loads((tmp_path / "Deal" / "processed" / "manifest.json").read_text())
+    assert set(manifest["files"]) == {"Agreement.txt"}
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")  # torch.onnx.export + int8 quantization
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+st = pytest.importorskip("sentence_transformers")
+
+from veridian_atlas.data_pipeline.processors.embedder import EmbeddingService  # noqa: E402
+
+TEXTS = [
+    "The Borrower shall pay an upfront fee of two percent.",
+    "Commitment fee accrues on undrawn amounts.",
+    "fee",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_st_model(tmp_path_factory):
+    """Random-weight BERT wrapped as a sentence-transformer (mean pooling + Normalize)."""
+    root = tmp_path_factory.mktemp("tiny_st")
+    words = sorted({w.strip(".,").lower() for t in TEXTS for w in t.split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words]
+    (root / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(root / "vocab.txt"))
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=64,
+    )
+    transformer_dir = root / "hf"
+    transformers.BertModel(config).save_pretrained(transformer_dir)
+    tokenizer.save_pretrained(transformer_dir)
+
+    modules = [
+        st.models.Transformer(str(transformer_dir), max_seq_length=64),
+        st.models.Pooling(32, pooling_mode="mean"),
+        st.models.Normalize(),
+    ]
+    st.SentenceTransformer(modules=modules).save(str(root / "st"))
+    return str(root / "st")
+
+
+def _cosines(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def test_onnx_backends_agree_with_torch(tiny_st_model, tmp_path, monkeypatch):
+    from veridian_atlas.core import config
+
+    monkeypatch.setattr(config, "EMBEDDING_ONNX_DIR", str(tmp_path / "onnx"))
+
+    reference = EmbeddingService(tiny_st_model).embed(TEXTS)
+    fp32 = EmbeddingService(tiny_st_model, backend="onnx").embed(TEXTS)
+    int8 = EmbeddingService(tiny_st_model, backend="onnx-int8").embed(TEXTS)
+
+    assert np.allclose(fp32, reference, atol=1e-5)
+    assert np.allclose(np.linalg.norm(fp32, axis=1), 1.0, atol=1e-5)  # Normalize module honoured
+    assert _cosines(int8, reference).min() > 0.95
+
+
+def test_int8_vectors_get_their_own_identity():
+    assert EmbeddingService("m", backend="onnx").model_id == "m"
+    assert EmbeddingService("m", backend="onnx-int8").model_id != "m"
+    with pytest.raises(ValueError):
+        EmbeddingService("m", backend="tensorrt")
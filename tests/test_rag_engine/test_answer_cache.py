@@ -0,0 +1,70 @@
+import os
+
+from veridian_atlas.data_pipeline.processors.index_builder import write_build_meta
+from veridian_atlas.rag_engine.services.answer_cache import AnswerCache
+
+MODELS = ("embedder", "llm")
+
+
+def _key(cache, deal):
+    version = cache.index_version(deal)
+    return AnswerCache.make_key(deal, "fee terms", 3, MODELS, version)
+
+
+def test_answer_cache_roundtrip_and_disk_tier(tmp_path):
+    write_build_meta(tmp_path / "db", "Deal", {"index_version": "v1"})
+    cache = AnswerCache(tmp_path / "db", disk_dir=tmp_path / "answers")
+
+    key = _key(cache, "Deal")
+    cache.put("Deal", key, {"answer": "2%", "citations": ["c1"]})
+    assert cache.get("Deal", key)["answer"] == "2%"
+
+    # A fresh instance (API restart) still finds the entry on disk
+    restarted = AnswerCache(tmp_path / "db", disk_dir=tmp_path / "answers")
+    assert restarted.get("Deal", _key(restarted, "Deal"))["citations"] == ["c1"]
+
+
+def test_answer_cache_invalidated_on_rebuild(tmp_path):
+    meta = write_build_meta(tmp_path / "db", "Deal", {"index_version": "v1"})
+    cache = AnswerCache(tmp_path / "db")
+    old_key = _key(cache, "Deal")
+    cache.put("Deal", old_key, {"answer": "old"})
+
+    write_build_meta(tmp_path / "db", "Deal", {"index_version": "v2"})
+    os.utime(meta, (meta.stat().st_atime, meta.stat().st_mtime + 5))
+
+    assert _key(cache, "Deal") != old_key
+    assert cache.get("Deal", old_key) is None
+
+
+def test_unversioned_index_is_not_cached(tmp_path):
+    cache = AnswerCache(tmp_path / "db")
+    assert cache.index_version("Missing") is None
+
+
+def test_answer_settings_are_part_of_the_key(tmp_path, monkeypatch):
+    from veridian_atlas.core import config
+    from veridian_atlas.rag_engine.pipeline import rag_engine
+
+    write_build_meta(tmp_path / "db", "Deal", {"index_version": "v1"})
+    monkeypatch.setattr(rag_engine, "answer_cache", AnswerCache(tmp_path / "db"))
+    keys = [rag_engine._answer_cache_key("fee terms", "Deal", 3)]
+    assert rag_engine._answer_cache_key("Fee  Terms", "Deal", 3) == keys[0]
+
+    changes = [
+        ("LLM_PRECISION", "int8"),
+        ("CONTEXT_TOKEN_BUDGET", config.CONTEXT_TOKEN_BUDGET // 2),
+        ("REFERENCE_LOOKUP", not config.REFERENCE_LOOKUP),
+        ("VECTOR_BACKEND", "numpy" if config.VECTOR_BACKEND != "numpy" else "chroma"),
+        ("NUMPY_VECTOR_DTYPE", "int8" if config.NUMPY_VECTOR_DTYPE != "int8" else "float32"),
+        ("NUMPY_RESCORE", not config.NUMPY_RESCORE),
+    ]
+    for name, value in changes:
+        monkeypatch.setattr(config, name, value)
+        keys.append(rag_engine._answer_cache_key("fee terms", "Deal", 3))
+
+    # Embedding backend → different model_id (int8 vectors differ from torch ones)
+    monkeypatch.setattr(rag_engine.hf_embedder, "backend", "onnx-int8")
+    keys.append(rag_engine._answer_cache_key("fee terms", "Deal", 3))
+
+    assert len(set(keys)) == len(keys)
@@ -0,0 +1,28 @@
+import pytest
+from veridian_atlas.core.chroma_registry import ChromaRegistry
+
+
+def test_registry_reuses_client_and_collection(tmp_path):
+    registry = ChromaRegistry()
+    client = registry.get_client(tmp_path, create=True)
+    client.create_collection("VA_Deal")
+
+    assert registry.get_client(tmp_path) is client
+    assert registry.get_collection("Deal", tmp_path) is registry.get_collection("Deal", tmp_path)
+
+
+def test_registry_drops_stale_handles(tmp_path):
+    registry = ChromaRegistry()
+    client = registry.get_client(tmp_path, create=True)
+    client.create_collection("VA_Deal")
+    first = registry.get_collection("Deal", tmp_path)
+
+    registry.invalidate("Deal", tmp_path)
+    assert registry.stats()["collections"] == 0
+    assert registry.get_collection("Deal", tmp_path) is not first
+
+
+def test_registry_missing_index(tmp_path):
+    registry = ChromaRegistry()
+    with pytest.raises(FileNotFoundError):
+        registry.get_collection("Deal", tmp_path / "missing")
@@ -0,0 +1,49 @@
+from veridian_atlas.rag_engine.pipeline.context_packer import compress, pack_contexts
+
+
+def words(text):
+    return len(text.split())
+
+
+SECTION = (
+    "The Borrower shall pay an upfront fee of 2% on the Closing Date. "
+    "The Agent may appoint sub-agents. "
+    "Notices shall be delivered in writing to the addresses set out below. "
+    "A commitment fee of 0.5% accrues daily on undrawn commitments. "
+    "This Agreement is governed by English law."
+)
+CLAUSE = "A commitment fee of 0.5% accrues daily on undrawn commitments."
+
+
+def _chunk(chunk_id, content):
+    return {"chunk_id": chunk_id, "content": content, "section": None, "clause": None}
+
+
+def test_duplicates_and_contained_chunks_are_dropped():
+    contexts = [
+        _chunk("VA_A", CLAUSE),
+        _chunk("VA_B", SECTION),
+        _chunk("VA_C", CLAUSE.upper()),
+    ]
+    packed = pack_contexts("commitment fee", contexts, words, token_budget=500)
+    assert [c["chunk_id"] for c in packed] == ["VA_B"]
+
+
+def test_long_chunks_keep_query_relevant_sentences():
+    trimmed = compress(SECTION, "What is the commitment fee?", 14, words)
+    assert "commitment fee of 0.5%" in trimmed
+    assert "governed by English law" not in trimmed
+    assert words(trimmed) <= 14
+
+
+def test_packing_respects_budget_and_keeps_ids():
+    contexts = [_chunk(f"VA_{i}", f"Clause {i} text. " * 30) for i in range(5)]
+    stats = {}
+    packed = pack_contexts(
+        "clause", contexts, words, token_budget=150, max_chunk_tokens=60, stats=stats
+    )
+
+    assert sum(c["tokens"] for c in packed) <= 150
+    assert all(c["trimmed"] for c in packed)
+    assert [c["chunk_id"] for c in packed] == [f"VA_{i}" for i in range(len(packed))]
+    assert stats["packed"] == len(packed) and stats["tokens"] <= 150
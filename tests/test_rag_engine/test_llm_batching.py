@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from veridian_atlas.utils.batching import MicroBatcher
+
+
+def test_concurrent_calls_are_coalesced():
+    seen = []
+
+    def run_batch(items):
+        seen.append(len(items))
+        time.sleep(0.01)
+        return [{"answer": f"re: {item}"} for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=50)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(batcher.submit, range(8)))
+
+    assert results == [{"answer": f"re: {i}"} for i in range(8)]
+    assert max(seen) <= 4
+    assert len(seen) < 8
+    assert batcher.stats()["requests"] == 8
+
+
+def test_batch_errors_reach_every_caller():
+    batcher = MicroBatcher(lambda items: 1 / 0, max_batch_size=4, max_wait_ms=20)
+    errors = []
+
+    def call(i):
+        try:
+            batcher.submit(i)
+        except ZeroDivisionError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 3
+    # The worker survives a failed batch
+    batcher.run_batch = lambda items: items
+    assert batcher.submit("ok") == "ok"
+
+
+def test_batch_size_one_runs_inline():
+    caller = threading.current_thread()
+    ran_on = []
+
+    batcher = MicroBatcher(lambda items: ran_on.append(threading.current_thread()) or items, 1)
+    assert batcher.submit("x") == "x"
+    assert ran_on == [caller]
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: [], max_batch_size=2, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.submit("x")
+
+
+def test_submit_many_fills_batches_in_order():
+    seen = []
+
+    def run_batch(items):
+        seen.append(len(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=20)
+    assert batcher.submit_many(range(10)) == [i * 10 for i in range(10)]
+
+    # Items were all queued at once, so every batch but the tail is full
+    assert seen == [4, 4, 2]
+    assert batcher.stats()["requests"] == 10
+    assert batcher.submit_many([]) == []
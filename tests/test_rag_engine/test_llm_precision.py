@@ -0,0 +1,75 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from veridian_atlas.rag_engine.services import local_llm  # noqa: E402
+
+
+def _tiny_qwen():
+    torch.manual_seed(0)
+    config = transformers.Qwen2Config(
+        vocab_size=64,
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=128,
+    )
+    return transformers.Qwen2ForCausalLM(config).eval()
+
+
+def test_resolve_precision():
+    assert local_llm.resolve_precision("auto", use_gpu=True) == "fp16"
+    assert local_llm.resolve_precision("auto", use_gpu=False) == "fp32"
+    assert local_llm.resolve_precision("int8", use_gpu=False) == "int8"
+    with pytest.raises(ValueError):
+        local_llm.resolve_precision("int4", use_gpu=False)
+
+
+def test_fp16_without_cuda_falls_back_to_fp32(capsys):
+    assert local_llm.resolve_precision("fp16", use_gpu=False) == "fp32"
+    assert "[WARN]" in capsys.readouterr().out
+    assert local_llm.resolve_precision("fp16", use_gpu=True) == "fp16"
+
+
+def test_device_follows_cuda_availability():
+    assert local_llm.resolve_device("fp32", use_gpu=True) == "cuda"
+    assert local_llm.resolve_device("bf16", use_gpu=True) == "cuda"
+    assert local_llm.resolve_device("int8", use_gpu=True) == "cpu"
+    assert local_llm.resolve_device("fp32", use_gpu=False) == "cpu"
+
+
+def test_int8_quantizes_linears_and_still_generates():
+    model = local_llm.apply_precision(_tiny_qwen(), "int8")
+
+    layer = model.model.layers[0]
+    assert isinstance(layer.mlp.up_proj, torch.ao.nn.quantized.dynamic.Linear)
+    assert isinstance(layer.self_attn.q_proj, torch.ao.nn.quantized.dynamic.Linear)
+    assert not any(type(m) is torch.nn.Linear for m in model.modules())
+
+    input_ids = torch.tensor([[1, 2, 3, 4]])
+    output = model.generate(input_ids, max_new_tokens=5, do_sample=False, pad_token_id=0)
+    assert output.shape == (1, 9)
+
+
+def test_int8_logits_close_to_fp32():
+    fp32 = _tiny_qwen()
+    int8 = local_llm.apply_precision(_tiny_qwen(), "int8")
+
+    input_ids = torch.tensor([[5, 6, 7, 8, 9]])
+    with torch.no_grad():
+        a = fp32(input_ids).logits
+        b = int8(input_ids).logits
+    assert torch.allclose(a, b, atol=0.05)
+
+
+def test_configure_cpu_threads():
+    before = torch.get_num_threads()
+    try:
+        assert local_llm.configure_cpu_threads(2) == 2
+        assert torch.get_num_threads() == 2
+        assert local_llm.configure_cpu_threads(0) >= 1
+    finally:
+        torch.set_num_threads(before)
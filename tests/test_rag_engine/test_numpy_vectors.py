@@ -0,0 +1,218 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from veridian_atlas.core import config
+from veridian_atlas.core.chroma_registry import chroma_registry
+from veridian_atlas.core.numpy_vectors import NumpyClient, NumpyCollection
+from veridian_atlas.data_pipeline.processors import index_builder
+from veridian_atlas.rag_engine.pipeline import rag_engine
+
+rng = np.random.default_rng(0)
+VECTORS = rng.normal(size=(200, 16)).astype(np.float32)
+IDS = [f"c{i}" for i in range(len(VECTORS))]
+
+
+def _collection(tmp_path, dtype="float32", **kw):
+    client = NumpyClient(tmp_path, dtype=dtype, **kw)
+    col = client.get_or_create_collection("VA_Deal", metadata={"model_dim": 16})
+    col.upsert(
+        ids=IDS,
+        embeddings=VECTORS,
+        documents=[f"text {i}" for i in IDS],
+        metadatas=[{"chunk_id": i} for i in IDS],
+    )
+    return client, col
+
+
+def test_query_returns_exact_top_k(tmp_path):
+    _, col = _collection(tmp_path)
+    q = rng.normal(size=16).astype(np.float32)
+
+    res = col.query(query_embeddings=[q.tolist()], n_results=5)
+    expected = np.argsort(((VECTORS - q) ** 2).sum(axis=1))[:5]
+
+    assert res["ids"][0] == [IDS[i] for i in expected]
+    assert res["documents"][0][0] == f"text {IDS[expected[0]]}"
+    np.testing.assert_allclose(
+        res["distances"][0], ((VECTORS[expected] - q) ** 2).sum(axis=1), rtol=1e-4
+    )
+
+
+def test_flush_persists_memory_mapped_float16(tmp_path):
+    client, col = _collection(tmp_path, dtype="float16")
+    col.delete(ids=["c0", "c1"])
+    col.update(ids=["c2"], metadatas=[{"chunk_id": "c2", "tag": "x"}])
+    col.flush()
+
+    reopened = NumpyCollection(client.path / "VA_Deal", "VA_Deal")
+    assert reopened.count() == 198
+    assert isinstance(reopened._matrix, np.memmap) and reopened._matrix.dtype == np.float16
+    assert reopened.metadata == {"model_dim": 16}
+    assert reopened.get(where={"chunk_id": "c2"})["metadatas"] == [{"chunk_id": "c2", "tag": "x"}]
+
+    q = VECTORS[7]
+    assert reopened.query(query_embeddings=[q], n_results=1)["ids"] == [["c7"]]
+
+
+def test_int8_first_pass_with_exact_rescoring(tmp_path):
+    _, exact = _collection(tmp_path / "f32")
+    _, col = _collection(tmp_path / "int8", dtype="int8", rescore_factor=4)
+    col.flush()
+    assert col._matrix.dtype == np.int8 and isinstance(col._exact, np.memmap)
+
+    probes = rng.normal(size=(20, 16)).astype(np.float32)
+    want = exact.query(query_embeddings=probes, n_results=5)
+    got = col.query(query_embeddings=probes, n_results=5)
+    assert got["ids"] == want["ids"]
+    np.testing.assert_allclose(got["distances"], want["distances"], rtol=1e-5)
+
+    stats = col.storage_stats()
+    assert stats["rescore"] and stats["savings_x"] == round(16 * 4 / (16 + 4), 2)  # + row scale
+
+
+def test_compressed_collection_reopens_and_grows(tmp_path):
+    client, col = _collection(tmp_path, dtype="int8")
+    col.flush()
+
+    reopened = NumpyClient(tmp_path, dtype="int8").get_collection("VA_Deal")
+    reopened.upsert(ids=["new"], embeddings=VECTORS[:1] * 2)
+    reopened.flush()
+
+    # Existing rows were carried over from the exact copy, not the int8 matrix
+    stored = reopened.get(ids=["c5", "new"], include=["embeddings"])["embeddings"]
+    np.testing.assert_array_equal(stored[0], VECTORS[5])
+    np.testing.assert_array_equal(stored[1], VECTORS[0] * 2)
+
+
+def test_client_collection_lifecycle(tmp_path):
+    client = NumpyClient(tmp_path)
+    with pytest.raises(ValueError):
+        client.get_collection("VA_Missing")
+
+    client.get_or_create_collection("VA_Deal", metadata={"model_dim": 16})
+    assert client.get_collection("VA_Deal").count() == 0
+    assert client.list_collections() == ["VA_Deal"]
+
+    client.delete_collection("VA_Deal")
+    with pytest.raises(ValueError):
+        client.get_collection("VA_Deal")
+
+
+def _build(tmp_path, monkeypatch, backend):
+    monkeypatch.setattr(config, "VECTOR_BACKEND", backend)
+    monkeypatch.setattr(
+        index_builder.hf_embedder,
+        "embed",
+        lambda texts, **kw: [VECTORS[int(t.split()[-1])].tolist() for t in texts],
+    )
+    monkeypatch.setattr(index_builder.hf_embedder, "dimension", lambda: 16)
+
+    chunks = tmp_path / "chunks.jsonl"
+    rows = [
+        {"chunk_id": f"VA_Deal_{i}", "content": f"clause {i}", "metadata": {"file_hash": "h"}}
+        for i in range(50)
+    ]
+    chunks.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+
+    db = tmp_path / backend
+    report = index_builder.build_chroma_index("Deal", chunks, db)
+    monkeypatch.setattr(
+        rag_engine, "get_chroma_collection", lambda deal: chroma_registry.get_collection(deal, db)
+    )
+    monkeypatch.setattr(rag_engine, "embed_query", lambda q: VECTORS[100].tolist())
+    return report
+
+
+def test_numpy_backend_matches_chroma_retrieval(tmp_path, monkeypatch):
+    _build(tmp_path, monkeypatch, "chroma")
+    chroma_hits = rag_engine.retrieve_context("fee", "Deal", top_k=5)
+
+    report = _build(tmp_path, monkeypatch, "numpy")
+    numpy_hits = rag_engine.retrieve_context("fee", "Deal", top_k=5)
+
+    assert report["added"] == 50
+    # One published generation; older ones are cleaned up after the header switches
+    assert (
+        len(list((tmp_path / "numpy" / "numpy_vectors" / "VA_Deal").glob("gen-*/vectors.npy"))) == 1
+    )
+    assert [h["chunk_id"] for h in numpy_hits] == [h["chunk_id"] for h in chroma_hits]
+    np.testing.assert_allclose(
+        [h["distance"] for h in numpy_hits], [h["distance"] for h in chroma_hits], rtol=1e-3
+    )
+
+    # Incremental rebuild against the numpy backend
+    again = index_builder.build_chroma_index("Deal", tmp_path / "chunks.jsonl", tmp_path / "numpy")
+    assert (again["added"], again["unchanged"]) == (0, 50)
+
+
+def test_legacy_flat_layout_still_loads(tmp_path):
+    client, col = _collection(tmp_path)
+    col.flush()
+    path = client.path / "VA_Deal"
+
+    # Pre-generation layout: data files directly in the collection directory
+    (generation,) = path.glob("gen-*")
+    for f in generation.iterdir():
+        f.rename(path / f.name)
+    generation.rmdir()
+    header = json.loads((path / "collection.json").read_text())
+    del header["generation"]
+    (path / "collection.json").write_text(json.dumps(header))
+
+    assert NumpyCollection(path, "VA_Deal").count() == len(IDS)
+
+
+def test_inconsistent_generation_is_not_loaded(tmp_path):
+    client, col = _collection(tmp_path)
+    col.flush()
+    path = client.path / "VA_Deal"
+    reader = NumpyCollection(path, "VA_Deal")
+    header = (path / "collection.json").read_text()
+
+    # A header whose row count disagrees with its files → keep the loaded generation
+    (path / "collection.json").write_text(header.replace('"rows": 200', '"rows": 150'))
+    assert reader.count() == 200
+    assert reader.get(ids=["c5"], include=["embeddings"])["embeddings"][0][0] == VECTORS[5][0]
+
+    (path / "collection.json").write_text(header)
+    assert reader.count() == 200
+
+
+def test_reader_never_mixes_generations(tmp_path):
+    writer = NumpyClient(tmp_path).get_or_create_collection("VA_Deal")
+    path = writer.path
+
+    def rebuild(gen: int):
+        rows = 50 + 10 * (gen % 3)
+        writer.delete(ids=list(writer._ids))
+        writer.upsert(
+            ids=[f"g{gen}_{i}" for i in range(rows)],
+            embeddings=np.full((rows, 4), gen, dtype=np.float32),
+            documents=[f"g{gen}" for _ in range(rows)],
+        )
+        writer.flush()
+
+    rebuild(0)
+    reader = NumpyCollection(path, "VA_Deal")  # another process, in effect
+    stop, failures = threading.Event(), []
+
+    def read():
+        while not stop.is_set():
+            got = reader.get(include=["documents", "embeddings"])
+            for chunk_id, doc, vector in zip(got["ids"], got["documents"], got["embeddings"]):
+                gen = chunk_id.split("_")[0]
+                if doc != gen or f"g{int(vector[0])}" != gen:
+                    failures.append((chunk_id, doc, vector[0]))
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    for gen in range(1, 40):
+        rebuild(gen)
+    stop.set()
+    thread.join()
+
+    assert failures == []
+    assert reader.count() == writer.count()
@@ -0,0 +1,221 @@
+import threading
+import time
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("tokenizers")
+
+from tokenizers import Tokenizer, models, pre_tokenizers  # noqa: E402
+
+from veridian_atlas.rag_engine.pipeline.rag_engine import (  # noqa: E402
+    RAG_PROMPT_PREFIX,
+    build_rag_prompt,
+)
+from veridian_atlas.rag_engine.services import local_llm  # noqa: E402
+from veridian_atlas.rag_engine.services.prefix_cache import PrefixKVCache  # noqa: E402
+
+CONTEXTS = [{"chunk_id": "VA_Deal_Fees", "content": "An upfront fee of 2% is payable."}]
+
+
+def _tiny_qwen():
+    """Random-weight Qwen2 + whitespace word tokenizer: no downloads."""
+    prompt = build_rag_prompt("What is the upfront fee?", CONTEXTS, "Deal")
+    words = sorted(set(prompt.split()) | {"zebra"})
+    vocab = {"<eos>": 0, "[UNK]": 1, **{w: i + 2 for i, w in enumerate(words)}}
+
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        eos_token="<eos>",
+        pad_token="<eos>",
+        unk_token="[UNK]",
+        model_input_names=["input_ids", "attention_mask"],
+    )
+
+    torch.manual_seed(0)
+    config = transformers.Qwen2Config(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=512,
+    )
+    model = transformers.Qwen2ForCausalLM(config).eval()
+    return model, tokenizer, prompt
+
+
+def test_prefix_cache_output_matches_full_prefill(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    cache = PrefixKVCache()
+    cache.register(RAG_PROMPT_PREFIX)
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", cache)
+
+    cache.enabled = False
+    baseline, _ = local_llm._generate_single(prompt, 12)
+
+    cache.enabled = True
+    first, _ = local_llm._generate_single(prompt, 12)
+    second, _ = local_llm._generate_single(prompt, 12)
+
+    assert first == second == baseline
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["reused_tokens"] == 2 * len(RAG_PROMPT_PREFIX.split())
+
+
+def test_token_boundary_mismatch_falls_back(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    cache = PrefixKVCache()
+    # Text prefix of the prompt, but "fin" tokenizes differently from "financial"
+    cache.register("You are a fin")
+
+    input_ids = tokenizer(prompt, return_tensors="pt")["input_ids"]
+    assert cache.lookup(model, tokenizer, prompt, input_ids) is None
+    assert cache.stats()["token_mismatches"] == 1
+
+    assert (
+        cache.lookup(
+            model, tokenizer, "zebra", tokenizer("zebra", return_tensors="pt")["input_ids"]
+        )
+        is None
+    )
+    assert cache.stats()["misses"] == 1
+
+
+def test_stream_matches_generate_and_counts_tokens(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+
+    expected, generated = local_llm._generate_single(prompt, 8)
+    before = dict(local_llm.generation_stats)
+    streamed = "".join(local_llm.stream_response(prompt, 8))
+
+    assert streamed == expected
+    assert local_llm.generation_stats["generated_tokens"] - before["generated_tokens"] == generated
+    assert local_llm.generation_stats["generate_calls"] - before["generate_calls"] == 1
+
+
+def test_stream_reraises_generate_errors(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+
+    def broken(**kwargs):
+        kwargs["streamer"].put(kwargs["input_ids"])
+        raise RuntimeError("device lost")
+
+    monkeypatch.setattr(model, "generate", broken)
+    with pytest.raises(RuntimeError, match="device lost"):
+        list(local_llm.stream_response(prompt, 8))
+
+
+def test_stream_times_out_when_generate_stalls(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+    monkeypatch.setattr(local_llm.config, "LLM_STREAM_TIMEOUT", 0.05)
+    monkeypatch.setattr(model, "generate", lambda **kwargs: time.sleep(0.5))
+
+    with pytest.raises(TimeoutError):
+        list(local_llm.stream_response(prompt, 8))
+
+
+def test_batched_generation_restores_padding_side(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    assert tokenizer.padding_side == "right"
+
+    results = local_llm._generate_batch([(prompt, 4), ("zebra " + prompt, 4)])
+
+    assert len(results) == 2
+    assert tokenizer.padding_side == "right"
+
+
+def _endless_generate(steps):
+    """Stands in for model.generate: one token per ms until a stopping criterion fires."""
+
+    def generate(input_ids, streamer, stopping_criteria, **kwargs):
+        ids = input_ids
+        streamer.put(ids)
+        for _ in range(5000):
+            steps.append(1)
+            ids = torch.cat([ids, ids[:, -1:]], dim=1)
+            streamer.put(ids[:, -1:])
+            if stopping_criteria(ids, None).all():
+                break
+            time.sleep(0.001)
+        streamer.end()
+        return ids
+
+    return generate
+
+
+def test_closing_the_stream_stops_generation(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+    steps = []
+    monkeypatch.setattr(model, "generate", _endless_generate(steps))
+
+    stream = local_llm.stream_response(prompt, 5000)
+    next(stream)
+    stream.close()  # client disconnected
+
+    assert len(steps) < 100
+
+
+def test_cancel_event_stops_generation(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+    steps = []
+    monkeypatch.setattr(model, "generate", _endless_generate(steps))
+
+    cancel = threading.Event()
+    stream = local_llm.stream_response(prompt, 5000, cancel=cancel)
+    next(stream)
+    cancel.set()
+    list(stream)
+
+    assert len(steps) < 100
+
+
+def test_cancel_stops_real_generate_at_next_token(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    monkeypatch.setattr(local_llm, "get_qwen", lambda: (model, tokenizer))
+    monkeypatch.setattr(local_llm, "prompt_prefix_cache", PrefixKVCache())
+
+    cancel = threading.Event()
+    cancel.set()
+    before = local_llm.generation_stats["generated_tokens"]
+    list(local_llm.stream_response(prompt, 64, cancel=cancel))
+
+    assert local_llm.generation_stats["generated_tokens"] - before <= 1
+
+
+def test_prefix_cache_counters_are_thread_safe(monkeypatch):
+    model, tokenizer, prompt = _tiny_qwen()
+    cache = PrefixKVCache()
+    cache.register(RAG_PROMPT_PREFIX)
+    input_ids = tokenizer(prompt, return_tensors="pt")["input_ids"]
+
+    def lookups(_):
+        for _ in range(20):
+            cache.lookup(model, tokenizer, prompt, input_ids)
+            cache.lookup(model, tokenizer, "zebra", input_ids)
+
+    threads = [threading.Thread(target=lookups, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == 160
+    assert stats["prefilled"] == 1
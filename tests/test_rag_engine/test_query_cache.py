@@ -0,0 +1,32 @@
+from veridian_atlas.rag_engine.pipeline import rag_engine
+from veridian_atlas.utils.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recent():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_embed_query_skips_model_on_hit(monkeypatch):
+    calls = []
+
+    def fake_embed_single(text):
+        calls.append(text)
+        return [0.1, 0.2, 0.3]
+
+    monkeypatch.setattr(rag_engine.hf_embedder, "embed_single", fake_embed_single)
+    monkeypatch.setattr(rag_engine, "query_embedding_cache", LRUCache(maxsize=8))
+
+    first = rag_engine.embed_query("What are the  fee terms?")
+    second = rag_engine.embed_query("what are the fee terms?")
+
+    assert first == second == [0.1, 0.2, 0.3]
+    assert calls == ["what are the fee terms?"]
+    assert rag_engine.query_embedding_cache.stats()["hits"] == 1
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from veridian_atlas.data_pipeline.processors import index_builder
+from veridian_atlas.data_pipeline.processors.reference_index import (
+    ReferenceIndex,
+    clause_key,
+    reference_index_path,
+)
+from veridian_atlas.rag_engine.pipeline import rag_engine
+from veridian_atlas.rag_engine.pipeline.reference_lookup import (
+    ReferenceIndexStore,
+    is_pure_lookup,
+    parse_references,
+    resolve,
+)
+
+
+def _row(section, clause=None, text="..."):
+    sec = f"SECTION_{section:03d}"
+    chunk_id = f"VA_Deal_Doc_{sec}" + (f"_CLAUSE_{clause}" if clause else "")
+    row = {
+        "chunk_id": chunk_id,
+        "section_id": f"SECTION {section}",
+        "normalized_section": sec,
+        "content": text,
+        "metadata": {"file_hash": "h"},
+    }
+    if clause:
+        row["clause_id"] = clause
+    return row
+
+
+ROWS = [
+    _row(1, "1.1", "Base subscription fee of INR 5,50,000."),
+    _row(2, "2.1(a)", "Invoices are payable within 30 days."),
+    _row(2, "2.1(b)", "Late payments accrue 1.5% interest per month."),
+    _row(4, "4.1", "The upfront fee is 2% of commitments."),
+    _row(4, "4.2", "An agency fee of USD 50,000 is payable annually."),
+]
+
+
+def test_parse_references():
+    assert parse_references("What does 2.1(a) say?") == [("clause", "2.1.a")]
+    assert parse_references("Section 4 fees") == [("section", "SECTION_004")]
+    assert parse_references("§ 4 and clause 2.1 (B)") == [
+        ("section", "SECTION_004"),
+        ("clause", "2.1.b"),
+    ]
+    assert parse_references("Section 4.2") == [("clause", "4.2")]
+    assert parse_references("what does 2.1 say") == [("clause", "2.1")]
+    assert parse_references("Is 2.1.3 still in force?") == [("clause", "2.1.3")]
+    # Amounts and percentages are not references
+    assert parse_references("Is the rate 2.5% or $1.5 or 5,50,000.00?") == []
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Is the facility 2.5 million?",
+        "Is the margin 2.5 percent or 1.75 per cent?",
+        "Is the fee USD 2.5 or Rs. 1.5 lakh?",
+        "A commitment fee of 0.35 bps over 2.5 years",
+        "Is leverage above 3.5 times?",
+        "What is the rate of 2.5?",
+        "Is interest charged at 2.5 p.a.?",
+        "Does the margin step down to 1.75 after year 2?",
+        "Is the fee 2.5% or 3.5%?",
+        "Payment is due within 30 days",
+        "Is the notice period 2.5 days or 30 days?",
+    ],
+)
+def test_amounts_with_units_are_not_references(query):
+    assert parse_references(query) == []
+    assert not is_pure_lookup(query)
+
+
+def test_pure_lookup_detection():
+    assert is_pure_lookup("what does 2.1(a) say?")
+    assert is_pure_lookup("Show me Section 4")
+    assert not is_pure_lookup("Section 4 fees")
+    assert not is_pure_lookup("who is the agent under clause 4.2")
+
+
+def test_clause_key_and_parent_fallback():
+    assert clause_key("Clause 2.1 (A)") == clause_key("2.1.a") == "2.1.a"
+
+    index = ReferenceIndex()
+    index.add("c21", {"normalized_section": "SECTION_002", "clause_id": "2.1"})
+    assert resolve(index, [("clause", "2.1.c")]) == ["c21"]
+    assert resolve(index, [("section", "SECTION_002"), ("clause", "2.1")]) == ["c21"]
+    assert resolve(index, [("clause", "9.9")]) == []
+
+
+@pytest.fixture
+def indexed_deal(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        index_builder.hf_embedder, "embed", lambda texts, **kw: [[1.0, 0.0]] * len(texts)
+    )
+    monkeypatch.setattr(index_builder.hf_embedder, "dimension", lambda: 2)
+
+    chunks = tmp_path / "chunks.jsonl"
+    chunks.write_text("\n".join(json.dumps(r) for r in ROWS), encoding="utf-8")
+    db = tmp_path / "db"
+    index_builder.build_chroma_index("Deal", chunks, db)
+
+    monkeypatch.setattr(rag_engine, "DEFAULT_DB_PATH", db)
+    monkeypatch.setattr(
+        rag_engine,
+        "get_chroma_collection",
+        lambda deal: index_builder.get_chroma_client(db).get_collection("VA_Deal"),
+    )
+    monkeypatch.setattr(rag_engine, "reference_indexes", ReferenceIndexStore())
+    return db
+
+
+def test_build_writes_reference_index(indexed_deal):
+    index = ReferenceIndex.load(reference_index_path(indexed_deal, "Deal"))
+    assert index.section("SECTION_004") == [ROWS[3]["chunk_id"], ROWS[4]["chunk_id"]]
+    assert index.clause("2.1.a") == [ROWS[1]["chunk_id"]]
+
+
+def test_pure_lookup_skips_embedding(indexed_deal, monkeypatch):
+    def no_model(query):
+        raise AssertionError("embedding model used for a pure lookup")
+
+    monkeypatch.setattr(rag_engine, "embed_query", no_model)
+    hits = rag_engine.retrieve_context("What does 2.1(a) say?", "Deal", top_k=3)
+
+    assert [h["chunk_id"] for h in hits] == [ROWS[1]["chunk_id"]]
+    assert hits[0]["clause"] == "2.1(a)" and hits[0]["distance"] == 0.0
+
+
+def test_mixed_query_puts_exact_hits_first(indexed_deal, monkeypatch):
+    monkeypatch.setattr(rag_engine, "embed_query", lambda q: [1.0, 0.0])
+    hits = rag_engine.retrieve_context("Section 4 fees", "Deal", top_k=4)
+
+    ids = [h["chunk_id"] for h in hits]
+    assert ids[:2] == [ROWS[3]["chunk_id"], ROWS[4]["chunk_id"]]
+    assert len(ids) == len(set(ids)) == 4
+
+
+def test_index_rebuilt_from_metadata_when_file_missing(indexed_deal, monkeypatch):
+    reference_index_path(indexed_deal, "Deal").unlink()
+    monkeypatch.setattr(rag_engine, "embed_query", lambda q: [1.0, 0.0])
+
+    hits = rag_engine.retrieve_context("clause 1.1", "Deal", top_k=1)
+    assert hits[0]["chunk_id"] == ROWS[0]["chunk_id"]
+
+
+def test_reference_fetch_is_limited_to_top_k(indexed_deal, monkeypatch):
+    real_get = rag_engine.get_chroma_collection
+    fetched = []
+
+    class Recording:
+        def __init__(self, collection):
+            self._collection = collection
+
+        def get(self, ids=None, **kw):
+            fetched.append(list(ids or []))
+            return self._collection.get(ids=ids, **kw)
+
+    monkeypatch.setattr(rag_engine, "get_chroma_collection", lambda d: Recording(real_get(d)))
+    hits = rag_engine.retrieve_context("Show me Section 4", "Deal", top_k=1)
+
+    assert [h["chunk_id"] for h in hits] == [ROWS[3]["chunk_id"]]
+    assert fetched == [[ROWS[3]["chunk_id"]]]